@@ -199,6 +199,9 @@ contract TACoApplication is
     uint256 public constant REWARD_PER_TOKEN_MULTIPLIER = 10 ** 3;
     uint256 internal constant FLOATING_POINT_DIVISOR = REWARD_PER_TOKEN_MULTIPLIER * 10 ** 18;
     uint192 public constant PENALTY_BASE = 10000;
+    // Max staking providers per batch synchronization, so that the child side of the message
+    // (~250k gas per provider in the worst case) fits into the 5M gas limit of L2 state sync
+    uint256 public constant MAX_BATCH_SYNC_SIZE = 16;
 
     uint96 public immutable minimumAuthorization;
     uint256 public immutable minOperatorSeconds;
@@ -1037,15 +1040,54 @@ contract TACoApplication is
     function manualChildSynchronization(address _stakingProvider) external {
         require(_stakingProvider != address(0), "Staking provider must be specified");
         StakingProviderInfo storage info = stakingProviderInfo[_stakingProvider];
+        _emitChildSynchronization(_stakingProvider, info);
+        _updateAuthorization(_stakingProvider, info);
+        childApplication.updateOperator(_stakingProvider, info.operator);
+    }
+
+    /**
+     * @notice Signal to the bridge with the current state of many staking providers at once
+     * @dev All updates are packed into a single message, which is useful for mass re-syncs.
+     * Batches are limited to `MAX_BATCH_SYNC_SIZE` so the message can be processed on L2
+     * @param _stakingProviders Staking provider addresses
+     */
+    function batchChildSynchronization(address[] calldata _stakingProviders) external {
+        require(_stakingProviders.length > 0, "Staking providers must be specified");
+        require(
+            _stakingProviders.length <= MAX_BATCH_SYNC_SIZE,
+            "Too many staking providers in batch"
+        );
+        ITACoRootToChild.StakingProviderUpdate[]
+            memory updates = new ITACoRootToChild.StakingProviderUpdate[](
+                _stakingProviders.length
+            );
+        for (uint256 i = 0; i < _stakingProviders.length; i++) {
+            address stakingProvider = _stakingProviders[i];
+            require(stakingProvider != address(0), "Staking provider must be specified");
+            StakingProviderInfo storage info = stakingProviderInfo[stakingProvider];
+            _emitChildSynchronization(stakingProvider, info);
+            updates[i] = ITACoRootToChild.StakingProviderUpdate({
+                stakingProvider: stakingProvider,
+                operator: info.operator,
+                authorized: info.authorized,
+                deauthorizing: info.deauthorizing,
+                endDeauthorization: info.endDeauthorization
+            });
+        }
+        childApplication.batchUpdate(updates);
+    }
+
+    function _emitChildSynchronization(
+        address _stakingProvider,
+        StakingProviderInfo storage _info
+    ) internal {
         emit ManualChildSynchronizationSent(
             _stakingProvider,
-            info.authorized,
-            info.deauthorizing,
-            info.endDeauthorization,
-            info.operator
+            _info.authorized,
+            _info.deauthorizing,
+            _info.endDeauthorization,
+            _info.operator
         );
-        _updateAuthorization(_stakingProvider, info);
-        childApplication.updateOperator(_stakingProvider, info.operator);
     }
 
     //-------------------------Slashing-------------------------
@@ -34,6 +34,7 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
     event TimeoutChanged(uint32 oldTimeout, uint32 newTimeout);
     event MaxDkgSizeChanged(uint16 oldSize, uint16 newSize);
     event ReimbursementPoolSet(address indexed pool);
+    event TranscriptDigestsSet(bool enabled);
 
     // Cohort administration
     event RitualAuthorityTransferred(
@@ -79,6 +80,8 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
         uint16 dkgSize;
         uint16 threshold;
         bool aggregationMismatch;
+        // only digests of transcripts are stored, full transcripts are in calldata
+        bool transcriptDigests;
         //
         IEncryptionAuthorizer accessController;
         BLS12381.G1Point publicKey;
@@ -92,6 +95,19 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
         BLS12381.G2Point publicKey;
     }
 
+    struct RitualSummary {
+        RitualState state;
+        uint16 dkgSize;
+        uint16 threshold;
+        uint16 totalTranscripts;
+        uint16 totalAggregations;
+        uint32 initTimestamp;
+        uint32 endTimestamp;
+        address authority;
+        IEncryptionAuthorizer accessController;
+        IFeeModel feeModel;
+    }
+
     bytes32 public constant TREASURY_ROLE = keccak256("TREASURY_ROLE");
 
     ITACoChildApplication public immutable application;
@@ -113,10 +129,14 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
 
     mapping(uint256 index => Ritual ritual) internal _rituals;
     uint256 public numberOfRituals;
+    bool public storeTranscriptDigests;
+    // rituals initiated before the provider index was introduced are not indexed
+    uint32 public firstIndexedRitualId;
+    mapping(address provider => uint32[] ritualIds) internal providerRituals;
     // Note: Adjust the __preSentinelGap size if more contract variables are added
 
     // Storage area for sentinel values
-    uint256[17] internal __preSentinelGap;
+    uint256[15] internal __preSentinelGap;
     Participant internal __sentinelParticipant;
     uint256[20] internal __postSentinelGap;
 
@@ -142,6 +162,16 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
         }
     }
 
+    /**
+     * @notice Starts the provider index of rituals after the rituals that already exist
+     * @dev Call it from the admin right after upgrading, not with `upgradeAndCall`
+     * (the caller would be the proxy admin). Rituals initiated in between are indexed
+     * but treated as unindexed.
+     */
+    function initializeRitualIndex() external reinitializer(3) onlyRole(DEFAULT_ADMIN_ROLE) {
+        firstIndexedRitualId = uint32(numberOfRituals);
+    }
+
     function rituals(
         uint256 ritualId // uint256 for backward compatibility
     )
@@ -225,6 +255,41 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
         return isRitualActive(ritual);
     }
 
+    /**
+     * @notice Returns ritual metadata without transcripts and participants, for bulk reads
+     * @param startId ID of the first ritual to return
+     * @param count Maximum number of rituals to return, 0 for all of them
+     */
+    function getRitualSummaries(
+        uint32 startId,
+        uint32 count
+    ) external view returns (RitualSummary[] memory) {
+        uint256 endId = numberOfRituals;
+        if (startId >= endId) {
+            return new RitualSummary[](0);
+        }
+        if (count != 0 && uint256(startId) + count < endId) {
+            endId = uint256(startId) + count;
+        }
+        RitualSummary[] memory summaries = new RitualSummary[](endId - startId);
+        for (uint256 id = startId; id < endId; id++) {
+            Ritual storage ritual = storageRitual(uint32(id));
+            summaries[id - startId] = RitualSummary({
+                state: getRitualState(ritual),
+                dkgSize: ritual.dkgSize,
+                threshold: ritual.threshold,
+                totalTranscripts: ritual.totalTranscripts,
+                totalAggregations: ritual.totalAggregations,
+                initTimestamp: ritual.initTimestamp,
+                endTimestamp: ritual.endTimestamp,
+                authority: ritual.authority,
+                accessController: ritual.accessController,
+                feeModel: ritual.feeModel
+            });
+        }
+        return summaries;
+    }
+
     function getRitualState(Ritual storage ritual) internal view returns (RitualState) {
         uint32 t0 = ritual.initTimestamp;
         uint32 deadline = t0 + timeout;
@@ -311,6 +376,21 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
         emit ReimbursementPoolSet(address(pool));
     }
 
+    /**
+     * @notice Sets whether new rituals store only digests of transcripts
+     * @dev Rituals keep the mode they were initiated with. In digest mode, transcripts and
+     * the aggregated transcript must be retrieved from the calldata of `postTranscript`
+     * and `postAggregation` transactions
+     */
+    function setStoreTranscriptDigests(bool enabled) external onlyRole(DEFAULT_ADMIN_ROLE) {
+        storeTranscriptDigests = enabled;
+        emit TranscriptDigestsSet(enabled);
+    }
+
+    function hasTranscriptDigests(uint32 ritualId) external view returns (bool) {
+        return storageRitual(ritualId).transcriptDigests;
+    }
+
     function transferRitualAuthority(uint32 ritualId, address newAuthority) external {
         Ritual storage ritual = storageRitual(ritualId);
         require(isRitualActive(ritual), "Ritual is not active");
@@ -355,7 +435,9 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
         ritual.endTimestamp = ritual.initTimestamp + duration;
         ritual.accessController = accessController;
         ritual.feeModel = feeModel;
+        ritual.transcriptDigests = storeTranscriptDigests;
 
+        uint96[] memory authorizations = getAuthorizedStakes(providers);
         address previous = address(0);
         for (uint256 i = 0; i < length; i++) {
             Participant storage newParticipant = ritual.participant.push();
@@ -367,11 +449,9 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
             require(previous < current, "Providers must be sorted");
             // TODO: Improve check for eligible nodes (staking, etc) - nucypher#3109
             // TODO: Change check to isAuthorized(), without amount
-            require(
-                application.authorizedStake(current) >= minAuthorization,
-                "Not enough authorization"
-            );
+            require(authorizations[i] >= minAuthorization, "Not enough authorization");
             newParticipant.provider = current;
+            providerRituals[current].push(id);
             previous = current;
         }
 
@@ -381,6 +461,15 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
         return id;
     }
 
+    /**
+     * @dev Authorized stakes of the providers, read from the application in a single call
+     */
+    function getAuthorizedStakes(
+        address[] calldata providers
+    ) internal view virtual returns (uint96[] memory) {
+        return application.authorizedStakes(providers);
+    }
+
     function cohortFingerprint(address[] calldata nodes) public pure returns (bytes32) {
         return keccak256(abi.encode(nodes));
     }
@@ -416,7 +505,11 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
 
         // Nodes commit to their transcript
         bytes32 transcriptDigest = keccak256(transcript);
-        participant.transcript = transcript;
+        if (ritual.transcriptDigests) {
+            participant.transcript = abi.encodePacked(transcriptDigest);
+        } else {
+            participant.transcript = transcript;
+        }
         emit TranscriptPosted(ritualId, provider, transcriptDigest);
         ritual.totalTranscripts++;
 
@@ -473,11 +566,15 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
         emit AggregationPosted(ritualId, provider, aggregatedTranscriptDigest);
 
         if (ritual.aggregatedTranscript.length == 0) {
-            ritual.aggregatedTranscript = aggregatedTranscript;
+            if (ritual.transcriptDigests) {
+                ritual.aggregatedTranscript = abi.encodePacked(aggregatedTranscriptDigest);
+            } else {
+                ritual.aggregatedTranscript = aggregatedTranscript;
+            }
             ritual.publicKey = dkgPublicKey;
         } else if (
             !BLS12381.eqG1Point(ritual.publicKey, dkgPublicKey) ||
-            keccak256(ritual.aggregatedTranscript) != aggregatedTranscriptDigest
+            getAggregatedTranscriptDigest(ritual) != aggregatedTranscriptDigest
         ) {
             ritual.aggregationMismatch = true;
             delete ritual.publicKey;
@@ -501,6 +598,14 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
         processReimbursement(initialGasLeft);
     }
 
+    function getAggregatedTranscriptDigest(Ritual storage ritual) internal view returns (bytes32) {
+        bytes memory aggregatedTranscript = ritual.aggregatedTranscript;
+        if (ritual.transcriptDigests) {
+            return bytes32(aggregatedTranscript);
+        }
+        return keccak256(aggregatedTranscript);
+    }
+
     function getRitualIdFromPublicKey(
         BLS12381.G1Point memory dkgPublicKey
     ) external view returns (uint32 ritualId) {
@@ -558,17 +663,33 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
         return participant;
     }
 
+    /**
+     * @dev Copies a participant to memory, skipping the (possibly large) transcript
+     * in storage unless it's requested
+     */
+    function copyParticipant(
+        Participant storage participant,
+        bool includeTranscript
+    ) internal view returns (Participant memory) {
+        if (includeTranscript) {
+            return participant;
+        }
+        return
+            Participant({
+                provider: participant.provider,
+                aggregated: participant.aggregated,
+                transcript: "",
+                decryptionRequestStaticKey: participant.decryptionRequestStaticKey
+            });
+    }
+
     function getParticipant(
         uint32 ritualId,
         address provider,
         bool transcript
     ) external view returns (Participant memory) {
         Ritual storage ritual = storageRitual(ritualId);
-        Participant memory participant = getParticipant(ritual, provider);
-        if (!transcript) {
-            participant.transcript = "";
-        }
-        return participant;
+        return copyParticipant(getParticipant(ritual, provider), transcript);
     }
 
     function getParticipantFromProvider(
@@ -597,16 +718,46 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
 
         uint256 resultIndex = 0;
         for (uint256 i = startIndex; i < endIndex; i++) {
-            Participant memory ritualParticipant = ritual.participant[i];
-            if (!includeTranscript) {
-                ritualParticipant.transcript = "";
-            }
-            ritualParticipants[resultIndex++] = ritualParticipant;
+            ritualParticipants[resultIndex++] = copyParticipant(
+                ritual.participant[i],
+                includeTranscript
+            );
         }
 
         return ritualParticipants;
     }
 
+    function numberOfRitualsForProvider(address provider) external view returns (uint256) {
+        return providerRituals[provider].length;
+    }
+
+    /**
+     * @notice Returns IDs of the rituals the provider participates in, in order of initiation
+     * @dev Only rituals from `firstIndexedRitualId` onwards are included
+     * @param provider Staking provider
+     * @param startIndex Index of the first ritual ID to return
+     * @param maxRituals Maximum number of ritual IDs to return, 0 for all of them
+     */
+    function getRitualsForProvider(
+        address provider,
+        uint256 startIndex,
+        uint256 maxRituals
+    ) external view returns (uint32[] memory) {
+        uint32[] storage ritualIds = providerRituals[provider];
+        uint256 endIndex = ritualIds.length;
+        if (startIndex >= endIndex) {
+            return new uint32[](0);
+        }
+        if (maxRituals != 0 && startIndex + maxRituals < endIndex) {
+            endIndex = startIndex + maxRituals;
+        }
+        uint32[] memory result = new uint32[](endIndex - startIndex);
+        for (uint256 i = startIndex; i < endIndex; i++) {
+            result[i - startIndex] = ritualIds[i];
+        }
+        return result;
+    }
+
     function getProviders(uint32 ritualId) external view returns (address[] memory) {
         Ritual storage ritual = storageRitual(ritualId);
         address[] memory providers = new address[](ritual.participant.length);
@@ -7,6 +7,14 @@ pragma solidity ^0.8.0;
  * @notice Interface for x-chain interactions from application to coordinator
  */
 interface ITACoRootToChild {
+    struct StakingProviderUpdate {
+        address stakingProvider;
+        address operator;
+        uint96 authorized;
+        uint96 deauthorizing;
+        uint64 endDeauthorization;
+    }
+
     event OperatorUpdated(address indexed stakingProvider, address indexed operator);
     event AuthorizationUpdated(
         address indexed stakingProvider,
@@ -25,4 +33,6 @@ interface ITACoRootToChild {
         uint96 deauthorizing,
         uint64 endDeauthorization
     ) external;
+
+    function batchUpdate(StakingProviderUpdate[] calldata updates) external;
 }
@@ -88,15 +88,13 @@ contract ManagedAllowList is GlobalAllowList {
         address[] calldata addresses,
         // TODO: Currently unused, remove?
         bool value
-    ) internal override {
+    ) internal virtual override {
         super._beforeSetAuthorization(ritualId, addresses, value);
-        for (uint256 i = 0; i < addresses.length; i++) {
-            require(
-                authActions[ritualId] <
-                    subscription.authorizationActionsCap(ritualId, addresses[i]),
-                "Authorization cap exceeded"
-            );
-        }
+        // authActions doesn't change within the batch, so only the lowest cap matters
+        require(
+            authActions[ritualId] < subscription.minAuthorizationActionsCap(ritualId, addresses),
+            "Authorization cap exceeded"
+        );
     }
 
     /**
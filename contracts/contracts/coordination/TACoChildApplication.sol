@@ -34,10 +34,20 @@ contract TACoChildApplication is ITACoRootToChild, ITACoChildApplication, Initia
     address public adjudicator;
 
     uint96 public immutable minimumAuthorization;
+    // max number of sampled staking providers that can be skipped while sampling a cohort
+    uint256 public constant MAX_SKIPPED_SAMPLES = 32;
 
     mapping(address => StakingProviderInfo) public stakingProviderInfo;
     address[] public stakingProviders;
     mapping(address => address) public operatorToStakingProvider;
+    // staking providers with confirmed operator and minimum authorization, in no particular order
+    address[] internal activeStakingProviderSet;
+    mapping(address => uint256) internal activeStakingProviderIndex; // index in set + 1
+    // Fenwick tree of the stakes of active providers by index in providers array,
+    // node i is stored at i - 1. The tree has one node per provider, except for providers
+    // registered before the tree was introduced, which are added by `syncActiveStakingProviders`
+    uint256[] internal stakeTree;
+    mapping(address => uint96) internal sampledStake;
 
     /**
      * @dev Checks caller is root application
@@ -79,6 +89,19 @@ contract TACoChildApplication is ITACoRootToChild, ITACoChildApplication, Initia
         return stakingProviderInfo[_stakingProvider].authorized;
     }
 
+    /**
+     * @notice Returns authorized stakes of several staking providers in a single call
+     * @param _stakingProviders Staking providers
+     */
+    function authorizedStakes(
+        address[] calldata _stakingProviders
+    ) external view returns (uint96[] memory authorized) {
+        authorized = new uint96[](_stakingProviders.length);
+        for (uint256 i = 0; i < _stakingProviders.length; i++) {
+            authorized[i] = stakingProviderInfo[_stakingProviders[i]].authorized;
+        }
+    }
+
     /**
      * @notice Returns the amount of stake that is pending authorization
      *         decrease for the given staking provider. If no authorization
@@ -132,6 +155,25 @@ contract TACoChildApplication is ITACoRootToChild, ITACoChildApplication, Initia
         _updateAuthorization(stakingProvider, authorized, deauthorizing, endDeauthorization);
     }
 
+    /**
+     * @notice Applies authorization and operator updates for many staking providers at once
+     * @dev Used by the root application to synchronize many providers with one bridge message
+     */
+    function batchUpdate(
+        StakingProviderUpdate[] calldata updates
+    ) external override onlyRootApplication {
+        for (uint256 i = 0; i < updates.length; i++) {
+            StakingProviderUpdate calldata update = updates[i];
+            _updateAuthorization(
+                update.stakingProvider,
+                update.authorized,
+                update.deauthorizing,
+                update.endDeauthorization
+            );
+            _updateOperator(update.stakingProvider, update.operator);
+        }
+    }
+
     function _updateOperator(address stakingProvider, address operator) internal {
         StakingProviderInfo storage info = stakingProviderInfo[stakingProvider];
         address oldOperator = info.operator;
@@ -143,6 +185,9 @@ contract TACoChildApplication is ITACoRootToChild, ITACoChildApplication, Initia
         if (info.index == 0) {
             stakingProviders.push(stakingProvider);
             info.index = uint248(stakingProviders.length);
+            if (stakeTree.length + 1 == info.index) {
+                _pushStakeNode();
+            }
         }
 
         info.operator = operator;
@@ -152,6 +197,7 @@ contract TACoChildApplication is ITACoRootToChild, ITACoChildApplication, Initia
             operatorToStakingProvider[operator] = stakingProvider;
         }
         info.operatorConfirmed = false;
+        _updateActiveStatus(stakingProvider, info);
         // TODO placeholder to notify Coordinator
 
         emit OperatorUpdated(stakingProvider, operator);
@@ -177,9 +223,146 @@ contract TACoChildApplication is ITACoRootToChild, ITACoChildApplication, Initia
         info.authorized = authorized;
         info.deauthorizing = deauthorizing;
         info.endDeauthorization = endDeauthorization;
+        _updateActiveStatus(stakingProvider, info);
         emit AuthorizationUpdated(stakingProvider, authorized, deauthorizing, endDeauthorization);
     }
 
+    /**
+     * @dev Adds the staking provider to the active set or removes it from there,
+     * depending on its current operator confirmation and authorization,
+     * and updates its stake in the sampling tree accordingly
+     */
+    function _updateActiveStatus(
+        address stakingProvider,
+        StakingProviderInfo storage info
+    ) internal {
+        bool active = info.operatorConfirmed && info.authorized >= minimumAuthorization;
+        uint256 index = activeStakingProviderIndex[stakingProvider];
+        if (active && index == 0) {
+            activeStakingProviderSet.push(stakingProvider);
+            activeStakingProviderIndex[stakingProvider] = activeStakingProviderSet.length;
+        } else if (!active && index != 0) {
+            address last = activeStakingProviderSet[activeStakingProviderSet.length - 1];
+            activeStakingProviderSet[index - 1] = last;
+            activeStakingProviderIndex[last] = index;
+            activeStakingProviderSet.pop();
+            activeStakingProviderIndex[stakingProvider] = 0;
+        }
+        _updateSampledStake(stakingProvider, info.index, active ? info.authorized : 0);
+    }
+
+    function _lowestBit(uint256 node) internal pure returns (uint256) {
+        return node & (~node + 1);
+    }
+
+    /**
+     * @dev Sum of stakes in the first `node` slots of the tree
+     */
+    function _stakePrefixSum(uint256 node) internal view returns (uint256 sum) {
+        for (; node > 0; node -= _lowestBit(node)) {
+            sum += stakeTree[node - 1];
+        }
+    }
+
+    /**
+     * @dev Appends the node of the next provider with no stake, the node still covers
+     * stakes of previous providers. Costs one new slot and O(log N) reads
+     */
+    function _pushStakeNode() internal {
+        uint256 newNode = stakeTree.length + 1;
+        stakeTree.push(
+            _stakePrefixSum(newNode - 1) - _stakePrefixSum(newNode - _lowestBit(newNode))
+        );
+    }
+
+    function _updateSampledStake(address stakingProvider, uint256 node, uint96 stake) internal {
+        uint96 oldStake = sampledStake[stakingProvider];
+        uint256 length = stakeTree.length;
+        // providers without a node yet are added to the tree by `syncActiveStakingProviders`
+        if (stake == oldStake || node > length) {
+            return;
+        }
+        sampledStake[stakingProvider] = stake;
+
+        for (; node <= length; node += _lowestBit(node)) {
+            if (stake > oldStake) {
+                stakeTree[node - 1] += stake - oldStake;
+            } else {
+                stakeTree[node - 1] -= oldStake - stake;
+            }
+        }
+    }
+
+    /**
+     * @dev Finds the first node whose prefix sum is greater than `position`
+     */
+    function _findStakeNode(uint256 position) internal view returns (uint256 node) {
+        uint256 length = stakeTree.length;
+        uint256 step = 1;
+        while (step * 2 <= length) {
+            step *= 2;
+        }
+        for (; step > 0; step /= 2) {
+            uint256 next = node + step;
+            if (next <= length && stakeTree[next - 1] <= position) {
+                node = next;
+                position -= stakeTree[next - 1];
+            }
+        }
+        return node + 1;
+    }
+
+    /**
+     * @dev Finds the node owning `position` in the cumulative stake of non-excluded nodes.
+     * Excluded nodes are packed with their stakes as `node << 96 | stake`. Excluded stakes
+     * shift the position in the full tree, which converges after at most one iteration
+     * per excluded node
+     */
+    function _findStakeNode(
+        uint256 position,
+        uint256[] memory excluded,
+        uint256 numberOfExcluded
+    ) internal view returns (uint256 node) {
+        uint256 shifted = position;
+        while (true) {
+            node = _findStakeNode(shifted);
+            uint256 excludedBefore = 0;
+            for (uint256 i = 0; i < numberOfExcluded; i++) {
+                if (excluded[i] >> 96 <= node) {
+                    excludedBefore += uint96(excluded[i]);
+                }
+            }
+            if (position + excludedBefore == shifted) {
+                return node;
+            }
+            shifted = position + excludedBefore;
+        }
+    }
+
+    /**
+     * @notice Rebuilds the active set status and sampled stake of a range of staking providers,
+     * needed once for providers updated before the active set was introduced.
+     * Also adds the missing nodes of the sampling tree, so pages must be synced in order
+     * @param _startIndex Start index in providers array
+     * @param _maxStakingProviders Max providers to update, if set 0 then all will be used
+     */
+    function syncActiveStakingProviders(
+        uint256 _startIndex,
+        uint256 _maxStakingProviders
+    ) external {
+        uint256 endIndex = stakingProviders.length;
+        if (_maxStakingProviders != 0 && _startIndex + _maxStakingProviders < endIndex) {
+            endIndex = _startIndex + _maxStakingProviders;
+        }
+        for (uint256 i = _startIndex; i < endIndex; i++) {
+            if (stakeTree.length == i) {
+                _pushStakeNode();
+            }
+            address stakingProvider = stakingProviders[i];
+            _updateActiveStatus(stakingProvider, stakingProviderInfo[stakingProvider]);
+        }
+    }
+
     function confirmOperatorAddress(address _operator) external override {
         require(msg.sender == coordinator, "Only Coordinator allowed to confirm operator");
         address stakingProvider = operatorToStakingProvider[_operator];
@@ -191,6 +374,7 @@ contract TACoChildApplication is ITACoRootToChild, ITACoChildApplication, Initia
         // TODO maybe allow second confirmation, just do not send root call?
         require(!info.operatorConfirmed, "Can't confirm same operator twice");
         info.operatorConfirmed = true;
+        _updateActiveStatus(stakingProvider, info);
         emit OperatorConfirmed(stakingProvider, _operator);
         rootApplication.confirmOperatorAddress(_operator);
     }
@@ -259,6 +443,124 @@ contract TACoChildApplication is ITACoRootToChild, ITACoChildApplication, Initia
         }
     }
 
+    /**
+     * @notice Return the number of staking providers in the active set
+     */
+    function getActiveStakingProvidersLength() external view returns (uint256) {
+        return activeStakingProviderSet.length;
+    }
+
+    /**
+     * @notice Same as `getActiveStakingProviders` but only looks through the active set, i.e.
+     * staking providers with confirmed operator and minimum authorization
+     * @param _startIndex Start index in the active set
+     * @param _maxStakingProviders Max providers for looking, if set 0 then all will be used
+     * @param _cohortDuration Duration during which staking provider should be active. 0 means forever
+     * @dev Order of the active set changes when providers leave it,
+     * so all pages must be requested at the same block
+     */
+    function getActiveStakingProvidersPage(
+        uint256 _startIndex,
+        uint256 _maxStakingProviders,
+        uint32 _cohortDuration
+    ) external view returns (uint96 allAuthorizedTokens, bytes32[] memory activeStakingProviders) {
+        uint256 endIndex = activeStakingProviderSet.length;
+        if (_startIndex >= endIndex) {
+            return (0, new bytes32[](0));
+        }
+        if (_maxStakingProviders != 0 && _startIndex + _maxStakingProviders < endIndex) {
+            endIndex = _startIndex + _maxStakingProviders;
+        }
+        activeStakingProviders = new bytes32[](endIndex - _startIndex);
+        uint256 endDate = _cohortDuration == 0
+            ? type(uint256).max
+            : block.timestamp + _cohortDuration;
+
+        uint256 resultIndex = 0;
+        for (uint256 i = _startIndex; i < endIndex; i++) {
+            address stakingProvider = activeStakingProviderSet[i];
+            // pending deauthorization can still make the provider ineligible for the cohort
+            uint96 eligibleAmount = eligibleStake(stakingProvider, endDate);
+            if (eligibleAmount < minimumAuthorization) {
+                continue;
+            }
+            activeStakingProviders[resultIndex++] =
+                bytes32(bytes20(stakingProvider)) |
+                bytes32(uint256(eligibleAmount));
+            allAuthorizedTokens += eligibleAmount;
+        }
+        assembly {
+            mstore(activeStakingProviders, resultIndex)
+        }
+    }
+
+    /**
+     * @notice Return the sum of stakes of active staking providers, used for sampling
+     */
+    function getTotalSampledStake() external view returns (uint256) {
+        return _stakePrefixSum(stakeTree.length);
+    }
+
+    /**
+     * @notice Samples a cohort of staking providers without replacement, with probability
+     * proportional to their authorized stake. The cohort is sorted as expected by
+     * `Coordinator.initiateRitual`
+     * @param _seed Seed of sampling, the same seed and state always produce the same cohort
+     * @param _count Number of staking providers in the cohort
+     * @param _cohortDuration Duration during which staking provider should be active. 0 means forever
+     * @dev Sampled providers that are not eligible for the cohort duration or haven't set
+     * their public key in the Coordinator are skipped, up to `MAX_SKIPPED_SAMPLES` times
+     */
+    function sampleProviders(
+        bytes32 _seed,
+        uint16 _count,
+        uint32 _cohortDuration
+    ) external view returns (address[] memory cohort) {
+        uint256 endDate = _cohortDuration == 0
+            ? type(uint256).max
+            : block.timestamp + _cohortDuration;
+        uint256 remainingStake = _stakePrefixSum(stakeTree.length);
+        uint256[] memory excluded = new uint256[](uint256(_count) + MAX_SKIPPED_SAMPLES);
+        uint256 numberOfExcluded = 0;
+
+        cohort = new address[](_count);
+        uint256 selected = 0;
+        for (uint256 draw = 0; selected < _count; draw++) {
+            require(remainingStake > 0, "Not enough staking providers");
+            require(numberOfExcluded < excluded.length, "Too many ineligible staking providers");
+            uint256 node = _findStakeNode(
+                uint256(keccak256(abi.encodePacked(_seed, draw))) % remainingStake,
+                excluded,
+                numberOfExcluded
+            );
+            address stakingProvider = stakingProviders[node - 1];
+            uint96 stake = sampledStake[stakingProvider];
+            excluded[numberOfExcluded++] = (node << 96) | stake;
+            remainingStake -= stake;
+            if (_isSampleEligible(stakingProvider, endDate)) {
+                cohort[selected++] = stakingProvider;
+            }
+        }
+
+        for (uint256 i = 1; i < _count; i++) {
+            address current = cohort[i];
+            uint256 j = i;
+            for (; j > 0 && cohort[j - 1] > current; j--) {
+                cohort[j] = cohort[j - 1];
+            }
+            cohort[j] = current;
+        }
+    }
+
+    function _isSampleEligible(
+        address _stakingProvider,
+        uint256 _endDate
+    ) internal view returns (bool) {
+        return
+            eligibleStake(_stakingProvider, _endDate) >= minimumAuthorization &&
+            Coordinator(coordinator).isProviderPublicKeySet(_stakingProvider);
+    }
+
     // TODO only for backward compatibility
     function getActiveStakingProviders(
         uint256 _startIndex,
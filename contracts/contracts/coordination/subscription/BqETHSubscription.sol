@@ -209,6 +209,7 @@ contract BqETHSubscription is EncryptorSlotsSubscription, Initializable, Ownable
         Billing storage billing = billingInfo[periodNumber];
         billing.paid = true;
         billing.encryptorSlots = encryptorSlots;
+        _setPeriodPaid(periodNumber);
 
         uint256 fees = baseFees(periodNumber) +
             encryptorFees(encryptorSlots, subscriptionPeriodDuration);
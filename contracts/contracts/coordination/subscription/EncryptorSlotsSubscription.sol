@@ -10,6 +10,8 @@ import "./AbstractSubscription.sol";
  */
 abstract contract EncryptorSlotsSubscription is AbstractSubscription {
     uint32 public startOfSubscription;
+    // number of the period following the last paid one, packed with startOfSubscription
+    uint32 public paidUntilPeriod;
     uint256 public usedEncryptorSlots;
     // example of storage layout
     // mapping(uint256 periodNumber => Billing billing) public billingInfo;
@@ -49,11 +51,38 @@ abstract contract EncryptorSlotsSubscription is AbstractSubscription {
         return (block.timestamp - startOfSubscription) / subscriptionPeriodDuration;
     }
 
+    /**
+     * @notice Returns the end of the last paid period
+     * @dev Payments are only accepted for the current or the next period, so the last paid
+     * period always ends the subscription (paid periods past the current one are contiguous)
+     */
     function getEndOfSubscription() public view override returns (uint32 endOfSubscription) {
         if (startOfSubscription == 0) {
             return 0;
         }
+        if (paidUntilPeriod == 0) {
+            return _findEndOfSubscription();
+        }
+        endOfSubscription = uint32(
+            startOfSubscription + uint256(paidUntilPeriod) * subscriptionPeriodDuration
+        );
+    }
 
+    /**
+     * @notice Records the payment of a period, must be called by every payment of a period
+     * @param periodNumber Number of the paid period
+     */
+    function _setPeriodPaid(uint256 periodNumber) internal {
+        if (periodNumber >= paidUntilPeriod) {
+            paidUntilPeriod = uint32(periodNumber + 1);
+        }
+    }
+
+    /**
+     * @dev Walks through periods to find the end of the subscription, only needed for
+     * subscriptions paid before `paidUntilPeriod` was introduced and not paid since then
+     */
+    function _findEndOfSubscription() private view returns (uint32 endOfSubscription) {
         uint256 currentPeriodNumber = getCurrentPeriodNumber();
         if (currentPeriodNumber == 0 && !isPeriodPaid(currentPeriodNumber)) {
             return 0;
@@ -267,6 +267,32 @@ contract UpfrontSubscriptionWithEncryptorsCap is Subscription {
         return authorizationActionCaps[subscribers[LookupKey.lookupKey(ritualId, spender)]];
     }
 
+    /**
+     * @notice Returns the lowest authorization actions cap among several spenders of a ritual
+     * @dev The cap is read once for consecutive spenders that share a subscription
+     * @param ritualId The ID of the ritual
+     * @param spenders The addresses of the spenders
+     * @return cap The lowest authorization actions cap (max uint256 if there are no spenders)
+     */
+    function minAuthorizationActionsCap(
+        uint32 ritualId,
+        address[] calldata spenders
+    ) external view returns (uint256 cap) {
+        cap = type(uint256).max;
+        uint32 lastSubscriptionId;
+        for (uint256 i = 0; i < spenders.length && cap > 0; i++) {
+            uint32 subscriptionId = subscribers[LookupKey.lookupKey(ritualId, spenders[i])];
+            if (i > 0 && subscriptionId == lastSubscriptionId) {
+                continue;
+            }
+            uint256 spenderCap = authorizationActionCaps[subscriptionId];
+            if (spenderCap < cap) {
+                cap = spenderCap;
+            }
+            lastSubscriptionId = subscriptionId;
+        }
+    }
+
     /**
      * @notice Cancels a subscription and deletes the authorization actions cap
      * @param ritualId The ID of the ritual
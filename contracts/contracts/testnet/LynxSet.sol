@@ -50,6 +50,9 @@ contract MockPolygonRoot is Ownable, ITACoChildToRoot, ITACoRootToChild {
         uint96 deauthorizing,
         uint64 endDeauthorization // solhint-disable-next-line no-empty-blocks
     ) external {}
+
+    // solhint-disable-next-line no-empty-blocks
+    function batchUpdate(StakingProviderUpdate[] calldata updates) external {}
 }
 
 contract MockPolygonChild is Ownable, ITACoChildToRoot, ITACoRootToChild {
@@ -89,6 +92,10 @@ contract MockPolygonChild is Ownable, ITACoChildToRoot, ITACoRootToChild {
         );
     }
 
+    function batchUpdate(StakingProviderUpdate[] calldata _updates) external override onlyOwner {
+        childApplication.batchUpdate(_updates);
+    }
+
     // solhint-disable-next-line no-empty-blocks
     function confirmOperatorAddress(address _operator) external override {}
 
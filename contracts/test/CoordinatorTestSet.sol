@@ -27,6 +27,15 @@ contract ChildApplicationForCoordinatorMock is ITACoChildApplication {
         authorizedStake[_stakingProvider] = _amount;
     }
 
+    function authorizedStakes(
+        address[] calldata _stakingProviders
+    ) external view returns (uint96[] memory authorized) {
+        authorized = new uint96[](_stakingProviders.length);
+        for (uint256 i = 0; i < _stakingProviders.length; i++) {
+            authorized[i] = authorizedStake[_stakingProviders[i]];
+        }
+    }
+
     function confirmOperatorAddress(address _operator) external {
         confirmations[_operator] = true;
     }
@@ -68,3 +77,20 @@ contract ExtendedCoordinator is Coordinator {
         return id;
     }
 }
+
+/**
+ * @notice Coordinator that reads authorized stakes with one call per provider,
+ * for gas comparisons with the batched query
+ */
+contract CoordinatorPerProviderStakeMock is Coordinator {
+    constructor(ITACoChildApplication _application) Coordinator(_application) {}
+
+    function getAuthorizedStakes(
+        address[] calldata providers
+    ) internal view override returns (uint96[] memory authorizations) {
+        authorizations = new uint96[](providers.length);
+        for (uint256 i = 0; i < providers.length; i++) {
+            authorizations[i] = application.authorizedStake(providers[i]);
+        }
+    }
+}
@@ -2,10 +2,17 @@
 
 pragma solidity ^0.8.0;
 
+import "../contracts/coordination/ManagedAllowList.sol";
+
 contract CoordinatorForEncryptionAuthorizerMock {
     uint32 public numberOfRituals;
     mapping(uint32 => address) public getAuthority;
     mapping(uint32 => bool) public isRitualActive;
+    mapping(uint32 => IFeeModel) public getFeeModel;
+
+    function setFeeModel(uint32 ritualId, IFeeModel feeModel) external {
+        getFeeModel[ritualId] = feeModel;
+    }
 
     function mockNewRitual(address authority) external {
         getAuthority[numberOfRituals] = authority;
@@ -33,3 +40,51 @@ contract SubscriptionForManagedAllowListMock {
         isRitualActive[ritualId] = false;
     }
 }
+
+/**
+ * @notice Subscription with caps that can be assigned without paying
+ */
+contract UpfrontSubscriptionWithEncryptorsCapMock is UpfrontSubscriptionWithEncryptorsCap {
+    constructor(
+        Coordinator _coordinator,
+        IERC20 _feeToken,
+        address _beneficiary
+    ) UpfrontSubscriptionWithEncryptorsCap(_coordinator, _feeToken, _beneficiary) {}
+
+    function setSubscription(
+        uint32 ritualId,
+        address[] calldata spenders,
+        uint32 subscriptionId,
+        uint256 cap
+    ) external {
+        for (uint256 i = 0; i < spenders.length; i++) {
+            subscribers[LookupKey.lookupKey(ritualId, spenders[i])] = subscriptionId;
+        }
+        authorizationActionCaps[subscriptionId] = cap;
+    }
+}
+
+/**
+ * @notice ManagedAllowList that checks the cap of every address with a separate call
+ */
+contract ManagedAllowListPerAddressCapMock is ManagedAllowList {
+    constructor(
+        Coordinator _coordinator,
+        UpfrontSubscriptionWithEncryptorsCap _subscription
+    ) ManagedAllowList(_coordinator, _subscription) {}
+
+    function _beforeSetAuthorization(
+        uint32 ritualId,
+        address[] calldata addresses,
+        bool value
+    ) internal override {
+        GlobalAllowList._beforeSetAuthorization(ritualId, addresses, value);
+        for (uint256 i = 0; i < addresses.length; i++) {
+            require(
+                authActions[ritualId] <
+                    subscription.authorizationActionsCap(ritualId, addresses[i]),
+                "Authorization cap exceeded"
+            );
+        }
+    }
+}
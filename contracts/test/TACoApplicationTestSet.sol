@@ -150,7 +150,7 @@ contract ChildApplicationForTACoApplicationMock {
         rootApplication = _rootApplication;
     }
 
-    function updateOperator(address _stakingProvider, address _operator) external {
+    function updateOperator(address _stakingProvider, address _operator) public {
         address oldOperator = stakingProviderToOperator[_stakingProvider];
         operatorToStakingProvider[oldOperator] = address(0);
         stakingProviderToOperator[_stakingProvider] = _operator;
@@ -162,13 +162,26 @@ contract ChildApplicationForTACoApplicationMock {
         uint96 _authorized,
         uint96 _deauthorizing,
         uint64 _endDeauthorization
-    ) external {
+    ) public {
         StakingProviderInfo storage info = stakingProviderInfo[_stakingProvider];
         info.authorized = _authorized;
         info.deauthorizing = _deauthorizing;
         info.endDeauthorization = _endDeauthorization;
     }
 
+    function batchUpdate(ITACoRootToChild.StakingProviderUpdate[] calldata _updates) external {
+        for (uint256 i = 0; i < _updates.length; i++) {
+            ITACoRootToChild.StakingProviderUpdate calldata update = _updates[i];
+            updateAuthorization(
+                update.stakingProvider,
+                update.authorized,
+                update.deauthorizing,
+                update.endDeauthorization
+            );
+            updateOperator(update.stakingProvider, update.operator);
+        }
+    }
+
     function confirmOperatorAddress(address _operator) external {
         rootApplication.confirmOperatorAddress(_operator);
     }
@@ -40,6 +40,10 @@ contract RootApplicationForTACoChildApplicationMock {
         );
     }
 
+    function batchUpdate(ITACoRootToChild.StakingProviderUpdate[] calldata _updates) external {
+        childApplication.batchUpdate(_updates);
+    }
+
     function confirmOperatorAddress(address _operator) external {
         confirmations[_operator] = true;
     }
@@ -56,6 +60,8 @@ contract RootApplicationForTACoChildApplicationMock {
 contract CoordinatorForTACoChildApplicationMock {
     ITACoChildToRoot public immutable application;
 
+    mapping(address => bool) internal missingPublicKeys;
+
     constructor(ITACoChildToRoot _application) {
         application = _application;
     }
@@ -63,4 +69,18 @@ contract CoordinatorForTACoChildApplicationMock {
     function confirmOperatorAddress(address _operator) external {
         application.confirmOperatorAddress(_operator);
     }
+
+    function batchConfirmOperatorAddress(address[] calldata _operators) external {
+        for (uint256 i = 0; i < _operators.length; i++) {
+            application.confirmOperatorAddress(_operators[i]);
+        }
+    }
+
+    function resetProviderPublicKey(address _stakingProvider) external {
+        missingPublicKeys[_stakingProvider] = true;
+    }
+
+    function isProviderPublicKeySet(address _stakingProvider) external view returns (bool) {
+        return !missingPublicKeys[_stakingProvider];
+    }
 }
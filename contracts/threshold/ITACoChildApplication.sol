@@ -9,6 +9,10 @@ interface ITACoChildApplication is ITACoChildToRoot {
 
     function authorizedStake(address _stakingProvider) external view returns (uint96);
 
+    function authorizedStakes(
+        address[] calldata _stakingProviders
+    ) external view returns (uint96[] memory);
+
     function minimumAuthorization() external view returns (uint96);
     //TODO: Function to get locked stake duration?
 }
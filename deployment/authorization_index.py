@@ -0,0 +1,210 @@
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from ape import chain
+from ape.contracts import ContractInstance
+from eth_typing import ChecksumAddress
+from eth_utils import to_canonical_address, to_checksum_address
+
+from deployment.encryptors import ADDRESS_DTYPE
+
+# Sorted arrays of "S20" records support searchsorted; they are converted from and to the raw
+# ADDRESS_DTYPE records with zero-copy views, so trailing zero bytes are never lost
+SORTED_ADDRESS_DTYPE = np.dtype("S20")
+
+DEFAULT_BLOCK_STEP = 10_000
+
+
+def _as_sorted_dtype(addresses) -> np.ndarray:
+    if isinstance(addresses, np.ndarray) and addresses.dtype == ADDRESS_DTYPE:
+        return addresses.view(SORTED_ADDRESS_DTYPE)
+    buffer = b"".join(to_canonical_address(a) for a in addresses)
+    return np.frombuffer(buffer, dtype=SORTED_ADDRESS_DTYPE)
+
+
+def _to_checksum_addresses(addresses: np.ndarray) -> List[ChecksumAddress]:
+    raw = np.frombuffer(addresses.tobytes(), dtype=ADDRESS_DTYPE)
+    return [to_checksum_address(address.tobytes()) for address in raw]
+
+
+class AuthorizationIndex:
+    """
+    Local index of the encryptors authorized in a GlobalAllowList or ManagedAllowList,
+    built from AddressAuthorizationSet (and AdministratorCapSet) events and updated
+    incrementally from a block cursor. Authorized encryptors of each ritual are kept
+    as a sorted array of addresses, so bulk membership checks don't need any RPC call.
+
+    A new index starts reading events at `start_block`, which should be the deployment
+    block of the access controller; no event can be emitted before it.
+    """
+
+    def __init__(
+        self,
+        access_controller: str,
+        chain_id: int,
+        cursor: Optional[int] = None,
+        start_block: int = 0,
+    ):
+        if start_block < 0:
+            raise ValueError(f"Start block must not be negative; got {start_block}")
+        self.access_controller = access_controller
+        self.chain_id = chain_id
+        self.cursor = start_block - 1 if cursor is None else cursor  # last processed block
+        self._authorized: Dict[int, np.ndarray] = dict()
+        self._auth_actions: Dict[int, int] = dict()
+        self._administrator_caps: Dict[int, Dict[str, int]] = dict()
+        self._used_encryptor_slots = 0
+
+    #
+    # Queries
+    #
+
+    @property
+    def rituals(self) -> List[int]:
+        return sorted(set(self._authorized) | set(self._auth_actions))
+
+    def is_authorized(self, ritual_id: int, addresses) -> np.ndarray:
+        """Returns a boolean mask of the addresses authorized for the ritual."""
+        authorized = self._authorized.get(ritual_id)
+        addresses = _as_sorted_dtype(addresses)
+        if authorized is None or len(authorized) == 0:
+            return np.zeros(len(addresses), dtype=bool)
+        positions = np.searchsorted(authorized, addresses)
+        positions[positions == len(authorized)] = 0
+        return authorized[positions] == addresses
+
+    def authorized(self, ritual_id: int) -> List[ChecksumAddress]:
+        authorized = self._authorized.get(ritual_id, np.empty(0, SORTED_ADDRESS_DTYPE))
+        return _to_checksum_addresses(authorized)
+
+    def authorized_count(self, ritual_id: int) -> int:
+        return len(self._authorized.get(ritual_id, ()))
+
+    def auth_actions(self, ritual_id: int) -> int:
+        """Mirrors the `authActions` counter of the access controller."""
+        return self._auth_actions.get(ritual_id, 0)
+
+    def administrator_caps(self, ritual_id: int) -> Dict[str, int]:
+        """Administrators of a ManagedAllowList ritual with a non-zero cap."""
+        caps = self._administrator_caps.get(ritual_id, dict())
+        return {admin: cap for admin, cap in caps.items() if cap > 0}
+
+    @property
+    def used_encryptor_slots(self) -> int:
+        """
+        Mirrors `usedEncryptorSlots` of an EncryptorSlotsSubscription serving all the rituals
+        of the access controller: incremented on authorization, decremented (down to 0)
+        on deauthorization.
+        """
+        return self._used_encryptor_slots
+
+    #
+    # Updates
+    #
+
+    def _apply_authorizations(self, ritual_id: int, logs: list) -> None:
+        # only the last event of every address in the batch matters
+        # (underscored event arguments are not exposed as attributes of the log)
+        final = dict()
+        for log in logs:
+            final[log.event_arguments["_address"]] = log.isAuthorized
+        added = _as_sorted_dtype([a for a, v in final.items() if v])
+        removed = _as_sorted_dtype([a for a, v in final.items() if not v])
+        authorized = self._authorized.get(ritual_id, np.empty(0, SORTED_ADDRESS_DTYPE))
+        authorized = np.union1d(authorized, added)
+        self._authorized[ritual_id] = np.setdiff1d(authorized, removed, assume_unique=True)
+
+    def apply(self, logs: Iterable) -> None:
+        """Applies AddressAuthorizationSet and AdministratorCapSet logs, in chain order."""
+        logs = sorted(logs, key=lambda log: (log.block_number, log.log_index))
+        authorizations = dict()
+        for log in logs:
+            ritual_id = log.ritualId
+            self._auth_actions[ritual_id] = self._auth_actions.get(ritual_id, 0) + 1
+            if log.event_name == "AdministratorCapSet":
+                caps = self._administrator_caps.setdefault(ritual_id, dict())
+                caps[log.event_arguments["_address"]] = log.cap
+                continue
+            authorizations.setdefault(ritual_id, list()).append(log)
+            if log.isAuthorized:
+                self._used_encryptor_slots += 1
+            else:
+                self._used_encryptor_slots = max(self._used_encryptor_slots - 1, 0)
+        for ritual_id, ritual_logs in authorizations.items():
+            self._apply_authorizations(ritual_id, ritual_logs)
+
+    def update(
+        self,
+        access_controller: ContractInstance,
+        stop_block: Optional[int] = None,
+        step: int = DEFAULT_BLOCK_STEP,
+    ) -> int:
+        """
+        Processes the events emitted since the cursor up to `stop_block` (default: head),
+        `step` blocks at a time. Returns the number of processed events.
+        """
+        if access_controller.address != self.access_controller:
+            raise ValueError(f"Index belongs to {self.access_controller}")
+        stop_block = chain.blocks.head.number if stop_block is None else stop_block
+        events = [access_controller.AddressAuthorizationSet]
+        if hasattr(access_controller, "AdministratorCapSet"):
+            events.append(access_controller.AdministratorCapSet)
+
+        processed = 0
+        for start in range(self.cursor + 1, stop_block + 1, step):
+            stop = min(start + step, stop_block + 1)
+            logs = [log for event in events for log in event.range(start, stop)]
+            self.apply(logs)
+            processed += len(logs)
+            self.cursor = stop - 1
+        return processed
+
+    #
+    # Persistence
+    #
+
+    def save(self, filepath: Path) -> None:
+        metadata = dict(
+            access_controller=self.access_controller,
+            chain_id=self.chain_id,
+            cursor=self.cursor,
+            auth_actions=self._auth_actions,
+            administrator_caps=self._administrator_caps,
+            used_encryptor_slots=self._used_encryptor_slots,
+        )
+        arrays = {f"ritual_{r}": a for r, a in self._authorized.items()}
+        with open(filepath, "wb") as file:
+            np.savez(file, metadata=np.array(json.dumps(metadata)), **arrays)
+
+    @classmethod
+    def load(cls, filepath: Path) -> "AuthorizationIndex":
+        with np.load(filepath, allow_pickle=False) as data:
+            metadata = json.loads(str(data["metadata"]))
+            index = cls(metadata["access_controller"], metadata["chain_id"], metadata["cursor"])
+            index._authorized = {
+                int(key[len("ritual_") :]): data[key] for key in data if key.startswith("ritual_")
+            }
+        # json keys are strings
+        index._auth_actions = {int(r): n for r, n in metadata["auth_actions"].items()}
+        index._administrator_caps = {
+            int(r): caps for r, caps in metadata["administrator_caps"].items()
+        }
+        index._used_encryptor_slots = metadata["used_encryptor_slots"]
+        return index
+
+    @classmethod
+    def open(
+        cls, filepath: Path, access_controller: str, chain_id: int, start_block: int = 0
+    ) -> "AuthorizationIndex":
+        """
+        Loads the index from `filepath`, or creates an empty one starting at `start_block`
+        if there is none yet.
+        """
+        if not Path(filepath).exists():
+            return cls(access_controller, chain_id, start_block=start_block)
+        index = cls.load(filepath)
+        if index.access_controller != access_controller or index.chain_id != chain_id:
+            raise ValueError(f"Index {filepath} belongs to another access controller")
+        return index
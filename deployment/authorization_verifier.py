@@ -0,0 +1,124 @@
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import coincurve
+import numpy as np
+from eth_utils import keccak
+
+from deployment.authorization_index import AuthorizationIndex
+from deployment.encryptors import ADDRESS_DTYPE
+
+SECP256K1_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+SIGNATURE_LENGTH = 65
+EIP191_PREFIX = b"\x19Ethereum Signed Message:\n32"
+
+DEFAULT_CACHE_SIZE = 100_000
+DEFAULT_CHUNK_SIZE = 256
+
+# (ritual id, evidence, ciphertext header)
+AuthorizationRequest = Tuple[int, bytes, bytes]
+
+
+def eth_signed_message_hash(ciphertext_header: bytes) -> bytes:
+    """Mirrors `keccak256(ciphertextHeader).toEthSignedMessageHash()`"""
+    return keccak(EIP191_PREFIX + keccak(ciphertext_header))
+
+
+def recover_signer(evidence: bytes, ciphertext_header: bytes) -> Optional[bytes]:
+    """
+    Recovers the canonical address of the signer as GlobalAllowList.isAuthorized does.
+    Returns None where OpenZeppelin's ECDSA.recover reverts: signatures that are not 65 bytes
+    long, with malleable `s` values (upper half of the curve order), invalid `v`, or invalid
+    `r` and `s` values.
+    """
+    if len(evidence) != SIGNATURE_LENGTH:
+        return None
+    r = int.from_bytes(evidence[:32], "big")
+    s = int.from_bytes(evidence[32:64], "big")
+    v = evidence[64]
+    if s > SECP256K1_N // 2 or v not in (27, 28) or not 0 < r < SECP256K1_N or s == 0:
+        return None
+    try:
+        public_key = coincurve.PublicKey.from_signature_and_message(
+            evidence[:64] + bytes([v - 27]), eth_signed_message_hash(ciphertext_header), hasher=None
+        )
+    except ValueError:
+        return None
+    return keccak(public_key.format(compressed=False)[1:])[12:]
+
+
+def _recover_signers(pairs: Sequence[Tuple[bytes, bytes]]) -> List[Optional[bytes]]:
+    return [recover_signer(evidence, header) for evidence, header in pairs]
+
+
+def recover_signers(
+    pairs: Sequence[Tuple[bytes, bytes]],
+    executor: Optional[Executor] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[Optional[bytes]]:
+    """
+    Recovers the signers of many (evidence, ciphertext header) pairs. With an executor
+    (e.g. a ProcessPoolExecutor) pairs are recovered in parallel, `chunk_size` at a time.
+    """
+    if executor is None:
+        return _recover_signers(pairs)
+    chunks = [pairs[i : i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+    return [signer for chunk in executor.map(_recover_signers, chunks) for signer in chunk]
+
+
+class AuthorizationVerifier:
+    """
+    Off-chain counterpart of GlobalAllowList.isAuthorized for bulk pre-checks: signers are
+    recovered locally (and cached) and looked up in a local authorization index.
+    Note that the fee model check of the contract (`beforeIsAuthorized`) is not mirrored.
+    """
+
+    def __init__(
+        self,
+        index: AuthorizationIndex,
+        executor: Optional[Executor] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        self.index = index
+        self.executor = executor
+        self.cache_size = cache_size
+        self._signers = OrderedDict()
+
+    @staticmethod
+    def _cache_key(evidence: bytes, ciphertext_header: bytes) -> bytes:
+        return keccak(ciphertext_header) + bytes(evidence)
+
+    def signers(self, pairs: Sequence[Tuple[bytes, bytes]]) -> List[Optional[bytes]]:
+        """Recovers the signers of (evidence, ciphertext header) pairs, using the LRU cache."""
+        keys = [self._cache_key(evidence, header) for evidence, header in pairs]
+        misses = dict()
+        for key, pair in zip(keys, pairs):
+            if key in self._signers:
+                self._signers.move_to_end(key)
+            else:
+                misses[key] = pair
+        recovered = recover_signers(list(misses.values()), executor=self.executor)
+        recovered = dict(zip(misses, recovered))
+        signers = [recovered[key] if key in recovered else self._signers[key] for key in keys]
+        self._signers.update(recovered)
+        while len(self._signers) > self.cache_size:
+            self._signers.popitem(last=False)
+        return signers
+
+    def verify(self, requests: Iterable[AuthorizationRequest]) -> np.ndarray:
+        """Returns a boolean mask of the requests that GlobalAllowList would authorize."""
+        requests = list(requests)
+        signers = self.signers([(evidence, header) for _, evidence, header in requests])
+        ritual_ids = np.fromiter((r[0] for r in requests), dtype=np.int64, count=len(requests))
+        recovered = np.array([signer is not None for signer in signers], dtype=bool)
+        # unrecoverable signers are looked up as the zero address, but never authorized
+        addresses = np.frombuffer(
+            b"".join(signer or bytes(20) for signer in signers), dtype=ADDRESS_DTYPE
+        )
+
+        authorized = np.zeros(len(requests), dtype=bool)
+        for ritual_id in np.unique(ritual_ids):
+            mask = ritual_ids == ritual_id
+            authorized[mask] = self.index.is_authorized(int(ritual_id), addresses[mask])
+        return authorized & recovered
@@ -0,0 +1,158 @@
+import threading
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional, Tuple
+
+from ape import networks
+from ape.api import ProviderAPI, TransactionAPI
+from hexbytes import HexBytes
+
+DEFAULT_CACHE_SIZE = 1024
+
+CacheKey = Tuple[str, bytes, int]
+
+
+class CacheStats(NamedTuple):
+    """Hit/miss counters of a read cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class BlockPinnedCallCache:
+    """
+    Opt-in, thread-safe LRU cache for eth_call requests made through an ape provider.
+
+    While active, every contract call is executed against a single pinned block, and its
+    result is keyed by (to, calldata, block number). Repeated reads of the same state
+    (e.g. `Coordinator.rituals(id)` from several code paths) only hit the RPC node once.
+
+    Usage:
+        with BlockPinnedCallCache() as cache:
+            coordinator.rituals(ritual_id)
+            coordinator.rituals(ritual_id)  # served from the cache
+        print(cache.stats)
+    """
+
+    def __init__(
+        self,
+        provider: Optional[ProviderAPI] = None,
+        block_number: Optional[int] = None,
+        maxsize: int = DEFAULT_CACHE_SIZE,
+    ):
+        if maxsize < 1:
+            raise ValueError(f"Cache size must be positive; got {maxsize}")
+        self._provider = provider
+        self._block_number = block_number
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[CacheKey, HexBytes]" = OrderedDict()
+        self._original_send_call = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def provider(self) -> ProviderAPI:
+        return self._provider or networks.provider
+
+    @property
+    def block_number(self) -> int:
+        """The block that reads are pinned to; defaults to the head at first use."""
+        if self._block_number is None:
+            self._block_number = self.provider.get_block("latest").number
+        return self._block_number
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=len(self._entries),
+        )
+
+    @property
+    def active(self) -> bool:
+        return self._original_send_call is not None
+
+    def refresh(self, block_number: Optional[int] = None) -> int:
+        """Re-pins reads to a new block (the current head by default) and drops stale entries."""
+        with self._lock:
+            self._entries.clear()
+        self._block_number = block_number
+        return self.block_number
+
+    def clear(self) -> None:
+        """Drops all cached entries and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def _get(self, key: CacheKey) -> Optional[HexBytes]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return result
+
+    def _put(self, key: CacheKey, value: HexBytes) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _send_call(
+        self,
+        txn: TransactionAPI,
+        block_id: Optional[Any] = None,
+        state: Optional[dict] = None,
+        **kwargs,
+    ) -> HexBytes:
+        if state is not None or (block_id is not None and not isinstance(block_id, int)):
+            # state overrides and symbolic block ids ("pending", hashes) are never cached
+            return self._original_send_call(txn, block_id=block_id, state=state, **kwargs)
+
+        block_number = self.block_number if block_id is None else block_id
+        key = (str(txn.receiver).lower(), bytes(txn.data), block_number)
+        result = self._get(key)
+        if result is not None:
+            return result
+
+        result = self._original_send_call(txn, block_id=block_number, **kwargs)
+        self._put(key, HexBytes(result))
+        return result
+
+    def __enter__(self) -> "BlockPinnedCallCache":
+        if self.active:
+            raise RuntimeError("Read cache is already active")
+        provider = self.provider
+        if "send_call" in vars(provider):
+            raise RuntimeError("Another read cache is active for this provider")
+        self._provider = provider  # stay bound to the same provider until exit
+        self._original_send_call = provider.send_call
+        # providers are pydantic models, so bypass field validation to shadow the method
+        object.__setattr__(provider, "send_call", self._send_call)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        object.__delattr__(self._provider, "send_call")
+        self._original_send_call = None
+
+
+def pinned_reads(
+    provider: Optional[ProviderAPI] = None, maxsize: int = DEFAULT_CACHE_SIZE
+) -> BlockPinnedCallCache:
+    """Returns a read cache pinned to the current head of the connected provider."""
+    return BlockPinnedCallCache(provider=provider, maxsize=maxsize)
@@ -55,6 +55,13 @@ ACCESS_CONTROLLERS = ["GlobalAllowList", "OpenAccessAuthorizer", "ManagedAllowLi
 
 FEE_MODELS = ["FreeFeeModel", "BqETHSubscription"]
 
+#
+# Cross-chain synchronization
+#
+
+# TACoApplication.MAX_BATCH_SYNC_SIZE, max staking providers per batchChildSynchronization call
+MAX_BATCH_SYNC_SIZE = 16
+
 #
 # Sampling
 #
@@ -0,0 +1,123 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from ape.contracts import ContractInstance
+from ape.utils import ZERO_ADDRESS
+
+from deployment.constants import MAX_BATCH_SYNC_SIZE
+from deployment.roster import SNAPSHOT_KEY_COLUMN, snapshot_metadata
+
+# State that TACoApplication pushes to TACoChildApplication through the Polygon bridge
+SYNCHRONIZED_COLUMNS = ("operator", "authorized", "deauthorizing", "end_deauthorization")
+
+# Root events after which the child application is expected to be updated
+ROOT_UPDATE_EVENTS = (
+    "AuthorizationIncreased",
+    "AuthorizationInvoluntaryDecreased",
+    "AuthorizationDecreaseRequested",
+    "AuthorizationDecreaseApproved",
+    "AuthorizationReSynchronized",
+    "OperatorBonded",
+    "ManualChildSynchronizationSent",
+)
+
+
+def sync_batches(
+    staking_providers: Iterable[str], batch_size: int = MAX_BATCH_SYNC_SIZE
+) -> Iterator[List[str]]:
+    """Splits staking providers into batches for TACoApplication.batchChildSynchronization."""
+    if not 0 < batch_size <= MAX_BATCH_SYNC_SIZE:
+        raise ValueError(
+            f"Batch size must be between 1 and {MAX_BATCH_SYNC_SIZE}; got {batch_size}"
+        )
+    batch = list()
+    for staking_provider in staking_providers:
+        batch.append(staking_provider)
+        if len(batch) == batch_size:
+            yield batch
+            batch = list()
+    if batch:
+        yield batch
+
+
+def _synchronized_state(snapshot) -> pd.DataFrame:
+    df = snapshot.to_pandas().set_index(SNAPSHOT_KEY_COLUMN)
+    return df.loc[:, list(SYNCHRONIZED_COLUMNS)]
+
+
+def detect_drift(root_snapshot, child_snapshot) -> pd.DataFrame:
+    """
+    Compares root (TACoApplication) and child (TACoChildApplication) snapshots and returns
+    the staking providers whose synchronized state differs, with root and child values side
+    by side and the names of the drifted columns.
+    """
+    root = _synchronized_state(root_snapshot)
+    child = _synchronized_state(child_snapshot)
+    # providers never synchronized to the child have default (empty) state there
+    child = child.reindex(root.index)
+    child["operator"] = child["operator"].fillna(ZERO_ADDRESS)
+    child = child.fillna(0)
+
+    mismatches = np.column_stack(
+        [
+            (
+                root[column].str.lower().to_numpy() != child[column].str.lower().to_numpy()
+                if column == "operator"
+                else root[column].to_numpy() != child[column].to_numpy()
+            )
+            for column in SYNCHRONIZED_COLUMNS
+        ]
+    )
+    drifted = mismatches.any(axis=1)
+    drifted_columns = [
+        ",".join(c for c, m in zip(SYNCHRONIZED_COLUMNS, row) if m) for row in mismatches[drifted]
+    ]
+    result = root[drifted].join(child[drifted], lsuffix="_root", rsuffix="_child")
+    result["drifted_columns"] = drifted_columns
+    result["root_block"] = snapshot_metadata(root_snapshot)["block_number"]
+    result["child_block"] = snapshot_metadata(child_snapshot)["block_number"]
+    return result.reset_index()
+
+
+def _chain_position(log) -> tuple:
+    return log.block_number, log.log_index
+
+
+def last_root_updates(
+    root_application: ContractInstance,
+    staking_providers: Iterable[str],
+    start_block: int,
+    stop_block: int,
+) -> Dict[str, Optional[int]]:
+    """
+    Returns the timestamp of the latest root-side update of each staking provider
+    within [start_block, stop_block), or None if there was none.
+    Every update event is queried once for the whole range, not per staking provider.
+    Must be called while connected to the root chain.
+    """
+    latest_logs = dict()
+    for event_name in ROOT_UPDATE_EVENTS:
+        event = getattr(root_application, event_name)
+        for log in event.range(start_block, stop_block):
+            staking_provider = log.stakingProvider.lower()
+            latest = latest_logs.get(staking_provider)
+            if latest is None or _chain_position(log) > _chain_position(latest):
+                latest_logs[staking_provider] = log
+
+    updates = dict()
+    for staking_provider in staking_providers:
+        latest = latest_logs.get(staking_provider.lower())
+        updates[staking_provider] = latest.timestamp if latest is not None else None
+    return updates
+
+
+def add_staleness(
+    drift: pd.DataFrame, last_updates: Dict[str, Optional[int]], reference_timestamp: int
+) -> pd.DataFrame:
+    """
+    Adds the number of seconds each drifted provider has been out of sync, measured from
+    its latest root-side update to the reference (root snapshot) timestamp.
+    """
+    updated_at = drift[SNAPSHOT_KEY_COLUMN].map(last_updates).astype("float64")
+    return drift.assign(staleness=reference_timestamp - updated_at)
@@ -0,0 +1,228 @@
+import json
+from collections import deque
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, TextIO
+
+import numpy as np
+from ape import chain
+from ape.api import AccountAPI, ReceiptAPI
+from ape.contracts import ContractInstance
+from ape.exceptions import TransactionNotFoundError
+from eth_typing import ChecksumAddress
+from eth_utils import is_address, to_checksum_address, to_hex
+
+from deployment.roster import batch_calls
+
+# Addresses are kept as raw 20-byte records (not "S20", which strips trailing zero bytes)
+ADDRESS_DTYPE = np.dtype("V20")
+
+DEFAULT_MAX_WORKERS = 8
+# isAddressAuthorized checks per Multicall3 call, well below the gas limit of eth_call
+DEFAULT_AUTHORIZED_PAGE_SIZE = 2_000
+DEFAULT_MAX_IN_FLIGHT = 8
+DEFAULT_READ_BLOCK_SIZE = 100_000
+DEFAULT_RECEIPT_TIMEOUT = 600
+
+
+def _parse_address(line: str, line_number: int) -> bytes:
+    if not is_address(line):
+        raise ValueError(f"Invalid address '{line}' on line {line_number}")
+    return bytes.fromhex(line[2:])
+
+
+def stream_addresses(
+    file: TextIO, block_size: int = DEFAULT_READ_BLOCK_SIZE
+) -> Iterator[np.ndarray]:
+    """
+    Reads addresses from a file with one address per line, yielding arrays of at most
+    `block_size` addresses. Empty lines and lines starting with '#' are ignored.
+    """
+    block = bytearray()
+    for line_number, line in enumerate(file, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        block += _parse_address(line, line_number)
+        if len(block) == block_size * ADDRESS_DTYPE.itemsize:
+            yield np.frombuffer(bytes(block), dtype=ADDRESS_DTYPE)
+            block = bytearray()
+    if block:
+        yield np.frombuffer(bytes(block), dtype=ADDRESS_DTYPE)
+
+
+def unique_addresses(addresses: np.ndarray) -> np.ndarray:
+    """Removes duplicated addresses, keeping the order of first occurrences."""
+    _, first_occurrences = np.unique(addresses, return_index=True)
+    return addresses[np.sort(first_occurrences)]
+
+
+def load_addresses(filepath: Path, block_size: int = DEFAULT_READ_BLOCK_SIZE) -> np.ndarray:
+    """Loads and deduplicates addresses from a file, see `stream_addresses`."""
+    with open(filepath, "r") as file:
+        # all addresses of the file are kept in memory (20 bytes each, duplicates included)
+        # and deduplicated once, re-deduplicating the accumulated array per block is quadratic
+        blocks = list(stream_addresses(file, block_size=block_size))
+    if not blocks:
+        return np.empty(0, dtype=ADDRESS_DTYPE)
+    return unique_addresses(np.concatenate(blocks))
+
+
+def checksum_addresses(addresses: np.ndarray) -> List[ChecksumAddress]:
+    return [to_checksum_address(address.tobytes()) for address in addresses]
+
+
+def fetch_authorized(
+    access_controller: ContractInstance,
+    ritual_id: int,
+    addresses: np.ndarray,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    page_size: int = DEFAULT_AUTHORIZED_PAGE_SIZE,
+) -> np.ndarray:
+    """
+    Returns a boolean mask of the addresses already authorized for the ritual,
+    checking `page_size` addresses per Multicall3 call (see `batch_calls`).
+    """
+    arguments = [(ritual_id, address) for address in checksum_addresses(addresses)]
+    authorized = batch_calls(
+        access_controller.isAddressAuthorized, arguments, page_size, max_workers
+    )
+    return np.fromiter(authorized, dtype=bool, count=len(addresses))
+
+
+def available_encryptor_slots(subscription: ContractInstance) -> int:
+    """Returns the number of paid encryptor slots not yet used in the current period."""
+    period = subscription.getCurrentPeriodNumber()
+    paid_slots = (
+        subscription.getPaidEncryptorSlots(period) if subscription.isPeriodPaid(period) else 0
+    )
+    return max(paid_slots - subscription.usedEncryptorSlots(), 0)
+
+
+def chunk_addresses(addresses: np.ndarray, chunk_size: int) -> List[np.ndarray]:
+    """Splits addresses into consecutive chunks of `chunk_size` (the last one may be smaller)."""
+    return [addresses[i : i + chunk_size] for i in range(0, len(addresses), chunk_size)]
+
+
+class AuthorizationCheckpoint:
+    """
+    Progress of a bulk authorization, persisted after every transaction.
+    Only in-flight transactions are tracked: on resume they are awaited, and addresses
+    authorized on-chain are filtered out again, so nothing else needs to be stored.
+    """
+
+    def __init__(self, filepath: Path, ritual_id: int, access_controller: str):
+        self.filepath = Path(filepath)
+        self.ritual_id = ritual_id
+        self.access_controller = access_controller
+        self.pending = list()
+        self.authorized = 0
+
+    @classmethod
+    def load(cls, filepath: Path, ritual_id: int, access_controller: str):
+        checkpoint = cls(filepath, ritual_id, access_controller)
+        if not checkpoint.filepath.exists():
+            return checkpoint
+        data = json.loads(checkpoint.filepath.read_text())
+        if data["ritual_id"] != ritual_id or data["access_controller"] != access_controller:
+            raise ValueError(
+                f"Checkpoint {filepath} belongs to ritual {data['ritual_id']} "
+                f"of access controller {data['access_controller']}"
+            )
+        checkpoint.pending = data["pending"]
+        checkpoint.authorized = data["authorized"]
+        return checkpoint
+
+    def save(self) -> None:
+        data = dict(
+            ritual_id=self.ritual_id,
+            access_controller=self.access_controller,
+            pending=self.pending,
+            authorized=self.authorized,
+        )
+        # write-then-rename, so that a crash never leaves a truncated checkpoint
+        temporary = self.filepath.with_suffix(self.filepath.suffix + ".tmp")
+        temporary.write_text(json.dumps(data, indent=4))
+        temporary.replace(self.filepath)
+
+    def sent(self, txn_hash: str, nonce: int, size: int) -> None:
+        self.pending.append(dict(txn_hash=txn_hash, nonce=nonce, size=size))
+        self.save()
+
+    def confirmed(self, txn_hash: str) -> None:
+        entry = next(p for p in self.pending if p["txn_hash"] == txn_hash)
+        self.pending.remove(entry)
+        self.authorized += entry["size"]
+        self.save()
+
+    def dropped(self, txn_hash: str) -> None:
+        self.pending = [p for p in self.pending if p["txn_hash"] != txn_hash]
+        self.save()
+
+
+def _await_receipt(txn_hash: str, timeout: int) -> ReceiptAPI:
+    receipt = chain.provider.get_receipt(txn_hash, timeout=timeout)
+    if receipt.failed:
+        raise RuntimeError(f"Authorization transaction {txn_hash} failed")
+    return receipt
+
+
+def await_pending(
+    checkpoint: AuthorizationCheckpoint, timeout: int = DEFAULT_RECEIPT_TIMEOUT
+) -> None:
+    """
+    Waits for the transactions that were in flight when the previous run stopped.
+    Transactions that failed or never made it to the network are forgotten; their addresses
+    are still unauthorized on-chain and will be sent again.
+    """
+    for entry in list(checkpoint.pending):
+        try:
+            receipt = chain.provider.get_receipt(entry["txn_hash"], timeout=timeout)
+        except TransactionNotFoundError:
+            checkpoint.dropped(entry["txn_hash"])
+            continue
+        if receipt.failed:
+            checkpoint.dropped(entry["txn_hash"])
+        else:
+            checkpoint.confirmed(entry["txn_hash"])
+
+
+def send_authorizations(
+    access_controller: ContractInstance,
+    ritual_id: int,
+    chunks: List[np.ndarray],
+    account: AccountAPI,
+    checkpoint: AuthorizationCheckpoint,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    timeout: int = DEFAULT_RECEIPT_TIMEOUT,
+    progress: Optional[Callable[[AuthorizationCheckpoint], None]] = None,
+) -> None:
+    """
+    Sends one `authorize` transaction per chunk with consecutive nonces, keeping up to
+    `max_in_flight` transactions unconfirmed at a time instead of waiting for each one.
+    """
+    nonce = account.nonce
+    in_flight = deque()
+
+    def confirm_oldest():
+        txn_hash = in_flight.popleft()
+        _await_receipt(txn_hash, timeout=timeout)
+        checkpoint.confirmed(txn_hash)
+        if progress:
+            progress(checkpoint)
+
+    for chunk in chunks:
+        if len(in_flight) == max_in_flight:
+            confirm_oldest()
+        txn = access_controller.authorize.as_transaction(
+            ritual_id, checksum_addresses(chunk), sender=account, nonce=nonce
+        )
+        signed_txn = account.sign_transaction(txn)
+        txn_hash = to_hex(
+            chain.provider.web3.eth.send_raw_transaction(signed_txn.serialize_transaction())
+        )
+        checkpoint.sent(txn_hash, nonce=nonce, size=len(chunk))
+        in_flight.append(txn_hash)
+        nonce += 1
+
+    while in_flight:
+        confirm_oldest()
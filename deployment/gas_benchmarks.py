@@ -0,0 +1,175 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Relative increase over the baseline value that fails a benchmark
+DEFAULT_THRESHOLD = 0.02
+
+# Set to record the measured values as the new baseline instead of comparing with it
+UPDATE_BASELINE_ENV = "UPDATE_GAS_BASELINE"
+
+# Set to run the gas benchmarks, which are skipped by default
+RUN_BENCHMARKS_ENV = "GAS_BENCHMARKS"
+
+# Set to a directory to write the gas matrix of each benchmark module as JSON and markdown
+REPORT_DIR_ENV = "GAS_REPORT_DIR"
+
+
+def _flag(name: str) -> bool:
+    return os.environ.get(name, "").lower() in ("1", "true", "yes")
+
+
+def update_requested() -> bool:
+    return _flag(UPDATE_BASELINE_ENV)
+
+
+def benchmarks_requested() -> bool:
+    """Benchmarks run when requested, or when their baselines are being updated."""
+    return _flag(RUN_BENCHMARKS_ENV) or update_requested()
+
+
+class GasBaseline:
+    """
+    Gas usage (and calldata size) metrics of benchmarks, keyed by metric name and stored
+    as JSON next to the benchmarks. Measurements above the baseline value by more than
+    `threshold` are regressions, and metrics missing from the baseline fail the check
+    unless the baseline is being updated.
+
+    Usage:
+        baseline = GasBaseline.load(filepath)
+        baseline.check("initiateRitual.gas[dkg_size=4]", tx.gas_used)
+        baseline.save()  # when the baseline is being updated
+    """
+
+    def __init__(
+        self,
+        filepath: Path,
+        metrics: Optional[Dict[str, int]] = None,
+        threshold: float = DEFAULT_THRESHOLD,
+    ):
+        self.filepath = Path(filepath)
+        self.metrics = dict(metrics or dict())
+        self.threshold = threshold
+        self.update = update_requested()
+        self.measurements: Dict[str, int] = dict()
+
+    @classmethod
+    def load(cls, filepath: Path) -> "GasBaseline":
+        """Loads a baseline, or creates an empty one if there is no file yet."""
+        filepath = Path(filepath)
+        if not filepath.exists():
+            return cls(filepath)
+        with open(filepath, "r") as file:
+            data = json.load(file)
+        return cls(
+            filepath,
+            metrics=data.get("metrics"),
+            threshold=data.get("threshold", DEFAULT_THRESHOLD),
+        )
+
+    def save(self) -> None:
+        """Stores the measurements of this run as the new baseline."""
+        metrics = {**self.metrics, **self.measurements}
+        data = dict(threshold=self.threshold, metrics=dict(sorted(metrics.items())))
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.filepath, "w") as file:
+            json.dump(data, file, indent=4)
+            file.write("\n")
+
+    def compare(self, name: str, value: int) -> Optional[str]:
+        """Returns a description of the regression of the metric, if any."""
+        baseline = self.metrics.get(name)
+        if baseline is None or value <= baseline * (1 + self.threshold):
+            return None
+        increase = (value - baseline) / baseline if baseline else float("inf")
+        return (
+            f"{name} regressed: {value} vs {baseline} in baseline "
+            f"(+{increase:.2%}, threshold {self.threshold:.2%})"
+        )
+
+    def record(self, name: str, value: int) -> Optional[str]:
+        """Records a measurement and compares it with the baseline."""
+        value = int(value)
+        self.measurements[name] = value
+        return self.compare(name, value)
+
+    def check(self, name: str, value: int) -> None:
+        """
+        Records a measurement and fails on regressions or metrics missing from the baseline,
+        unless the baseline is being updated.
+        """
+        regression = self.record(name, value)
+        if self.update:
+            return
+        if name not in self.metrics:
+            raise AssertionError(
+                f"{name} is missing from baseline {self.filepath.name}, "
+                f"record it with {UPDATE_BASELINE_ENV}=1"
+            )
+        if regression:
+            raise AssertionError(regression)
+
+    def write_report(self, directory: Path) -> None:
+        """Writes the measured gas matrix as <baseline name>.json and <baseline name>.md."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / f"{self.filepath.stem}.json", "w") as file:
+            json.dump(gas_matrix(self.measurements), file, indent=4)
+            file.write("\n")
+        with open(directory / f"{self.filepath.stem}.md", "w") as file:
+            file.write(f"## {self.filepath.stem}\n\n")
+            file.write(markdown_table(self.measurements, baseline=self.metrics))
+
+    @property
+    def regressions(self) -> List[str]:
+        return [r for r in (self.compare(n, v) for n, v in self.measurements.items()) if r]
+
+    @property
+    def missing(self) -> List[str]:
+        """Measured metrics that are not in the baseline yet."""
+        return sorted(set(self.measurements) - set(self.metrics))
+
+
+def split_metric_name(name: str) -> Tuple[str, str]:
+    """Splits "postTranscript.gas[dkg_size=4]" into ("postTranscript.gas", "dkg_size=4")."""
+    metric, _, parameters = name.partition("[")
+    return metric, parameters.rstrip("]")
+
+
+def gas_matrix(measurements: Dict[str, int]) -> Dict[str, Dict[str, int]]:
+    """Groups measurements by metric and then by parameters, keeping the order of measurement."""
+    matrix: Dict[str, Dict[str, int]] = dict()
+    for name, value in measurements.items():
+        metric, parameters = split_metric_name(name)
+        matrix.setdefault(metric, dict())[parameters] = value
+    return matrix
+
+
+def markdown_table(measurements: Dict[str, int], baseline: Optional[Dict[str, int]] = None) -> str:
+    """
+    Renders the gas matrix as a markdown table, one row per metric and one column per
+    set of parameters. Changes relative to the baseline are shown next to each value.
+    """
+    matrix = gas_matrix(measurements)
+    columns: List[str] = list()
+    for values in matrix.values():
+        columns.extend(p for p in values if p not in columns)
+
+    def cell(metric: str, parameters: str) -> str:
+        value = matrix[metric].get(parameters)
+        if value is None:
+            return ""
+        name = f"{metric}[{parameters}]" if parameters else metric
+        previous = (baseline or dict()).get(name)
+        if not previous or previous == value:
+            return str(value)
+        return f"{value} ({(value - previous) / previous:+.2%})"
+
+    lines = [
+        "| metric | " + " | ".join(p or "-" for p in columns) + " |",
+        "|---" * (len(columns) + 1) + "|",
+    ]
+    for metric in matrix:
+        lines.append(f"| {metric} | " + " | ".join(cell(metric, p) for p in columns) + " |")
+    return "\n".join(lines) + "\n"
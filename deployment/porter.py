@@ -0,0 +1,141 @@
+import time
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (3.05, 30)
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_CACHE_TTL = 30  # seconds
+DEFAULT_POOL_SIZE = 4
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class PorterError(Exception):
+    """Raised when Porter cannot be reached or returns an unusable response."""
+
+
+class LatencyMetrics(NamedTuple):
+    """Latency summary (in seconds) of the requests that reached Porter."""
+
+    count: int
+    errors: int
+    cache_hits: int
+    total: float
+    minimum: float
+    maximum: float
+    last: float
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class PorterClient:
+    """
+    HTTP client for Porter endpoints.
+
+    Uses a persistent session (connection pooling + keep-alive), explicit timeouts and
+    exponential-backoff retries for transient failures. Identical queries issued within
+    `cache_ttl` seconds of each other are served from a local cache.
+    """
+
+    def __init__(
+        self,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        session: Optional[requests.Session] = None,
+    ):
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.session = session or requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._cache: Dict[Tuple, Tuple[float, dict]] = dict()
+        self._count = 0
+        self._errors = 0
+        self._cache_hits = 0
+        self._total = 0.0
+        self._min = 0.0
+        self._max = 0.0
+        self._last = 0.0
+
+    @property
+    def metrics(self) -> LatencyMetrics:
+        return LatencyMetrics(
+            count=self._count,
+            errors=self._errors,
+            cache_hits=self._cache_hits,
+            total=self._total,
+            minimum=self._min,
+            maximum=self._max,
+            last=self._last,
+        )
+
+    def _record_latency(self, elapsed: float) -> None:
+        self._min = elapsed if not self._count else min(self._min, elapsed)
+        self._max = max(self._max, elapsed)
+        self._count += 1
+        self._total += elapsed
+        self._last = elapsed
+
+    @staticmethod
+    def _cache_key(url: str, params: Optional[dict]) -> Tuple:
+        return url, tuple(sorted((params or dict()).items()))
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def get(self, url: str, params: Optional[dict] = None) -> dict:
+        """Performs a GET request against a Porter endpoint and returns the decoded JSON body."""
+        key = self._cache_key(url, params)
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached is not None:
+            expiry, data = cached
+            if now < expiry:
+                self._cache_hits += 1
+                return data
+            del self._cache[key]
+
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            self._errors += 1
+            raise PorterError(f"Porter request to {url} failed: {e}") from e
+        finally:
+            self._record_latency(time.perf_counter() - start)
+
+        if self.cache_ttl > 0:
+            self._cache[key] = (time.monotonic() + self.cache_ttl, data)
+        return data
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "PorterClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,253 @@
+from decimal import Decimal
+from typing import Dict, Iterator, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from ape import chain
+from ape.contracts import ContractInstance
+
+# Calldata estimate of Coordinator.processReimbursement:
+# (msg.data.length - 128) * 16 + 128 * 4
+ESTIMATED_CALLDATA_DISCOUNTED_BYTES = 128
+ZERO_BYTE_GAS = 4
+NONZERO_BYTE_GAS = 16
+
+REIMBURSED_EVENTS = {
+    "TranscriptPosted": "postTranscript",
+    "AggregationPosted": "postAggregation",
+}
+
+RECORD_COLUMNS = (
+    "tx_hash",
+    "block_number",
+    "timestamp",
+    "method",
+    "ritual_id",
+    "dkg_size",
+    "node",
+    "calldata_size",
+    "calldata_gas",
+    "gas_used",
+    "gas_price",
+    "refund",
+)
+
+DEFAULT_PAYLOAD_BINS = (0, 1_000, 4_000, 16_000, 64_000, 256_000, np.inf)
+
+
+def estimated_calldata_gas(calldata_size: int) -> int:
+    """Calldata gas as estimated by Coordinator.processReimbursement."""
+    discounted_bytes = ESTIMATED_CALLDATA_DISCOUNTED_BYTES
+    return (calldata_size - discounted_bytes) * NONZERO_BYTE_GAS + discounted_bytes * ZERO_BYTE_GAS
+
+
+def calldata_gas(data: bytes) -> int:
+    """Calldata gas actually charged by the EVM (without EIP-7623 floor pricing)."""
+    zero_bytes = data.count(0)
+    return zero_bytes * ZERO_BYTE_GAS + (len(data) - zero_bytes) * NONZERO_BYTE_GAS
+
+
+def refund_amount(gas_spent: int, static_gas: int, gas_price: int, max_gas_price: int) -> int:
+    """Amount sent by ReimbursementPool.refund."""
+    return (gas_spent + static_gas) * min(gas_price, max_gas_price)
+
+
+def _pool_transactions(block_number: int, reimbursement_pool: ContractInstance) -> int:
+    """Number of transactions of a block sent directly to the pool (deposits, withdrawals...)."""
+    pool = reimbursement_pool.address.lower()
+    block = chain.blocks[block_number]
+    return sum(1 for txn in block.transactions if str(txn.receiver).lower() == pool)
+
+
+def iter_reimbursement_records(
+    coordinator: ContractInstance,
+    reimbursement_pool: ContractInstance,
+    start_block: int = 0,
+    stop_block: Optional[int] = None,
+) -> Iterator[dict]:
+    """
+    Yields one record per `postTranscript` and `postAggregation` transaction in the block
+    range. ReimbursementPool doesn't emit an event for successful refunds, so the refund of a
+    transaction is read as the decrease of the pool balance in its block. It is left empty
+    (unknown) unless that decrease can only come from the transaction: it must be the only
+    reimbursed transaction of the block, no other transaction of the block may be sent to
+    the pool, the refund must not have failed (SendingEtherFailed) and must be positive.
+    Refunds requested by other authorized contracts in the same block can't be told apart.
+
+    Reading the pool balance at past blocks requires an archive node.
+    """
+    logs = list()
+    for event_name, method in REIMBURSED_EVENTS.items():
+        event = getattr(coordinator, event_name)
+        logs.extend((log, method) for log in event.range(start_block, stop_block))
+    logs.sort(key=lambda entry: (entry[0].block_number, entry[0].log_index))
+
+    transactions_per_block: Dict[int, int] = dict()
+    for log, _ in logs:
+        transactions_per_block[log.block_number] = (
+            transactions_per_block.get(log.block_number, 0) + 1
+        )
+
+    dkg_sizes: Dict[int, int] = dict()
+    for log, method in logs:
+        receipt = chain.provider.get_receipt(log.transaction_hash)
+        data = bytes(receipt.transaction.data)
+        if log.ritualId not in dkg_sizes:
+            dkg_sizes[log.ritualId] = coordinator.rituals(log.ritualId).dkgSize
+
+        refund = None
+        if (
+            transactions_per_block[log.block_number] == 1
+            and not reimbursement_pool.SendingEtherFailed.from_receipt(receipt)
+            and _pool_transactions(log.block_number, reimbursement_pool) == 0
+        ):
+            balance_before = chain.provider.get_balance(
+                reimbursement_pool.address, block_id=log.block_number - 1
+            )
+            balance_after = chain.provider.get_balance(
+                reimbursement_pool.address, block_id=log.block_number
+            )
+            refund = balance_before - balance_after
+            if refund <= 0:
+                # the balance went up or didn't change: the refund was not sent
+                refund = None
+
+        yield dict(
+            tx_hash=str(log.transaction_hash),
+            block_number=log.block_number,
+            timestamp=chain.blocks[log.block_number].timestamp,
+            method=method,
+            ritual_id=log.ritualId,
+            dkg_size=dkg_sizes[log.ritualId],
+            node=log.node,
+            calldata_size=len(data),
+            calldata_gas=calldata_gas(data),
+            gas_used=receipt.gas_used,
+            gas_price=receipt.gas_price,
+            refund=refund,
+        )
+
+
+def reimbursement_records(
+    coordinator: ContractInstance,
+    reimbursement_pool: ContractInstance,
+    start_block: int = 0,
+    stop_block: Optional[int] = None,
+) -> pd.DataFrame:
+    """Returns the reimbursed transactions of a block range as a table, one row per transaction."""
+    rows = list(
+        iter_reimbursement_records(coordinator, reimbursement_pool, start_block, stop_block)
+    )
+    records = pd.DataFrame.from_records(rows, columns=list(RECORD_COLUMNS))
+    # refunds are python ints (or None if unknown), they may not fit in 64 bits
+    records["refund"] = pd.Series([row["refund"] for row in rows], dtype=object)
+    return records
+
+
+def load_reimbursement_records(filepath) -> pd.DataFrame:
+    """Loads records exported as CSV with (at least) the columns of RECORD_COLUMNS."""
+    records = pd.read_csv(filepath, dtype={"refund": str})
+    missing = set(RECORD_COLUMNS) - set(records.columns)
+    if missing:
+        raise ValueError(f"Missing columns in {filepath}: {', '.join(sorted(missing))}")
+    records["refund"] = records["refund"].map(lambda v: None if pd.isna(v) else int(Decimal(v)))
+    return records
+
+
+def reimbursement_errors(
+    records: pd.DataFrame,
+    static_gas: int,
+    max_gas_price: int,
+    proposed_static_gas: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Adds the refunded gas and its error against the gas actually used to the records with
+    a known (positive) refund. `static_gas` is the value of the pool when the refunds were sent;
+    with `proposed_static_gas`, refunds are recomputed as if it had been used instead.
+
+    Added columns:
+        metered_gas: gas spent as measured by the Coordinator (gasleft delta + calldata estimate)
+        refunded_gas: gas refunded, metered_gas + static gas
+        gas_error: refunded_gas - gas_used, negative when the node is under-refunded
+        relative_error: gas_error / gas_used
+        refund_error: refund - gas_used * gas_price, in wei (includes the gas price cap)
+    """
+    known = records["refund"].map(lambda refund: refund is not None and refund > 0)
+    records = records[known].copy()
+    # wei amounts are kept as python ints, they may not fit in 64 bits
+    refund = records["refund"].map(int)
+    refund_price = np.minimum(records["gas_price"], max_gas_price).map(int)
+    records["metered_gas"] = (refund // refund_price - static_gas).astype(np.int64)
+    if proposed_static_gas is not None:
+        static_gas = proposed_static_gas
+        refund = (records["metered_gas"] + static_gas).map(int) * refund_price
+    records["refund"] = refund
+    records["refunded_gas"] = records["metered_gas"] + static_gas
+    records["gas_error"] = records["refunded_gas"] - records["gas_used"]
+    records["relative_error"] = records["gas_error"] / records["gas_used"]
+    records["refund_error"] = refund - records["gas_used"].map(int) * records["gas_price"].map(int)
+    return records
+
+
+def error_distribution(
+    errors: pd.DataFrame, by: Sequence[str] = ("method", "dkg_size")
+) -> pd.DataFrame:
+    """Distribution of the gas error of reimbursed transactions, grouped by `by`."""
+    grouped = errors.groupby(list(by), observed=True)
+    distribution = grouped["gas_error"].describe(percentiles=[0.05, 0.5, 0.95])
+    distribution["mean_relative_error"] = grouped["relative_error"].mean()
+    distribution["mean_calldata_size"] = grouped["calldata_size"].mean()
+    return distribution
+
+
+def payload_size_distribution(
+    errors: pd.DataFrame, bins: Sequence[float] = DEFAULT_PAYLOAD_BINS
+) -> pd.DataFrame:
+    """Distribution of the gas error of reimbursed transactions by calldata size."""
+    errors = errors.assign(payload_size=pd.cut(errors["calldata_size"], bins=list(bins)))
+    return error_distribution(errors, by=("method", "payload_size"))
+
+
+class BurnRate(NamedTuple):
+    """Refunds sent by the pool over the time span of the records."""
+
+    total_refunded: int
+    transactions: int
+    rituals: int
+    seconds: int
+
+    @property
+    def per_day(self) -> float:
+        return self.total_refunded * 86400 / self.seconds if self.seconds else float("nan")
+
+    @property
+    def per_ritual(self) -> float:
+        return self.total_refunded / self.rituals if self.rituals else float("nan")
+
+    def days_left(self, pool_balance: int) -> float:
+        """Days until a pool with `pool_balance` is depleted at the current burn rate."""
+        return pool_balance / self.per_day if self.total_refunded else float("inf")
+
+
+def burn_rate(errors: pd.DataFrame) -> BurnRate:
+    return BurnRate(
+        total_refunded=int(sum(errors["refund"])),
+        transactions=len(errors),
+        rituals=errors["ritual_id"].nunique(),
+        seconds=int(errors["timestamp"].max() - errors["timestamp"].min()) if len(errors) else 0,
+    )
+
+
+def propose_static_gas(errors: pd.DataFrame, quantile: float = 0.5) -> int:
+    """
+    Proposes the staticGas of the pool from the gas that the Coordinator doesn't meter
+    (transaction base cost, calldata estimate error, and gas spent after measuring).
+    The median (default) cancels the typical error; higher quantiles under-refund
+    fewer transactions at the cost of over-refunding the rest.
+    """
+    if not 0 <= quantile <= 1:
+        raise ValueError(f"Quantile must be between 0 and 1; got {quantile}")
+    if errors.empty:
+        raise ValueError("No reimbursed transactions with a known refund")
+    unmetered_gas = errors["gas_used"] - errors["metered_gas"]
+    return int(np.ceil(unmetered_gas.quantile(quantile)))
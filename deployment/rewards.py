@@ -0,0 +1,136 @@
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+# Constants of TACoApplication
+REWARD_PER_TOKEN_MULTIPLIER = 10**3
+FLOATING_POINT_DIVISOR = REWARD_PER_TOKEN_MULTIPLIER * 10**18
+PENALTY_BASE = 10000
+
+
+class RewardAccrual(NamedTuple):
+    # rewardPerTokenStored right after each checkpoint
+    reward_per_token: np.ndarray
+    # authorizedOverall in effect after each checkpoint
+    authorized_overall: np.ndarray
+    # rewardPerToken() at the end of the simulation
+    final_reward_per_token: int
+    # availableRewards() of each provider at the end of the simulation
+    available_rewards: np.ndarray
+
+
+def _dtype(exact: bool):
+    # python ints are needed to reproduce uint256 arithmetic exactly,
+    # float64 is orders of magnitude faster and precise enough for forecasts
+    return object if exact else np.float64
+
+
+def _floor_divide(numerator, denominator):
+    # np.floor_divide is exact but slow for floats; large python ints would turn
+    # float arrays into object arrays, so the denominator is converted first
+    if isinstance(numerator, np.ndarray) and numerator.dtype != object:
+        return np.floor(numerator / float(denominator))
+    return numerator // denominator
+
+
+def effective_authorized(
+    authorized: np.ndarray,
+    penalty_percent: Optional[np.ndarray] = None,
+    confirmed: Optional[np.ndarray] = None,
+    exact: bool = False,
+) -> np.ndarray:
+    """
+    Mirrors TACoApplication.effectiveAuthorized: amount that accrues rewards for each provider,
+    i.e. authorized stake reduced by the ongoing penalty, and zero for unconfirmed operators.
+    """
+    result = np.asarray(authorized).astype(_dtype(exact))
+    if penalty_percent is not None:
+        penalty = np.asarray(penalty_percent).astype(_dtype(exact))
+        result = _floor_divide(result * (PENALTY_BASE - penalty), PENALTY_BASE)
+    if confirmed is not None:
+        result = np.where(confirmed, result, 0).astype(result.dtype)
+    return result
+
+
+def simulate_rewards(
+    timestamps: np.ndarray,
+    authorized: np.ndarray,
+    pushed_rewards: np.ndarray,
+    reward_duration: int,
+    touched: Optional[np.ndarray] = None,
+    until: Optional[int] = None,
+    exact: bool = False,
+) -> RewardAccrual:
+    """
+    Reference model of the reward accrual of TACoApplication over a sequence of checkpoints.
+
+    Each checkpoint is a moment when the contract updates rewards (`updateReward` modifier):
+    `timestamps` has shape (t,), `authorized` has shape (t, n) and holds the effective
+    authorized stake of every provider right after the checkpoint (see `effective_authorized`),
+    `pushed_rewards` has shape (t,) and holds the reward pushed at the checkpoint, if any.
+    `touched` (t, n) marks the providers whose rewards were updated at the checkpoint, by default
+    the ones whose effective authorization changed. Rewards are evaluated at `until`,
+    by default the last checkpoint.
+
+    With `exact=True` the results match the contract to the wei, otherwise float64 is used.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    dtype = _dtype(exact)
+    authorized = np.asarray(authorized).astype(dtype)
+    if authorized.ndim != 2 or authorized.shape[0] != len(timestamps):
+        raise ValueError("Authorized stakes must have shape (checkpoints, providers)")
+    if touched is None:
+        touched = np.zeros(authorized.shape, dtype=bool)
+        touched[1:] = authorized[1:] != authorized[:-1]
+    else:
+        touched = np.asarray(touched, dtype=bool)
+    authorized_overall = authorized.sum(axis=1)
+
+    # Global state (rewardPerTokenStored, lastUpdateTime, periodFinish, rewardRateDecimals)
+    # only depends on the checkpoints, so it is computed with one scalar pass
+    reward_per_token = np.zeros(len(timestamps), dtype=dtype)
+    stored, last_update, period_finish, rate = 0, 0, 0, 0
+    overall = 0
+
+    def accrue(timestamp):
+        applicable = min(timestamp, period_finish)
+        if overall == 0:
+            return stored, applicable
+        return stored + (applicable - last_update) * rate // overall, applicable
+
+    for i, timestamp in enumerate(timestamps.tolist()):
+        stored, last_update = accrue(timestamp)
+        reward_per_token[i] = stored
+        reward = pushed_rewards[i]
+        if reward:
+            reward = int(reward) if exact else float(reward)
+            if timestamp >= period_finish:
+                rate = reward * FLOATING_POINT_DIVISOR // reward_duration
+            else:
+                leftover = (period_finish - timestamp) * rate
+                rate = (reward * FLOATING_POINT_DIVISOR + leftover) // reward_duration
+            last_update = timestamp
+            period_finish = timestamp + reward_duration
+        overall = authorized_overall[i]
+    final_reward_per_token, _ = accrue(int(timestamps[-1]) if until is None else until)
+
+    # Rewards of a provider are settled (tReward) at every checkpoint where it was touched,
+    # with the authorization in effect since the previous one
+    checkpoints = np.arange(len(timestamps))[:, np.newaxis]
+    last_touch = np.maximum.accumulate(np.where(touched, checkpoints, 0), axis=0)
+    paid = reward_per_token[last_touch[:-1]]
+    settled = _floor_divide(
+        authorized[:-1] * (reward_per_token[1:, np.newaxis] - paid), FLOATING_POINT_DIVISOR
+    )
+    t_reward = np.where(touched[1:], settled, 0).sum(axis=0)
+    pending = _floor_divide(
+        authorized[-1] * (final_reward_per_token - reward_per_token[last_touch[-1]]),
+        FLOATING_POINT_DIVISOR,
+    )
+
+    return RewardAccrual(
+        reward_per_token=reward_per_token,
+        authorized_overall=authorized_overall,
+        final_reward_per_token=final_reward_per_token,
+        available_rewards=t_reward + pending,
+    )
@@ -0,0 +1,129 @@
+from enum import IntEnum
+from typing import Iterator, List, Optional
+
+import pandas as pd
+from ape.contracts import ContractInstance
+
+from deployment.cache import BlockPinnedCallCache
+
+DEFAULT_PAGE_SIZE = 500
+
+RitualState = IntEnum(
+    "RitualState",
+    [
+        "NON_INITIATED",
+        "DKG_AWAITING_TRANSCRIPTS",
+        "DKG_AWAITING_AGGREGATIONS",
+        "DKG_TIMEOUT",
+        "DKG_INVALID",
+        "ACTIVE",
+        "EXPIRED",
+    ],
+    start=0,
+)
+
+SUMMARY_COLUMNS = (
+    "ritual_id",
+    "state",
+    "dkg_size",
+    "threshold",
+    "total_transcripts",
+    "total_aggregations",
+    "init_timestamp",
+    "end_timestamp",
+    "authority",
+    "access_controller",
+    "fee_model",
+)
+
+
+def iter_ritual_summaries(
+    coordinator: ContractInstance,
+    start: int = 0,
+    stop: Optional[int] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Iterator[dict]:
+    """
+    Yields the summary of every ritual in [start, stop) (default: all rituals),
+    fetched with one `getRitualSummaries` call per page.
+    """
+    stop = coordinator.numberOfRituals() if stop is None else stop
+    for page_start in range(start, stop, page_size):
+        count = min(page_size, stop - page_start)
+        summaries = coordinator.getRitualSummaries(page_start, count)
+        for ritual_id, summary in enumerate(summaries, start=page_start):
+            yield dict(
+                ritual_id=ritual_id,
+                state=RitualState(summary.state).name,
+                dkg_size=summary.dkgSize,
+                threshold=summary.threshold,
+                total_transcripts=summary.totalTranscripts,
+                total_aggregations=summary.totalAggregations,
+                init_timestamp=summary.initTimestamp,
+                end_timestamp=summary.endTimestamp,
+                authority=summary.authority,
+                access_controller=summary.accessController,
+                fee_model=summary.feeModel,
+            )
+
+
+def ritual_summaries(
+    coordinator: ContractInstance,
+    start: int = 0,
+    block_number: Optional[int] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> pd.DataFrame:
+    """
+    Returns the summaries of all rituals from `start` onwards as a table, one row per ritual,
+    with all pages read at the same block.
+    """
+    with BlockPinnedCallCache(block_number=block_number):
+        rows = list(iter_ritual_summaries(coordinator, start=start, page_size=page_size))
+    return pd.DataFrame.from_records(rows, columns=list(SUMMARY_COLUMNS))
+
+
+def _is_participant(coordinator: ContractInstance, ritual_id: int, staking_provider: str) -> bool:
+    staking_provider = staking_provider.lower()
+    for participant in coordinator.getParticipants(ritual_id):
+        provider = participant.provider.lower()
+        if provider == staking_provider:
+            return True
+        if staking_provider < provider:
+            # participants are sorted, so stop early if already passed
+            return False
+    return False
+
+
+def provider_rituals(
+    coordinator: ContractInstance,
+    staking_provider: str,
+    active_only: bool = True,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> List[int]:
+    """
+    Returns the IDs of the rituals that a staking provider participates in, in ascending order.
+
+    Rituals before `firstIndexedRitualId` are scanned through their participants, later ones
+    are read from the provider index. Rituals initiated between the upgrade that introduced
+    the index and `initializeRitualIndex` are in the index too, so index entries below
+    `firstIndexedRitualId` are skipped instead of being reported twice.
+    """
+    first_indexed = coordinator.firstIndexedRitualId()
+    ritual_ids = list()
+    for ritual_id in range(first_indexed):
+        if active_only and not coordinator.isRitualActive(ritual_id):
+            continue
+        if _is_participant(coordinator, ritual_id, staking_provider):
+            ritual_ids.append(ritual_id)
+
+    # later rituals are looked up in the index, at the cost of one call per membership
+    number_of_indexed = coordinator.numberOfRitualsForProvider(staking_provider)
+    for start in range(0, number_of_indexed, page_size):
+        page = coordinator.getRitualsForProvider(staking_provider, start, page_size)
+        ritual_ids.extend(
+            ritual_id
+            for ritual_id in page
+            if ritual_id >= first_indexed
+            and (not active_only or coordinator.isRitualActive(ritual_id))
+        )
+    return ritual_ids
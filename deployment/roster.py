@@ -0,0 +1,233 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from ape import networks
+from ape.contracts import ContractInstance
+from ape.contracts.base import ContractCallHandler
+from ape_ethereum import multicall
+from ape_ethereum.multicall.constants import MULTICALL3_ADDRESS
+
+from deployment.cache import BlockPinnedCallCache
+from deployment.staking import checksum_addresses, decode_staking_providers
+
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_MAX_WORKERS = 8
+
+SNAPSHOT_KEY_COLUMN = "staking_provider"
+
+
+def _is_root_application(application: ContractInstance) -> bool:
+    # only TACoApplication tracks reward penalties
+    return hasattr(application, "getPenalty")
+
+
+def _schema(root: bool, metadata: Dict[str, str]):
+    amount = pa.decimal128(38, 0)  # uint96
+    fields = [
+        pa.field("index", pa.uint64()),
+        pa.field(SNAPSHOT_KEY_COLUMN, pa.string()),
+        pa.field("operator", pa.string()),
+        pa.field("operator_confirmed", pa.bool_()),
+        pa.field("active", pa.bool_()),
+        pa.field("authorized", amount),
+        pa.field("deauthorizing", amount),
+        pa.field("end_deauthorization", pa.uint64()),
+    ]
+    if root:
+        fields.extend(
+            [
+                pa.field("penalty_percent", pa.uint32()),
+                pa.field("end_penalty", pa.uint64()),
+            ]
+        )
+    return pa.schema(fields, metadata=metadata)
+
+
+def batch_calls(
+    method: ContractCallHandler,
+    arguments: Sequence[Tuple],
+    page_size: int = DEFAULT_PAGE_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> List[Any]:
+    """
+    Calls a view method once per set of arguments, with one Multicall3 `aggregate3` call
+    per page. On chains without Multicall3, falls back to concurrent individual calls.
+    """
+    if not networks.provider.get_code(MULTICALL3_ADDRESS):
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda args: method(*args), arguments))
+
+    results = list()
+    for start in range(0, len(arguments), page_size):
+        call = multicall.Call()
+        for args in arguments[start : start + page_size]:
+            call.add(method, *args, allowFailure=False)
+        results.extend(call())
+    return results
+
+
+def fetch_staking_providers(
+    application: ContractInstance,
+    start: int = 0,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> List[str]:
+    """Returns the staking providers array of the application, from `start` onwards."""
+    length = application.getStakingProvidersLength()
+    arguments = [(i,) for i in range(start, length)]
+    return batch_calls(application.stakingProviders, arguments, page_size, max_workers)
+
+
+def fetch_active_staking_providers(
+    application: ContractInstance, length: int, page_size: int = DEFAULT_PAGE_SIZE
+) -> set:
+    """Returns the set of currently active staking providers, one page per call."""
+    active = set()
+    for start in range(0, length, page_size):
+        _, packed = application.getActiveStakingProviders(start, page_size, 0)
+        active.update(checksum_addresses(decode_staking_providers(packed)))
+    return active
+
+
+def _fetch_details(
+    application: ContractInstance, providers: List[str], page_size: int, max_workers: int
+) -> List[dict]:
+    root = _is_root_application(application)
+    method = application.stakingProviderInfo
+    output_names = [output.name for output in method.abis[0].outputs]
+
+    def details(values) -> dict:
+        # results of a multicall are plain tuples, without the names of the struct fields
+        info = values
+        if not hasattr(values, "operator"):
+            info = SimpleNamespace(**dict(zip(output_names, values)))
+        details = dict(
+            operator=info.operator,
+            operator_confirmed=info.operatorConfirmed,
+            authorized=Decimal(info.authorized),
+            deauthorizing=Decimal(info.deauthorizing),
+            end_deauthorization=info.endDeauthorization,
+        )
+        if root:
+            details.update(penalty_percent=info.penaltyPercent, end_penalty=info.endPenalty)
+        return details
+
+    arguments = [(provider,) for provider in providers]
+    return [details(v) for v in batch_calls(method, arguments, page_size, max_workers)]
+
+
+def take_snapshot(
+    application: ContractInstance,
+    block_number: Optional[int] = None,
+    previous=None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+):
+    """
+    Takes a columnar (pyarrow) snapshot of all the staking providers of a
+    TACoApplication or TACoChildApplication, with all reads pinned to a single block.
+
+    The staking providers array is append-only, so if a previous snapshot of the same
+    application is given, only the addresses of new staking providers are fetched.
+    Addresses and details are read with one Multicall3 call per page of `page_size`.
+    """
+    provider = networks.provider
+    with BlockPinnedCallCache(provider=provider, block_number=block_number) as cache:
+        block_number = cache.block_number
+
+        providers = list()
+        if previous is not None:
+            metadata = snapshot_metadata(previous)
+            if metadata["application"] != application.address:
+                raise ValueError("Previous snapshot belongs to a different application")
+            if metadata["block_number"] > block_number:
+                raise ValueError("Previous snapshot is more recent than the requested block")
+            providers = previous.column(SNAPSHOT_KEY_COLUMN).to_pylist()
+        providers += fetch_staking_providers(
+            application, start=len(providers), page_size=page_size, max_workers=max_workers
+        )
+
+        active = fetch_active_staking_providers(application, len(providers), page_size)
+        details = _fetch_details(application, providers, page_size, max_workers)
+
+    columns = {"index": list(range(len(providers))), SNAPSHOT_KEY_COLUMN: providers}
+    columns["active"] = [p in active for p in providers]
+    schema = _schema(
+        root=_is_root_application(application),
+        metadata={
+            "application": application.address,
+            "chain_id": str(provider.chain_id),
+            "block_number": str(block_number),
+        },
+    )
+    for name in schema.names:
+        if name not in columns:
+            columns[name] = [d[name] for d in details]
+    return pa.table(columns, schema=schema)
+
+
+def snapshot_metadata(snapshot) -> dict:
+    """Returns the application address, chain id and block number of a snapshot."""
+    metadata = {k.decode(): v.decode() for k, v in snapshot.schema.metadata.items()}
+    return dict(
+        application=metadata["application"],
+        chain_id=int(metadata["chain_id"]),
+        block_number=int(metadata["block_number"]),
+    )
+
+
+def snapshot_filepath(output_dir: Path, snapshot) -> Path:
+    metadata = snapshot_metadata(snapshot)
+    return (
+        Path(output_dir)
+        / f"{metadata['chain_id']}-{metadata['application']}-{metadata['block_number']}.parquet"
+    )
+
+
+def write_snapshot(snapshot, output_dir: Path) -> Path:
+    filepath = snapshot_filepath(output_dir, snapshot)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(snapshot, filepath)
+    return filepath
+
+
+def read_snapshot(filepath: Path):
+    return pq.read_table(filepath)
+
+
+def latest_snapshot(output_dir: Path, application: str, chain_id: int) -> Optional[Path]:
+    """Returns the most recent snapshot of the application in the directory, if any."""
+    snapshots = Path(output_dir).glob(f"{chain_id}-{application}-*.parquet")
+    return max(snapshots, key=lambda p: int(p.stem.rsplit("-", 1)[1]), default=None)
+
+
+def diff_snapshots(old, new) -> pd.DataFrame:
+    """
+    Returns the staking providers whose state differs between two snapshots, with a
+    `change` column ("added", "removed" or "changed") and the names of the modified columns.
+    """
+    old_df = old.to_pandas().set_index(SNAPSHOT_KEY_COLUMN)
+    new_df = new.to_pandas().set_index(SNAPSHOT_KEY_COLUMN)
+    columns = [c for c in new_df.columns if c in old_df.columns]
+
+    common = new_df.index.intersection(old_df.index)
+    modified = new_df.loc[common, columns].ne(old_df.loc[common, columns])
+    changed_mask = modified.any(axis=1)
+    changed_columns = [",".join(row.index[row]) for _, row in modified[changed_mask].iterrows()]
+
+    added = new_df.loc[new_df.index.difference(old_df.index)]
+    changed = new_df.loc[common][changed_mask]
+    removed = old_df.loc[old_df.index.difference(new_df.index)]
+    frames = [
+        added.assign(change="added", changed_columns=""),
+        changed.assign(change="changed", changed_columns=changed_columns),
+        removed.assign(change="removed", changed_columns=""),
+    ]
+    frames = [frame for frame in frames if len(frame)] or frames[:1]
+    return pd.concat(frames).reset_index()
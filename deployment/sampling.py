@@ -0,0 +1,235 @@
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from ape.contracts import ContractInstance
+from eth_typing import ChecksumAddress
+from eth_utils import keccak, to_checksum_address
+
+from deployment.staking import (
+    PackedStakingProviders,
+    addresses_as_bytes,
+    amounts_as_float,
+    decode_staking_providers,
+)
+
+DEFAULT_PAGE_SIZE = 1000
+
+# TACoChildApplication.MAX_SKIPPED_SAMPLES
+MAX_SKIPPED_SAMPLES = 32
+
+
+def decode_active_staking_providers(
+    packed_providers: PackedStakingProviders,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decodes the packed bytes32 entries returned by getActiveStakingProviders.
+    Returns the staking provider addresses (as rows of 20 bytes) and their stakes
+    (as float64 weights).
+    """
+    decoded = decode_staking_providers(packed_providers)
+    return addresses_as_bytes(decoded), amounts_as_float(decoded)
+
+
+class StakeWeightedSampler:
+    """
+    Samples staking providers without replacement, with probability proportional to their stake.
+
+    Sampling is seeded, so the same seed and provider set always produce the same cohort.
+    """
+
+    def __init__(self, providers: np.ndarray, stakes: np.ndarray):
+        if len(providers) != len(stakes):
+            raise ValueError("Providers and stakes must have the same length")
+        if np.any(stakes < 0):
+            raise ValueError("Stakes can't be negative")
+        self.providers = providers
+        self.stakes = np.asarray(stakes, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.providers)
+
+    @classmethod
+    def from_application(
+        cls,
+        application: ContractInstance,
+        cohort_duration: int = 0,
+        coordinator: Optional[ContractInstance] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> "StakeWeightedSampler":
+        """
+        Builds a sampler from the active staking providers of a TACoChildApplication,
+        paging through its active set when available instead of all staking providers.
+        If a coordinator is provided, providers that haven't set their public key are excluded.
+        """
+        if hasattr(application, "getActiveStakingProvidersPage"):
+            num_providers = application.getActiveStakingProvidersLength()
+            get_page = application.getActiveStakingProvidersPage
+        else:
+            num_providers = application.getStakingProvidersLength()
+            get_page = application.getActiveStakingProviders
+
+        packed_providers = list()
+        for start in range(0, num_providers, page_size):
+            _, page = get_page(start, page_size, cohort_duration)
+            packed_providers.extend(page)
+
+        providers, stakes = decode_active_staking_providers(packed_providers)
+        if coordinator is not None and len(providers):
+            has_public_key = np.fromiter(
+                (
+                    coordinator.isProviderPublicKeySet(to_checksum_address(p.tobytes()))
+                    for p in providers
+                ),
+                dtype=bool,
+                count=len(providers),
+            )
+            providers, stakes = providers[has_public_key], stakes[has_public_key]
+
+        return cls(providers=providers, stakes=stakes)
+
+    def sample_indices(self, quantity: int, seed: Optional[int] = None) -> np.ndarray:
+        """Returns the indices of `quantity` distinct providers, in order of selection."""
+        eligible = np.flatnonzero(self.stakes > 0)
+        if quantity > len(eligible):
+            raise ValueError(
+                f"Not enough staking providers to sample {quantity}; only {len(eligible)} eligible"
+            )
+
+        rng = np.random.default_rng(seed)
+        selected = np.empty(0, dtype=np.int64)
+        remaining = eligible
+        while len(selected) < quantity:
+            cumulative_stakes = np.cumsum(self.stakes[remaining])
+            needed = quantity - len(selected)
+            points = rng.random(needed) * cumulative_stakes[-1]
+            positions = np.searchsorted(cumulative_stakes, points, side="right")
+            positions = np.minimum(positions, len(remaining) - 1)
+            # drawing with replacement and keeping first occurrences in draw order
+            # is equivalent to sequential sampling without replacement
+            _, first = np.unique(positions, return_index=True)
+            picked = positions[np.sort(first)]
+            selected = np.concatenate([selected, remaining[picked]])
+            remaining = np.delete(remaining, picked)
+
+        return selected
+
+    def sample(self, quantity: int, seed: Optional[int] = None) -> List[ChecksumAddress]:
+        """Returns a cohort of providers, sorted as expected by Coordinator.initiateRitual."""
+        indices = self.sample_indices(quantity=quantity, seed=seed)
+        cohort = [to_checksum_address(self.providers[i].tobytes()) for i in indices]
+        return sorted(cohort, key=lambda x: x.lower())
+
+
+def _lowest_bit(node: int) -> int:
+    return node & -node
+
+
+class StakeTree:
+    """
+    Python reference of the Fenwick tree of stakes maintained by TACoChildApplication,
+    with one slot per entry of its staking providers array. Slots are 0-based here,
+    nodes are 1-based (node i covers the slots (i - lowest_bit(i), i]).
+    """
+
+    def __init__(self):
+        self._tree: List[int] = list()
+        self._stakes: List[int] = list()
+
+    @classmethod
+    def from_stakes(cls, stakes: Sequence[int]) -> "StakeTree":
+        tree = cls()
+        for slot, stake in enumerate(stakes):
+            tree.update(slot, int(stake))
+        return tree
+
+    def __len__(self) -> int:
+        return len(self._tree)
+
+    def stake(self, slot: int) -> int:
+        return self._stakes[slot] if slot < len(self._stakes) else 0
+
+    @property
+    def total(self) -> int:
+        return self.prefix_sum(len(self._tree))
+
+    def prefix_sum(self, node: int) -> int:
+        """Sum of stakes of the first `node` slots."""
+        result = 0
+        while node > 0:
+            result += self._tree[node - 1]
+            node -= _lowest_bit(node)
+        return result
+
+    def update(self, slot: int, stake: int) -> None:
+        """Sets the stake of a slot, growing the tree up to it if needed."""
+        old_stake = self.stake(slot)
+        if stake == old_stake:
+            return
+        while len(self._tree) <= slot:
+            new_node = len(self._tree) + 1
+            self._tree.append(
+                self.prefix_sum(new_node - 1) - self.prefix_sum(new_node - _lowest_bit(new_node))
+            )
+            self._stakes.append(0)
+        self._stakes[slot] = stake
+
+        node = slot + 1
+        while node <= len(self._tree):
+            self._tree[node - 1] += stake - old_stake
+            node += _lowest_bit(node)
+
+    def find(self, position: int) -> int:
+        """Returns the slot owning `position` in the cumulative stake of all slots."""
+        node, step = 0, 1
+        while step * 2 <= len(self._tree):
+            step *= 2
+        while step > 0:
+            next_node = node + step
+            if next_node <= len(self._tree) and self._tree[next_node - 1] <= position:
+                node = next_node
+                position -= self._tree[next_node - 1]
+            step //= 2
+        return node
+
+    def find_excluding(self, position: int, excluded: Sequence[Tuple[int, int]]) -> int:
+        """
+        Returns the slot owning `position` in the cumulative stake of the slots
+        that are not excluded, given as (slot, stake) pairs.
+        """
+        shifted = position
+        while True:
+            slot = self.find(shifted)
+            excluded_before = sum(stake for s, stake in excluded if s <= slot)
+            if position + excluded_before == shifted:
+                return slot
+            shifted = position + excluded_before
+
+    def sample(
+        self,
+        seed: bytes,
+        count: int,
+        is_eligible: Callable[[int], bool] = lambda slot: True,
+        max_skipped: int = MAX_SKIPPED_SAMPLES,
+    ) -> List[int]:
+        """
+        Mirrors TACoChildApplication.sampleProviders: draws slots without replacement with
+        probability proportional to their stake, skipping slots that are not eligible.
+        Returns the slots of the cohort in order of selection.
+        """
+        remaining_stake = self.total
+        excluded = list()
+        selected = list()
+        draw = 0
+        while len(selected) < count:
+            if remaining_stake == 0:
+                raise ValueError("Not enough staking providers")
+            if len(excluded) >= count + max_skipped:
+                raise ValueError("Too many ineligible staking providers")
+            position = int.from_bytes(keccak(seed + draw.to_bytes(32, "big")), "big")
+            slot = self.find_excluding(position % remaining_stake, excluded)
+            excluded.append((slot, self.stake(slot)))
+            remaining_stake -= self.stake(slot)
+            if is_eligible(slot):
+                selected.append(slot)
+            draw += 1
+        return selected
@@ -0,0 +1,135 @@
+from typing import Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from ape import chain
+from ape.api import ProviderAPI
+from eth_utils import keccak
+
+# Snapshots of lib/Snapshot.sol are uint128 words packed as <uint32 time><uint96 value>.
+# As in deployment.staking, the uint96 value is exposed as a big-endian (high uint32, low uint64)
+# pair so that encoded snapshots can be viewed without copying.
+SNAPSHOT_DTYPE = np.dtype(
+    {
+        "names": ["time", "value_hi", "value_lo"],
+        "formats": [">u4", ">u4", ">u8"],
+        "offsets": [0, 4, 8],
+        "itemsize": 16,
+    }
+)
+SNAPSHOT_SIZE = SNAPSHOT_DTYPE.itemsize
+MAX_TIME = 2**32 - 1
+MAX_VALUE = 2**96 - 1
+
+EncodedSnapshots = Union[bytes, bytearray, memoryview, Sequence[int]]
+
+
+def encode_snapshot(time: int, value: int) -> int:
+    """Mirrors Snapshot.encodeSnapshot"""
+    return ((time & MAX_TIME) << 96) | (value & MAX_VALUE)
+
+
+def decode_snapshot(snapshot: int) -> Tuple[int, int]:
+    """Mirrors Snapshot.decodeSnapshot"""
+    return (snapshot >> 96) & MAX_TIME, snapshot & MAX_VALUE
+
+
+def decode_snapshots(encoded: EncodedSnapshots) -> np.ndarray:
+    """
+    Decodes a history of snapshots into a structured array with `time`, `value_hi` and
+    `value_lo` fields. Contiguous buffers of big-endian uint128 words are viewed in place;
+    a sequence of uint128 ints (e.g. as returned by the contract) is packed first.
+    """
+    if isinstance(encoded, (bytes, bytearray, memoryview)):
+        buffer = encoded
+    else:
+        buffer = b"".join(int(s).to_bytes(SNAPSHOT_SIZE, "big") for s in encoded)
+
+    if len(buffer) % SNAPSHOT_SIZE != 0:
+        raise ValueError(f"Encoded snapshots must be {SNAPSHOT_SIZE} bytes each")
+    return np.frombuffer(buffer, dtype=SNAPSHOT_DTYPE)
+
+
+def encode_snapshots(times: Iterable[int], values: Iterable[int]) -> np.ndarray:
+    """Builds a history of snapshots from times and values"""
+    return decode_snapshots([encode_snapshot(t, v) for t, v in zip(times, values)])
+
+
+def decode_storage_words(words: Sequence[bytes], length: int) -> np.ndarray:
+    """
+    Decodes the storage slots of a `uint128[]` array. Solidity packs two elements per slot,
+    the element with the lower index in the lower half, so both halves are swapped.
+    """
+    buffer = b"".join(bytes(word).rjust(2 * SNAPSHOT_SIZE, b"\x00") for word in words)
+    halves = np.frombuffer(buffer, dtype=np.uint8).reshape(-1, 2, SNAPSHOT_SIZE)[:, ::-1]
+    return halves.reshape(-1, SNAPSHOT_SIZE)[:length].copy().view(SNAPSHOT_DTYPE).ravel()
+
+
+def read_snapshot_history(
+    address: str,
+    slot: int,
+    block_id: Optional[int] = None,
+    provider: Optional[ProviderAPI] = None,
+) -> np.ndarray:
+    """
+    Reads a `uint128[]` history of snapshots stored at `slot` of a contract directly from
+    storage, i.e. with one request per two snapshots instead of one call per query.
+    """
+    provider = provider or chain.provider
+    length = int.from_bytes(provider.get_storage(address, slot, block_id=block_id), "big")
+    start = int.from_bytes(keccak(slot.to_bytes(32, "big")), "big")
+    words = [
+        provider.get_storage(address, start + i, block_id=block_id)
+        for i in range((length + 1) // 2)
+    ]
+    return decode_storage_words(words, length)
+
+
+def snapshot_values(history: np.ndarray) -> np.ndarray:
+    """Returns the exact uint96 values as an object array of python ints"""
+    high = history["value_hi"].astype(object)
+    low = history["value_lo"].astype(object)
+    return (high << 64) | low
+
+
+def values_as_float(history: np.ndarray) -> np.ndarray:
+    """Returns the values as float64 (e.g. for plotting stake curves)"""
+    return history["value_hi"].astype(np.float64) * 2.0**64 + history["value_lo"]
+
+
+def add_snapshot(history: np.ndarray, time: int, value: int) -> np.ndarray:
+    """Mirrors Snapshot.addSnapshot: returns the history with the new snapshot"""
+    time &= MAX_TIME
+    new = encode_snapshots([time], [value])
+    if len(history) != 0:
+        current_time = int(history["time"][-1])
+        if time == current_time:
+            return np.concatenate([history[:-1], new])
+        elif time < current_time:
+            raise ValueError("Snapshots must be added in chronological order")
+    return np.concatenate([history, new])
+
+
+def last_snapshot(history: np.ndarray) -> Tuple[int, int]:
+    """Mirrors Snapshot.lastSnapshot"""
+    if len(history) == 0:
+        return 0, 0
+    return int(history["time"][-1]), int(snapshot_values(history[-1:])[0])
+
+
+def get_values_at(history: np.ndarray, times: Iterable[int], exact: bool = True) -> np.ndarray:
+    """
+    Answers many Snapshot.getValueAt queries at once: for each time, returns the value of the
+    latest snapshot at or before that time, and 0 before the first snapshot.
+    """
+    times = np.asarray(times, dtype=np.uint64) & MAX_TIME
+    values = snapshot_values(history) if exact else values_as_float(history)
+    indices = np.searchsorted(history["time"], times, side="right") - 1
+    result = np.zeros(len(times), dtype=values.dtype)
+    found = indices >= 0
+    result[found] = values[indices[found]]
+    return result
+
+
+def get_value_at(history: np.ndarray, time: int) -> int:
+    """Mirrors Snapshot.getValueAt"""
+    return int(get_values_at(history, [time])[0])
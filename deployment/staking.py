@@ -0,0 +1,67 @@
+from typing import Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+from eth_typing import ChecksumAddress
+from eth_utils import to_checksum_address
+
+# Entries of getActiveStakingProviders (root and child applications) are bytes32 words
+# packed as <address (20 bytes)><uint96 amount (12 bytes)>. The uint96 amount is exposed
+# as a big-endian (high uint32, low uint64) pair so that it can be viewed without copying.
+PACKED_STAKING_PROVIDER_DTYPE = np.dtype(
+    {
+        "names": ["address", "amount_hi", "amount_lo"],
+        "formats": ["V20", ">u4", ">u8"],
+        "offsets": [0, 20, 24],
+        "itemsize": 32,
+    }
+)
+PACKED_STAKING_PROVIDER_SIZE = PACKED_STAKING_PROVIDER_DTYPE.itemsize
+
+PackedStakingProviders = Union[bytes, bytearray, memoryview, Sequence[bytes]]
+
+
+def decode_staking_providers(packed_providers: PackedStakingProviders) -> np.ndarray:
+    """
+    Decodes packed staking providers into a structured array with `address`, `amount_hi`
+    and `amount_lo` fields. Contiguous buffers are viewed in place (no copy); a sequence of
+    bytes32 words, as returned by ape, is joined into a single buffer first.
+    """
+    if isinstance(packed_providers, (bytes, bytearray, memoryview)):
+        buffer = packed_providers
+    else:
+        # join accepts any bytes-like words (bytes, HexBytes, memoryview) without copying them
+        buffer = b"".join(packed_providers)
+
+    if len(buffer) % PACKED_STAKING_PROVIDER_SIZE != 0:
+        raise ValueError(
+            f"Packed staking providers must be {PACKED_STAKING_PROVIDER_SIZE} bytes each"
+        )
+    return np.frombuffer(buffer, dtype=PACKED_STAKING_PROVIDER_DTYPE)
+
+
+def amounts_as_float(decoded: np.ndarray) -> np.ndarray:
+    """Returns the amounts as float64 (e.g. for use as sampling weights)."""
+    return decoded["amount_hi"].astype(np.float64) * 2.0**64 + decoded["amount_lo"]
+
+
+def amounts_as_int(decoded: np.ndarray) -> np.ndarray:
+    """Returns the exact uint96 amounts as an object array of python ints."""
+    high = decoded["amount_hi"].astype(object)
+    low = decoded["amount_lo"].astype(object)
+    return (high << 64) | low
+
+
+def addresses_as_bytes(decoded: np.ndarray) -> np.ndarray:
+    """Returns the addresses as a (n, 20) uint8 array view."""
+    words = decoded.view(np.uint8).reshape(-1, PACKED_STAKING_PROVIDER_SIZE)
+    return words[:, :20]
+
+
+def checksum_addresses(
+    decoded: np.ndarray, indices: Optional[Iterable[int]] = None
+) -> List[ChecksumAddress]:
+    """Converts the addresses of all (or the selected) entries to checksum addresses."""
+    addresses = decoded["address"]
+    if indices is not None:
+        addresses = addresses[np.asarray(list(indices), dtype=np.intp)]
+    return [to_checksum_address(address.tobytes()) for address in addresses]
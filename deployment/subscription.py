@@ -0,0 +1,74 @@
+from typing import Iterable, NamedTuple
+
+import numpy as np
+from ape.contracts import ContractInstance
+
+MAX_UINT256 = 2**256 - 1
+
+
+def _checked(value: int) -> int:
+    # the contract reverts on uint256 overflow
+    if value > MAX_UINT256:
+        raise OverflowError("uint256 overflow, the contract would revert")
+    return value
+
+
+class SubscriptionCostProjector(NamedTuple):
+    """
+    Local replica of the fee formulas of BqETHSubscription. Fee parameters are immutable
+    in the contract, so they are read once and costs are then computed without calls.
+    """
+
+    initial_base_fee_rate: int
+    base_fee_rate_increase: int
+    increase_base: int
+    encryptor_fee_rate: int
+    max_nodes: int
+    period_duration: int
+
+    @classmethod
+    def from_contract(cls, subscription: ContractInstance) -> "SubscriptionCostProjector":
+        return cls(
+            initial_base_fee_rate=subscription.initialBaseFeeRate(),
+            base_fee_rate_increase=subscription.baseFeeRateIncrease(),
+            increase_base=subscription.INCREASE_BASE(),
+            encryptor_fee_rate=subscription.encryptorFeeRate(),
+            max_nodes=subscription.maxNodes(),
+            period_duration=subscription.subscriptionPeriodDuration(),
+        )
+
+    def base_fees(self, period: int) -> int:
+        """Mirrors BqETHSubscription.baseFees(periodNumber)"""
+        increase = _checked((self.increase_base + self.base_fee_rate_increase) ** period)
+        base_fee_rate = _checked(self.initial_base_fee_rate * increase)
+        numerator = _checked(base_fee_rate * self.period_duration * self.max_nodes)
+        return numerator // _checked(self.increase_base**period)
+
+    def encryptor_fees(self, encryptor_slots: int, duration: int) -> int:
+        """Mirrors BqETHSubscription.encryptorFees(encryptorSlots, duration)"""
+        return _checked(self.encryptor_fee_rate * duration * encryptor_slots)
+
+    def subscription_fees(self, period: int, encryptor_slots: int) -> int:
+        """Amount charged by payForSubscription for the given period"""
+        return self.base_fees(period) + self.encryptor_fees(encryptor_slots, self.period_duration)
+
+    def cost_table(self, periods: Iterable[int], encryptor_slots: Iterable[int]) -> np.ndarray:
+        """
+        Returns the fees of paying each period (rows) with each number of encryptor
+        slots (columns), as an object array of exact python ints.
+        """
+        base_fees = np.array([self.base_fees(int(p)) for p in periods], dtype=object)
+        slots = np.array([int(s) for s in encryptor_slots], dtype=object)
+        encryptor_fees = self.encryptor_fee_rate * self.period_duration * slots
+        return base_fees[:, np.newaxis] + encryptor_fees[np.newaxis, :]
+
+    def plan_costs(
+        self, number_of_periods: int, encryptor_slots: Iterable[int], first_period: int = 0
+    ) -> np.ndarray:
+        """
+        Returns the cumulative fees of subscription plans: element [i, j] is the total cost of
+        paying `i + 1` consecutive periods starting at `first_period` with `encryptor_slots[j]`
+        slots in every period.
+        """
+        periods = range(first_period, first_period + number_of_periods)
+        return np.cumsum(self.cost_table(periods, encryptor_slots), axis=0)
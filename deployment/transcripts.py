@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from ape import chain
+from ape.contracts import ContractInstance
+from eth_utils import keccak
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def _posted_argument(coordinator: ContractInstance, log, method: str, argument: str) -> bytes:
+    txn = chain.provider.get_receipt(log.transaction_hash).transaction
+    if txn.receiver != coordinator.address:
+        raise ValueError(
+            f"Transaction {log.transaction_hash} doesn't call the Coordinator directly, "
+            f"{argument} can't be read from its calldata"
+        )
+    _, arguments = coordinator.decode_input(txn.data)
+    if argument not in arguments:
+        raise ValueError(f"Transaction {log.transaction_hash} is not a call to {method}")
+    return bytes(arguments[argument])
+
+
+def _rebuild(
+    coordinator: ContractInstance,
+    ritual_id: int,
+    event_name: str,
+    digest_field: str,
+    method: str,
+    argument: str,
+    start_block: int,
+    stop_block: Optional[int],
+    max_workers: int,
+) -> Dict[str, bytes]:
+    event = getattr(coordinator, event_name)
+    logs = list(event.range(start_block, stop_block, search_topics={"ritualId": ritual_id}))
+
+    def rebuild(log) -> bytes:
+        posted = _posted_argument(coordinator, log, method, argument)
+        if keccak(posted) != bytes(getattr(log, digest_field)):
+            raise ValueError(f"Digest mismatch in transaction {log.transaction_hash}")
+        return posted
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        posted = list(executor.map(rebuild, logs))
+    return {log.node: data for log, data in zip(logs, posted)}
+
+
+def rebuild_transcripts(
+    coordinator: ContractInstance,
+    ritual_id: int,
+    start_block: int = 0,
+    stop_block: Optional[int] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Dict[str, bytes]:
+    """
+    Rebuilds the transcripts of a ritual from the calldata of the `postTranscript`
+    transactions referenced by TranscriptPosted events, e.g. for rituals that only store
+    digests of transcripts. Every transcript is checked against the digest of its event.
+    Returns a mapping of staking provider to transcript.
+    """
+    return _rebuild(
+        coordinator,
+        ritual_id,
+        event_name="TranscriptPosted",
+        digest_field="transcriptDigest",
+        method="postTranscript",
+        argument="transcript",
+        start_block=start_block,
+        stop_block=stop_block,
+        max_workers=max_workers,
+    )
+
+
+def rebuild_aggregated_transcripts(
+    coordinator: ContractInstance,
+    ritual_id: int,
+    start_block: int = 0,
+    stop_block: Optional[int] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Dict[str, bytes]:
+    """
+    Rebuilds the aggregated transcripts posted by each staking provider of a ritual
+    from `postAggregation` transactions, see `rebuild_transcripts`.
+    """
+    return _rebuild(
+        coordinator,
+        ritual_id,
+        event_name="AggregationPosted",
+        digest_field="aggregatedTranscriptDigest",
+        method="postAggregation",
+        argument="aggregatedTranscript",
+        start_block=start_block,
+        stop_block=stop_block,
+        max_workers=max_workers,
+    )
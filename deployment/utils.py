@@ -3,7 +3,6 @@ import os
 from pathlib import Path
 from typing import Dict, List, Optional
 
-import requests
 import yaml
 from ape import networks, project
 from ape.contracts import ContractContainer, ContractInstance
@@ -11,6 +10,9 @@ from ape_etherscan.utils import API_KEY_ENV_KEY_MAP
 
 from deployment.constants import ARTIFACTS_DIR, MAINNET, PORTER_SAMPLING_ENDPOINTS
 from deployment.networks import is_local_network
+from deployment.porter import PorterClient
+
+_PORTER_CLIENT: Optional[PorterClient] = None
 
 
 def _load_yaml(filepath: Path) -> dict:
@@ -170,12 +172,21 @@ def get_chain_name(chain_id: int) -> str:
     raise ValueError(f"Chain ID {chain_id} not found in networks.")
 
 
+def get_porter_client() -> PorterClient:
+    """Returns the shared Porter client, so that sampling requests reuse pooled connections."""
+    global _PORTER_CLIENT
+    if _PORTER_CLIENT is None:
+        _PORTER_CLIENT = PorterClient()
+    return _PORTER_CLIENT
+
+
 def sample_nodes(
     domain: str,
     num_nodes: int,
     random_seed: Optional[int] = None,
     duration: Optional[int] = None,
     min_version: Optional[str] = None,
+    porter_client: Optional[PorterClient] = None,
 ):
     porter_endpoint = PORTER_SAMPLING_ENDPOINTS.get(domain)
     if not porter_endpoint:
@@ -193,10 +204,8 @@ def sample_nodes(
     if min_version:
         params["min_version"] = min_version
 
-    response = requests.get(porter_endpoint, params=params)
-    response.raise_for_status()
-
-    data = response.json()
+    porter_client = porter_client or get_porter_client()
+    data = porter_client.get(porter_endpoint, params=params)
     ursulas = data["result"]["ursulas"]
     if domain != MAINNET:
         # /get_ursulas is used for sampling (instead of /bucket_sampling)
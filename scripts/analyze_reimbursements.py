@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+
+from pathlib import Path
+
+import click
+import pandas as pd
+from ape import chain, networks, project
+from ape.cli import ConnectedProviderCommand, network_option
+
+from deployment.constants import SUPPORTED_TACO_DOMAINS
+from deployment.registry import contracts_from_registry
+from deployment.reimbursements import (
+    burn_rate,
+    error_distribution,
+    load_reimbursement_records,
+    payload_size_distribution,
+    propose_static_gas,
+    reimbursement_errors,
+    reimbursement_records,
+)
+from deployment.utils import registry_filepath_from_domain
+
+
+def echo_distribution(title: str, distribution: pd.DataFrame) -> None:
+    click.echo(f"\n{title}")
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        click.echo(distribution.round(4).to_string())
+
+
+@click.command(cls=ConnectedProviderCommand, name="analyze-reimbursements")
+@network_option(required=True)
+@click.option(
+    "--domain",
+    "-d",
+    help="TACo domain",
+    type=click.Choice(SUPPORTED_TACO_DOMAINS),
+    required=True,
+)
+@click.option(
+    "--records",
+    help="CSV of exported reimbursed transactions to analyze instead of reading the chain.",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "--export",
+    help="CSV file to write the reimbursed transactions read from the chain to.",
+    type=click.Path(dir_okay=False, path_type=Path),
+)
+@click.option("--start-block", help="First block to read.", type=int, default=0)
+@click.option("--stop-block", help="Last block to read.", type=int)
+@click.option(
+    "--static-gas",
+    help="staticGas of the pool when the refunds were sent (default: current value).",
+    type=int,
+)
+@click.option(
+    "--max-gas-price",
+    help="maxGasPrice of the pool when the refunds were sent (default: current value).",
+    type=int,
+)
+@click.option(
+    "--tune",
+    help="Propose a staticGas and show the errors it would have produced.",
+    is_flag=True,
+)
+@click.option(
+    "--quantile",
+    help="Quantile of the unmetered gas proposed as staticGas.",
+    type=click.FloatRange(0, 1),
+    default=0.5,
+)
+def cli(
+    network,
+    domain,
+    records,
+    export,
+    start_block,
+    stop_block,
+    static_gas,
+    max_gas_price,
+    tune,
+    quantile,
+):
+    """
+    Compare the refunds of postTranscript and postAggregation transactions
+    with the gas actually used, and show the burn rate of the ReimbursementPool.
+
+    Refunds are read from historical pool balances, so reading them from the chain
+    requires an archive node.
+    """
+    registry_filepath = registry_filepath_from_domain(domain=domain)
+    contracts = contracts_from_registry(
+        registry_filepath, chain_id=networks.active_provider.chain_id
+    )
+    pool = project.ReimbursementPool.at(contracts["ReimbursementPool"].address)
+    static_gas = pool.staticGas() if static_gas is None else static_gas
+    max_gas_price = pool.maxGasPrice() if max_gas_price is None else max_gas_price
+
+    if records:
+        transactions = load_reimbursement_records(records)
+    else:
+        coordinator = project.Coordinator.at(contracts["Coordinator"].address)
+        transactions = reimbursement_records(
+            coordinator, pool, start_block=start_block, stop_block=stop_block
+        )
+        if export:
+            transactions.to_csv(export, index=False)
+            click.echo(f"{len(transactions)} reimbursed transactions written to {export}")
+
+    errors = reimbursement_errors(transactions, static_gas, max_gas_price)
+    skipped = len(transactions) - len(errors)
+    click.echo(f"Reimbursed transactions: {len(errors)} ({skipped} without a known refund)")
+    click.echo(f"staticGas: {static_gas}, maxGasPrice: {max_gas_price}")
+    if errors.empty:
+        return
+
+    echo_distribution("Gas error (refunded - used) by DKG size", error_distribution(errors))
+    echo_distribution("Gas error by payload size", payload_size_distribution(errors))
+
+    rate = burn_rate(errors)
+    click.echo(f"\nTotal refunded: {rate.total_refunded} wei in {rate.transactions} transactions")
+    click.echo(f"Burn rate: {rate.per_day:.0f} wei/day, {rate.per_ritual:.0f} wei/ritual")
+    click.echo(f"Net refund error: {sum(errors['refund_error'])} wei")
+    balance = chain.provider.get_balance(pool.address)
+    click.echo(f"Pool balance: {balance} wei ({rate.days_left(balance):.1f} days left)")
+
+    if tune:
+        proposed = propose_static_gas(errors, quantile=quantile)
+        click.echo(f"\nProposed staticGas (quantile {quantile}): {proposed}")
+        for method, method_errors in errors.groupby("method"):
+            click.echo(f"\t{method}: {propose_static_gas(method_errors, quantile=quantile)}")
+        tuned = reimbursement_errors(
+            transactions, static_gas, max_gas_price, proposed_static_gas=proposed
+        )
+        echo_distribution("Gas error with the proposed staticGas", error_distribution(tuned))
+        click.echo(f"Burn rate: {burn_rate(tuned).per_day:.0f} wei/day")
+
+
+if __name__ == "__main__":
+    cli()
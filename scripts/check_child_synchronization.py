@@ -0,0 +1,131 @@
+#!/usr/bin/python3
+
+import click
+import pandas as pd
+from ape import chain, networks
+from ape.cli.choices import select_account
+
+from deployment.constants import MAX_BATCH_SYNC_SIZE, SUPPORTED_TACO_DOMAINS
+from deployment.drift import add_staleness, detect_drift, last_root_updates, sync_batches
+from deployment.params import Transactor
+from deployment.registry import contracts_from_registry
+from deployment.roster import DEFAULT_MAX_WORKERS, snapshot_metadata, take_snapshot
+from deployment.utils import registry_filepath_from_domain
+
+
+def _snapshot_block(snapshot) -> int:
+    return snapshot_metadata(snapshot)["block_number"]
+
+
+@click.command(name="check-child-synchronization")
+@click.option(
+    "--domain",
+    "-d",
+    help="TACo domain",
+    type=click.Choice(SUPPORTED_TACO_DOMAINS),
+    required=True,
+)
+@click.option(
+    "--root-network",
+    help="Root network choice, e.g. ethereum:mainnet:infura",
+    type=str,
+    required=True,
+)
+@click.option(
+    "--child-network",
+    help="Child network choice, e.g. polygon:mainnet:infura",
+    type=str,
+    required=True,
+)
+@click.option("--root-block", help="Root block to compare at (default: head).", type=int)
+@click.option("--child-block", help="Child block to compare at (default: head).", type=int)
+@click.option(
+    "--lookback-blocks",
+    help="Number of root blocks to search for the latest update of drifted providers.",
+    type=int,
+    default=50_000,
+)
+@click.option(
+    "--max-workers", help="Max concurrent RPC requests.", type=int, default=DEFAULT_MAX_WORKERS
+)
+@click.option(
+    "--synchronize",
+    help="Send batchChildSynchronization for all drifted staking providers.",
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--batch-size",
+    help="Staking providers per batchChildSynchronization.",
+    type=click.IntRange(1, MAX_BATCH_SYNC_SIZE),
+    default=MAX_BATCH_SYNC_SIZE,
+)
+def cli(
+    domain,
+    root_network,
+    child_network,
+    root_block,
+    child_block,
+    lookback_blocks,
+    max_workers,
+    synchronize,
+    batch_size,
+):
+    """Detect staking providers whose state on the child chain drifted from the root chain."""
+    registry_filepath = registry_filepath_from_domain(domain=domain)
+
+    with networks.parse_network_choice(child_network) as provider:
+        contracts = contracts_from_registry(registry_filepath, chain_id=provider.chain_id)
+        child_application = contracts["TACoChildApplication"]
+        child_snapshot = take_snapshot(
+            child_application, block_number=child_block, max_workers=max_workers
+        )
+
+    with networks.parse_network_choice(root_network) as provider:
+        contracts = contracts_from_registry(registry_filepath, chain_id=provider.chain_id)
+        root_application = contracts["TACoApplication"]
+        root_snapshot = take_snapshot(
+            root_application, block_number=root_block, max_workers=max_workers
+        )
+
+        drift = detect_drift(root_snapshot, child_snapshot)
+        click.echo(
+            f"Compared {root_snapshot.num_rows} staking providers at root block "
+            f"#{_snapshot_block(root_snapshot)} and child block #{_snapshot_block(child_snapshot)}."
+        )
+        if drift.empty:
+            click.echo("No drift detected.")
+            return
+
+        root_block = _snapshot_block(root_snapshot)
+        last_updates = last_root_updates(
+            root_application,
+            drift.staking_provider,
+            start_block=max(root_block - lookback_blocks, 0),
+            stop_block=root_block + 1,
+        )
+        drift = add_staleness(drift, last_updates, chain.blocks[root_block].timestamp)
+        drift = drift.sort_values("staleness", ascending=False)
+
+        click.echo(f"{len(drift)} drifted staking providers:")
+        for _, row in drift.iterrows():
+            staleness = "unknown" if pd.isna(row.staleness) else f"{row.staleness:.0f}s"
+            click.echo(
+                f"\t{row.staking_provider} drifted={row.drifted_columns} staleness={staleness}"
+            )
+
+        if not synchronize:
+            return
+        batches = list(sync_batches(drift.staking_provider, batch_size=batch_size))
+        click.confirm(
+            f"Send {len(batches)} batchChildSynchronization transactions "
+            f"for {len(drift)} staking providers?",
+            abort=True,
+        )
+        transactor = Transactor(account=select_account(), non_interactive=True)
+        for batch in batches:
+            transactor.transact(root_application.batchChildSynchronization, batch)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+
+from pathlib import Path
+
+import click
+from ape import networks, project
+from ape.cli import ConnectedProviderCommand, network_option
+
+from deployment.constants import SUPPORTED_TACO_DOMAINS
+from deployment.registry import contracts_from_registry
+from deployment.rituals import DEFAULT_PAGE_SIZE, ritual_summaries
+from deployment.utils import registry_filepath_from_domain
+
+
+@click.command(cls=ConnectedProviderCommand, name="export-ritual-summaries")
+@network_option(required=True)
+@click.option(
+    "--domain",
+    "-d",
+    help="TACo domain",
+    type=click.Choice(SUPPORTED_TACO_DOMAINS),
+    required=True,
+)
+@click.option(
+    "--output",
+    "-o",
+    help="CSV file to write the summaries to.",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=True,
+)
+@click.option("--start-ritual-id", help="First ritual to export.", type=int, default=0)
+@click.option("--block-number", "-b", help="Block to read the rituals at.", type=int)
+@click.option("--page-size", help="Rituals per call.", type=int, default=DEFAULT_PAGE_SIZE)
+def cli(network, domain, output, start_ritual_id, block_number, page_size):
+    """Export the state and metadata of all rituals of the Coordinator."""
+    registry_filepath = registry_filepath_from_domain(domain=domain)
+    contracts = contracts_from_registry(
+        registry_filepath, chain_id=networks.active_provider.chain_id
+    )
+    coordinator = project.Coordinator.at(contracts["Coordinator"].address)
+
+    summaries = ritual_summaries(
+        coordinator, start=start_ritual_id, block_number=block_number, page_size=page_size
+    )
+    summaries.to_csv(output, index=False)
+    click.echo(f"Summaries of {len(summaries)} rituals written to {output}")
+    for state, count in summaries["state"].value_counts().items():
+        click.echo(f"\t{state}: {count}")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+
+from pathlib import Path
+
+import click
+from ape import networks
+from ape.cli import ConnectedProviderCommand, network_option
+
+from deployment.constants import SUPPORTED_TACO_DOMAINS
+from deployment.registry import contracts_from_registry
+from deployment.roster import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_PAGE_SIZE,
+    diff_snapshots,
+    latest_snapshot,
+    read_snapshot,
+    take_snapshot,
+    write_snapshot,
+)
+from deployment.utils import registry_filepath_from_domain
+
+APPLICATIONS = ["TACoApplication", "TACoChildApplication"]
+
+
+@click.command(cls=ConnectedProviderCommand, name="export-staking-snapshot")
+@network_option(required=True)
+@click.option(
+    "--domain",
+    "-d",
+    help="TACo domain",
+    type=click.Choice(SUPPORTED_TACO_DOMAINS),
+    required=True,
+)
+@click.option(
+    "--output-dir",
+    "-o",
+    help="Directory where snapshots are stored.",
+    type=click.Path(file_okay=False, path_type=Path),
+    required=True,
+)
+@click.option("--block-number", "-b", help="Block to take the snapshot at.", type=int)
+@click.option(
+    "--page-size", help="Staking providers per page.", type=int, default=DEFAULT_PAGE_SIZE
+)
+@click.option(
+    "--max-workers", help="Max concurrent RPC requests.", type=int, default=DEFAULT_MAX_WORKERS
+)
+def cli(network, domain, output_dir, block_number, page_size, max_workers):
+    """Export a snapshot of all staking providers of the TACo application on this chain."""
+    chain_id = networks.active_provider.chain_id
+    registry_filepath = registry_filepath_from_domain(domain=domain)
+    contracts = contracts_from_registry(registry_filepath, chain_id=chain_id)
+    applications = [contracts[name] for name in APPLICATIONS if name in contracts]
+    if not applications:
+        raise click.ClickException(f"No TACo application found for chain {chain_id}.")
+    application = applications[0]
+
+    previous_filepath = latest_snapshot(output_dir, application.address, chain_id)
+    previous = read_snapshot(previous_filepath) if previous_filepath else None
+    snapshot = take_snapshot(
+        application,
+        block_number=block_number,
+        previous=previous,
+        page_size=page_size,
+        max_workers=max_workers,
+    )
+    filepath = write_snapshot(snapshot, output_dir)
+    click.echo(
+        f"Snapshot of {snapshot.num_rows} staking providers "
+        f"of {application.contract_type.name} written to {filepath}"
+    )
+
+    if previous is not None:
+        diff = diff_snapshots(previous, snapshot)
+        click.echo(f"{len(diff)} staking providers changed since {previous_filepath.name}")
+        for _, row in diff.iterrows():
+            click.echo(f"\t{row.staking_provider} {row.change} {row.changed_columns}")
+
+
+if __name__ == "__main__":
+    cli()
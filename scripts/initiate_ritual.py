@@ -7,6 +7,7 @@ from ape.cli import ConnectedProviderCommand, account_option, network_option
 from deployment import registry
 from deployment.constants import ACCESS_CONTROLLERS, FEE_MODELS, SUPPORTED_TACO_DOMAINS
 from deployment.params import Transactor
+from deployment.sampling import StakeWeightedSampler
 from deployment.types import ChecksumAddress, MinInt
 from deployment.utils import check_plugins, sample_nodes
 
@@ -64,9 +65,15 @@ from deployment.utils import check_plugins, sample_nodes
 @click.option(
     "--random-seed",
     "-r",
-    help="Random seed integer for bucket sampling on mainnet.",
+    help="Random seed integer for bucket sampling on mainnet, or for local sampling.",
     type=int,
 )
+@click.option(
+    "--local-sampling",
+    help="Sample nodes from on-chain stakes instead of using Porter.",
+    is_flag=True,
+    default=False,
+)
 @click.option(
     "--handpicked",
     help="The filepath of a file containing newline separated staking provider addresses.",
@@ -84,6 +91,7 @@ def cli(
     random_seed,
     handpicked,
     min_version,
+    local_sampling,
 ):
     """Initiate a ritual for a TACo domain."""
 
@@ -105,6 +113,11 @@ def cli(
             option_name="--min-version",
             message="Cannot specify --min-version when using --handpicked.",
         )
+    if local_sampling and (handpicked or min_version):
+        raise click.BadOptionUsage(
+            option_name="--local-sampling",
+            message="Cannot specify --local-sampling with --handpicked or --min-version.",
+        )
 
     # Get the contracts from the registry
     coordinator_contract = registry.get_contract(domain=domain, contract_name="Coordinator")
@@ -137,6 +150,16 @@ def cli(
         providers = sorted(line.lower().strip() for line in handpicked)
         if not providers:
             raise ValueError(f"No staking providers found in the handpicked file {handpicked.name}")
+    elif local_sampling:
+        child_application_contract = registry.get_contract(
+            domain=domain, contract_name="TACoChildApplication"
+        )
+        sampler = StakeWeightedSampler.from_application(
+            application=child_application_contract,
+            cohort_duration=duration or 0,
+            coordinator=coordinator_contract,
+        )
+        providers = sampler.sample(quantity=num_nodes, seed=random_seed)
     else:
         providers = sample_nodes(
             domain=domain,
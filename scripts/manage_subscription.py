@@ -1,10 +1,26 @@
 #!/usr/bin/python3
 
+from pathlib import Path
+from typing import Optional
+
 import click
-from ape import Contract
+from ape import Contract, chain
 from ape.cli import account_option, ConnectedProviderCommand, network_option
+from ape.exceptions import ApeException
 
 from deployment import registry
+from deployment.authorization_index import AuthorizationIndex
+from deployment.encryptors import (
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_MAX_WORKERS,
+    AuthorizationCheckpoint,
+    await_pending,
+    available_encryptor_slots,
+    chunk_addresses,
+    fetch_authorized,
+    load_addresses,
+    send_authorizations,
+)
 from deployment.options import (
     domain_option,
     encryptor_slots_option,
@@ -13,9 +29,18 @@ from deployment.options import (
     subscription_contract_option,
 )
 from deployment.params import Transactor
+from deployment.subscription import SubscriptionCostProjector
 from deployment.utils import check_plugins
 
 
+index_start_block_option = click.option(
+    "--start-block",
+    help="First block read by a new authorization index, normally the deployment block of "
+    "the access controller (default: looked up from the chain if possible, else 0).",
+    type=click.IntRange(min=0),
+)
+
+
 def _erc20_approve(
         amount: int, erc20: Contract, receiver: Contract, transactor: Transactor
 ) -> None:
@@ -74,6 +99,46 @@ def pay_subscription(account, network, domain, subscription_contract, encryptor_
     transactor.transact(subscription_contract.payForSubscription, encryptor_slots)
 
 
+@cli.command(cls=ConnectedProviderCommand)
+@network_option(required=True)
+@domain_option
+@subscription_contract_option
+@click.option(
+    "--encryptor-slots",
+    "-es",
+    help="Number of encryptor slots to quote (can be repeated).",
+    multiple=True,
+    required=True,
+    type=int,
+)
+@click.option(
+    "--periods",
+    "-p",
+    default=1,
+    help="Number of consecutive billing periods to quote.",
+    type=int,
+)
+@click.option(
+    "--first-period",
+    default=0,
+    help="Subscription billing period number of the first period to quote.",
+    type=int,
+)
+def quote(network, domain, subscription_contract, encryptor_slots, periods, first_period):
+    """Quote cumulative subscription costs for several plans without sending transactions."""
+    click.echo(f"Connected to {network.name} network.")
+    subscription_contract = registry.get_contract(
+        contract_name=subscription_contract, domain=domain
+    )
+    projector = SubscriptionCostProjector.from_contract(subscription_contract)
+    costs = projector.plan_costs(
+        number_of_periods=periods, encryptor_slots=encryptor_slots, first_period=first_period
+    )
+    click.echo("periods\t" + "\t".join(f"{slots} slots" for slots in encryptor_slots))
+    for i, row in enumerate(costs):
+        click.echo(f"{first_period}-{first_period + i}\t" + "\t".join(str(cost) for cost in row))
+
+
 @cli.command(cls=ConnectedProviderCommand)
 @account_option()
 @network_option(required=True)
@@ -121,6 +186,186 @@ def add_encryptors(account, network, domain, ritual_id, encryptors):
     transactor.transact(access_controller.authorize, ritual_id, encryptors)
 
 
+@cli.command(cls=ConnectedProviderCommand)
+@account_option()
+@network_option(required=True)
+@domain_option
+@ritual_id_option
+@subscription_contract_option
+@click.option(
+    "--encryptors-file",
+    "-f",
+    help="File with one encryptor address per line.",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    required=True,
+)
+@click.option(
+    "--checkpoint",
+    help="Progress file used to resume an interrupted run (default: <encryptors-file>.progress).",
+    type=click.Path(dir_okay=False, path_type=Path),
+)
+@click.option(
+    "--max-in-flight",
+    help="Max number of unconfirmed authorization transactions.",
+    type=int,
+    default=DEFAULT_MAX_IN_FLIGHT,
+)
+@click.option(
+    "--max-workers", help="Max concurrent RPC requests.", type=int, default=DEFAULT_MAX_WORKERS
+)
+@click.option(
+    "--authorization-index",
+    help="Local authorization index used instead of one RPC call per encryptor.",
+    type=click.Path(dir_okay=False, path_type=Path),
+)
+@index_start_block_option
+def bulk_add_encryptors(
+    account,
+    network,
+    domain,
+    ritual_id,
+    subscription_contract,
+    encryptors_file,
+    checkpoint,
+    max_in_flight,
+    max_workers,
+    authorization_index,
+    start_block,
+):
+    """Authorize a large list of encryptors from a file, in chunks and resumably."""
+    click.echo(f"Connected to {network.name} network.")
+
+    # lookup the access controller + authority for the ritual
+    coordinator = registry.get_contract(contract_name="Coordinator", domain=domain)
+    ritual = coordinator.rituals(ritual_id)
+    access_controller = Contract(ritual.accessController)  # uses polygonscan API
+    if account.address != ritual.authority:
+        raise ValueError(f"Only the authority ({ritual.authority}) can authorize encryptors.")
+    subscription_contract = registry.get_contract(
+        contract_name=subscription_contract, domain=domain
+    )
+
+    checkpoint = AuthorizationCheckpoint.load(
+        checkpoint or encryptors_file.with_name(encryptors_file.name + ".progress"),
+        ritual_id=ritual_id,
+        access_controller=access_controller.address,
+    )
+    if checkpoint.pending:
+        click.echo(f"Waiting for {len(checkpoint.pending)} transactions from a previous run.")
+        await_pending(checkpoint)
+
+    encryptors = load_addresses(encryptors_file)
+    if authorization_index:
+        index = _update_authorization_index(authorization_index, access_controller, start_block)
+        authorized = index.is_authorized(ritual_id, encryptors)
+    else:
+        authorized = fetch_authorized(access_controller, ritual_id, encryptors, max_workers)
+    encryptors = encryptors[~authorized]
+    click.echo(
+        f"{len(encryptors) + authorized.sum()} distinct encryptors in {encryptors_file}, "
+        f"{authorized.sum()} already authorized."
+    )
+    if len(encryptors) == 0:
+        return
+
+    available_slots = available_encryptor_slots(subscription_contract)
+    if len(encryptors) > available_slots:
+        raise click.ClickException(
+            f"Only {available_slots} encryptor slots are available, "
+            f"pay for {len(encryptors) - available_slots} more slots first."
+        )
+
+    chunks = chunk_addresses(encryptors, access_controller.MAX_AUTH_ACTIONS())
+    click.confirm(
+        f"Authorize {len(encryptors)} encryptors for ritual {ritual_id} "
+        f"in {len(chunks)} transactions?",
+        abort=True,
+    )
+
+    def progress(checkpoint):
+        click.echo(f"{checkpoint.authorized} encryptors authorized.")
+
+    send_authorizations(
+        access_controller,
+        ritual_id,
+        chunks,
+        account,
+        checkpoint,
+        max_in_flight=max_in_flight,
+        progress=progress,
+    )
+    click.echo(f"Done, progress is kept in {checkpoint.filepath}.")
+
+
+def _deployment_block(address: str) -> int:
+    try:
+        creation = chain.contracts.get_creation_metadata(address)
+    except ApeException:
+        creation = None
+    if creation is None:
+        click.echo(f"Deployment block of {address} is unknown, reading events from block #0.")
+        return 0
+    return creation.block
+
+
+def _update_authorization_index(
+    filepath: Path, access_controller: Contract, start_block: Optional[int] = None
+) -> AuthorizationIndex:
+    if start_block is None and not filepath.exists():
+        start_block = _deployment_block(access_controller.address)
+    index = AuthorizationIndex.open(
+        filepath,
+        access_controller=access_controller.address,
+        chain_id=chain.chain_id,
+        start_block=start_block or 0,
+    )
+    processed = index.update(access_controller)
+    index.save(filepath)
+    click.echo(f"Processed {processed} authorization events up to block #{index.cursor}.")
+    return index
+
+
+@cli.command(cls=ConnectedProviderCommand)
+@network_option(required=True)
+@domain_option
+@ritual_id_option
+@subscription_contract_option
+@click.option(
+    "--authorization-index",
+    help="Local authorization index file, created if it doesn't exist.",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=True,
+)
+@index_start_block_option
+def index_authorizations(
+    network, domain, ritual_id, subscription_contract, authorization_index, start_block
+):
+    """Update the local authorization index and reconcile it with the subscription."""
+    click.echo(f"Connected to {network.name} network.")
+    coordinator = registry.get_contract(contract_name="Coordinator", domain=domain)
+    access_controller = Contract(coordinator.rituals(ritual_id).accessController)
+    subscription_contract = registry.get_contract(
+        contract_name=subscription_contract, domain=domain
+    )
+
+    index = _update_authorization_index(authorization_index, access_controller, start_block)
+    click.echo(
+        f"Ritual {ritual_id}: {index.authorized_count(ritual_id)} authorized encryptors, "
+        f"{index.auth_actions(ritual_id)} authorization actions."
+    )
+    for administrator, cap in index.administrator_caps(ritual_id).items():
+        click.echo(f"\tadministrator {administrator} cap={cap}")
+
+    used_slots = subscription_contract.usedEncryptorSlots()
+    if index.used_encryptor_slots != used_slots:
+        raise click.ClickException(
+            f"Indexed encryptor slots ({index.used_encryptor_slots}) don't match "
+            f"usedEncryptorSlots ({used_slots}), is the subscription shared "
+            f"with another access controller?"
+        )
+    click.echo(f"{used_slots} used encryptor slots, in sync with the subscription.")
+
+
 @cli.command(cls=ConnectedProviderCommand)
 @account_option()
 @network_option(required=True)
@@ -6,6 +6,7 @@ from eth_utils import to_checksum_address
 
 from deployment.constants import SUPPORTED_TACO_DOMAINS
 from deployment.registry import contracts_from_registry
+from deployment.rituals import provider_rituals
 from deployment.utils import registry_filepath_from_domain
 
 
@@ -33,26 +34,8 @@ def cli(network, domain, staking_provider_address):
     )
 
     provider_checksum_address = to_checksum_address(staking_provider_address)
-    # lower used for comparing against sorted list
-    provider_checksum_address_lower = provider_checksum_address.lower()
-
     coordinator = project.Coordinator.at(contracts["Coordinator"].address)
-    num_rituals = coordinator.numberOfRituals()
-
-    ritual_memberships = []
-    for ritual_id in range(0, num_rituals):
-        if not coordinator.isRitualActive(ritual_id):
-            continue
-
-        participants = coordinator.getParticipants(ritual_id)
-        for participant in participants:
-            provider = participant.provider
-            if provider == provider_checksum_address:
-                ritual_memberships.append(ritual_id)
-                break
-            if provider_checksum_address_lower < provider:
-                # list of participants is sorted so stop early if already passed
-                break
+    ritual_memberships = provider_rituals(coordinator, provider_checksum_address)
 
     if not ritual_memberships:
         print(f"\nStaking provider {provider_checksum_address} is not part of any rituals")
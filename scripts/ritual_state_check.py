@@ -1,29 +1,16 @@
 import time
 from datetime import datetime
-from enum import IntEnum
 
 import click
 from ape import networks, project
 from ape.cli import ConnectedProviderCommand, network_option
 
+from deployment.cache import pinned_reads
 from deployment.constants import SUPPORTED_TACO_DOMAINS
 from deployment.registry import contracts_from_registry
+from deployment.rituals import RitualState
 from deployment.utils import registry_filepath_from_domain
 
-RitualState = IntEnum(
-    "RitualState",
-    [
-        "NON_INITIATED",
-        "DKG_AWAITING_TRANSCRIPTS",
-        "DKG_AWAITING_AGGREGATIONS",
-        "DKG_TIMEOUT",
-        "DKG_INVALID",
-        "ACTIVE",
-        "EXPIRED",
-    ],
-    start=0,
-)
-
 END_STATES = [
     RitualState.DKG_TIMEOUT,
     RitualState.DKG_INVALID,
@@ -98,50 +85,54 @@ def cli(network, domain, ritual_id, realtime):
         contracts["TACoChildApplication"].address
     )
     coordinator = project.Coordinator.at(contracts["Coordinator"].address)
-    try:
-        ritual = coordinator.rituals(ritual_id)
-    except Exception:
-        print(f"x Ritual ID #{ritual_id} not found")
-        raise click.Abort()
 
-    participants = coordinator.getParticipants(ritual_id)
+    # all reads of a single check are pinned to the same block
+    with pinned_reads() as cache:
+        try:
+            ritual = coordinator.rituals(ritual_id)
+        except Exception:
+            print(f"x Ritual ID #{ritual_id} not found")
+            raise click.Abort()
+
+        participants = coordinator.getParticipants(ritual_id)
+
+        #
+        # Info
+        #
+        print("Ritual Information")
+        print("==================")
+        print(f"\tThreshold         : {ritual.threshold}-of-{ritual.dkgSize}")
+        print(f"\tInit Timestamp    : {datetime.fromtimestamp(ritual.initTimestamp).isoformat()}")
+        print(f"\tEnd Timestamp     : {datetime.fromtimestamp(ritual.endTimestamp).isoformat()}")
+        print(f"\tInitiator         : {ritual.initiator}")
+        print(f"\tAuthority         : {ritual.authority}")
+        isGlobalAllowList = ritual.accessController == contracts["GlobalAllowList"].address
+        print(
+            f"\tAccessController  : "
+            f"{ritual.accessController} {'(GlobalAllowList)' if isGlobalAllowList else ''}"
+        )
+        print(f"\tFee Model         : {ritual.feeModel}")
+        print("\tParticipants      :")
+        for participant in participants:
+            provider = participant.provider
+            staking_provider_info = taco_child_application.stakingProviderInfo(provider)
+            print(f"\t\t{provider} (operator={staking_provider_info.operator})")
 
-    #
-    # Info
-    #
-    print("Ritual Information")
-    print("==================")
-    print(f"\tThreshold         : {ritual.threshold}-of-{ritual.dkgSize}")
-    print(f"\tInit Timestamp    : {datetime.fromtimestamp(ritual.initTimestamp).isoformat()}")
-    print(f"\tEnd Timestamp     : {datetime.fromtimestamp(ritual.endTimestamp).isoformat()}")
-    print(f"\tInitiator         : {ritual.initiator}")
-    print(f"\tAuthority         : {ritual.authority}")
-    isGlobalAllowList = ritual.accessController == contracts["GlobalAllowList"].address
-    print(
-        f"\tAccessController  : "
-        f"{ritual.accessController} {'(GlobalAllowList)' if isGlobalAllowList else ''}"
-    )
-    print(f"\tFee Model         : {ritual.feeModel}")
-    print("\tParticipants      :")
-    for participant in participants:
-        provider = participant.provider
-        staking_provider_info = taco_child_application.stakingProviderInfo(provider)
-        print(f"\t\t{provider} (operator={staking_provider_info.operator})")
-
-    #
-    # State
-    #
-    ritual_state = print_ritual_state(ritual_id, coordinator)
-    if ritual_state in END_STATES or realtime is False:
-        return
-    elif realtime is None:
-        click.confirm("Monitor DKG ritual in real-time?", abort=True)
-
-    while ritual_state not in END_STATES:
-        print()
-        print("---- Waiting 15s -----")
-        time.sleep(15)
+        #
+        # State
+        #
         ritual_state = print_ritual_state(ritual_id, coordinator)
+        if ritual_state in END_STATES or realtime is False:
+            return
+        elif realtime is None:
+            click.confirm("Monitor DKG ritual in real-time?", abort=True)
+
+        while ritual_state not in END_STATES:
+            print()
+            print("---- Waiting 15s -----")
+            time.sleep(15)
+            cache.refresh()
+            ritual_state = print_ritual_state(ritual_id, coordinator)
 
 
 if __name__ == "__main__":
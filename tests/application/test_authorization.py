@@ -16,9 +16,13 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 import ape
+import pytest
 from ape.utils import ZERO_ADDRESS
+from eth_utils import to_checksum_address
 from web3 import Web3
 
+from deployment.constants import MAX_BATCH_SYNC_SIZE
+
 OPERATOR_CONFIRMED_SLOT = 1
 AUTHORIZATION_SLOT = 3
 END_DEAUTHORIZATION_SLOT = 5
@@ -1154,3 +1158,83 @@ def test_child_sync(accounts, threshold_staking, taco_application, child_applica
             operator=operator,
         )
     ]
+
+
+def test_batch_child_sync(accounts, threshold_staking, taco_application, child_application):
+    """
+    Tests for x-chain method: batchChildSynchronization
+    """
+
+    creator, staking_provider_1, staking_provider_2, operator_1, operator_2 = accounts[0:5]
+    value = 3 * MIN_AUTHORIZATION
+
+    # Can't sync empty list, too many providers or zero address
+    with ape.reverts("Staking providers must be specified"):
+        taco_application.batchChildSynchronization([], sender=creator)
+    assert taco_application.MAX_BATCH_SYNC_SIZE() == MAX_BATCH_SYNC_SIZE
+    with ape.reverts("Too many staking providers in batch"):
+        taco_application.batchChildSynchronization(
+            [staking_provider_1] * (MAX_BATCH_SYNC_SIZE + 1), sender=creator
+        )
+    with ape.reverts("Staking provider must be specified"):
+        taco_application.batchChildSynchronization(
+            [staking_provider_1, ZERO_ADDRESS], sender=creator
+        )
+
+    # Prepare staking providers with sync issues
+    for staking_provider, operator in (
+        (staking_provider_1, operator_1),
+        (staking_provider_2, operator_2),
+    ):
+        threshold_staking.authorizationIncreased(staking_provider, 0, value, sender=creator)
+        taco_application.bondOperator(staking_provider, operator, sender=staking_provider)
+        child_application.updateAuthorization(staking_provider, 0, 0, 0, sender=creator)
+        child_application.updateOperator(staking_provider, ZERO_ADDRESS, sender=creator)
+        assert child_application.stakingProviderInfo(staking_provider) == (0, 0, 0)
+
+    # Both staking providers are synchronized with one call to the child
+    tx = taco_application.batchChildSynchronization(
+        [staking_provider_1, staking_provider_2], sender=creator
+    )
+    for staking_provider, operator in (
+        (staking_provider_1, operator_1),
+        (staking_provider_2, operator_2),
+    ):
+        assert child_application.stakingProviderInfo(staking_provider) == (value, 0, 0)
+        assert child_application.stakingProviderToOperator(staking_provider) == operator
+        assert child_application.operatorToStakingProvider(operator) == staking_provider
+
+    assert tx.events == [
+        taco_application.ManualChildSynchronizationSent(
+            stakingProvider=staking_provider,
+            authorized=value,
+            deauthorizing=0,
+            endDeauthorization=0,
+            operator=operator,
+        )
+        for staking_provider, operator in (
+            (staking_provider_1, operator_1),
+            (staking_provider_2, operator_2),
+        )
+    ]
+
+
+@pytest.mark.parametrize("batch_size", [1, 10, MAX_BATCH_SYNC_SIZE])
+def test_batch_child_sync_gas(threshold_staking, taco_application, creator, batch_size):
+    staking_providers = [
+        to_checksum_address(i.to_bytes(20, "big")) for i in range(1, batch_size + 2)
+    ]
+    for staking_provider in staking_providers:
+        threshold_staking.authorizationIncreased(
+            staking_provider, 0, MIN_AUTHORIZATION, sender=creator
+        )
+
+    tx = taco_application.manualChildSynchronization(staking_providers[0], sender=creator)
+    single_gas_per_provider = tx.gas_used
+
+    tx = taco_application.batchChildSynchronization(staking_providers[1:], sender=creator)
+    gas_per_provider = tx.gas_used / batch_size
+    assert len(tx.events) == batch_size
+    if batch_size > 1:
+        # the fixed cost of the transaction and of the message is paid once per batch
+        assert gas_per_provider < single_gas_per_provider
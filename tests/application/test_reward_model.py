@@ -0,0 +1,151 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import time
+
+import numpy as np
+import pytest
+from web3 import Web3
+
+from deployment.rewards import effective_authorized, simulate_rewards
+
+MIN_AUTHORIZATION = Web3.to_wei(40_000, "ether")
+REWARD_DURATION = 60 * 60 * 24 * 7  # one week in seconds
+REWARD_PORTION = MIN_AUTHORIZATION * 10**3
+ONE_DAY = 60 * 60 * 24
+
+
+def test_simulate_rewards():
+    # two providers with 1:3 stakes share one reward period, the second one joins in the middle
+    reward = 8 * REWARD_DURATION * MIN_AUTHORIZATION  # no rounding
+    timestamps = [0, REWARD_DURATION // 2]
+    authorized = [[MIN_AUTHORIZATION, 0], [MIN_AUTHORIZATION, 3 * MIN_AUTHORIZATION]]
+    accrual = simulate_rewards(
+        timestamps,
+        authorized,
+        [reward, 0],
+        REWARD_DURATION,
+        until=2 * REWARD_DURATION,
+        exact=True,
+    )
+    assert list(accrual.authorized_overall) == [MIN_AUTHORIZATION, 4 * MIN_AUTHORIZATION]
+    assert list(accrual.available_rewards) == [
+        reward // 2 + reward // 8,
+        3 * reward // 8,
+    ]
+
+    float_accrual = simulate_rewards(
+        timestamps, authorized, [reward, 0], REWARD_DURATION, until=2 * REWARD_DURATION
+    )
+    assert np.allclose(float_accrual.available_rewards, accrual.available_rewards.astype(float))
+
+    assert list(
+        effective_authorized([1000, 1000, 1000], [0, 1000, 2500], [True, True, False], exact=True)
+    ) == [1000, 900, 0]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_model_matches_contract(
+    accounts, token, threshold_staking, taco_application, child_application, chain, seed
+):
+    creator, distributor, *staking_providers = accounts[0:6]
+    rng = np.random.default_rng(seed)
+
+    taco_application.setRewardDistributor(distributor, sender=creator)
+    token.transfer(distributor, 100 * REWARD_PORTION, sender=creator)
+    token.approve(taco_application.address, 100 * REWARD_PORTION, sender=distributor)
+
+    for staking_provider in staking_providers:
+        value = MIN_AUTHORIZATION + int(rng.integers(0, 10**6)) * 10**18
+        threshold_staking.authorizationIncreased(staking_provider, 0, value, sender=creator)
+        taco_application.bondOperator(staking_provider, staking_provider, sender=staking_provider)
+        child_application.confirmOperatorAddress(staking_provider, sender=staking_provider)
+
+    def state():
+        authorized = [taco_application.authorizedStake(p) for p in staking_providers]
+        penalties = [taco_application.getPenalty(p)[0] for p in staking_providers]
+        return effective_authorized(authorized, penalties, exact=True)
+
+    # Every step is a transaction that updates rewards, the first one starts the reward period
+    timestamps, authorized, pushed_rewards, touched = [], [], [], []
+    stored_reward_per_token = []
+    for step in range(20):
+        touch = np.zeros(len(staking_providers), dtype=bool)
+        reward = 0
+        action = "push" if step == 0 else rng.choice(["push", "increase", "decrease", "penalize"])
+        index = int(rng.integers(len(staking_providers)))
+        staking_provider = staking_providers[index]
+        authorized_stake = taco_application.authorizedStake(staking_provider)
+        if action == "push":
+            reward = int(rng.integers(1, 10)) * REWARD_PORTION
+            taco_application.pushReward(reward, sender=distributor)
+        elif action == "increase":
+            value = authorized_stake + int(rng.integers(1, 10**5)) * 10**18
+            threshold_staking.authorizationIncreased(
+                staking_provider, authorized_stake, value, sender=creator
+            )
+        elif action == "decrease" and authorized_stake > MIN_AUTHORIZATION:
+            value = authorized_stake - (authorized_stake - MIN_AUTHORIZATION) // 2
+            threshold_staking.involuntaryAuthorizationDecrease(
+                staking_provider, authorized_stake, value, sender=creator
+            )
+        else:
+            child_application.penalize(staking_provider, sender=creator)
+        touch[index] = action != "push"
+
+        timestamps.append(chain.blocks.head.timestamp)
+        authorized.append(state())
+        pushed_rewards.append(reward)
+        touched.append(touch)
+        stored_reward_per_token.append(taco_application.rewardPerTokenStored())
+        # penalties don't end within the scenario
+        chain.pending_timestamp += int(rng.integers(1, ONE_DAY // 24))
+
+    until = chain.pending_timestamp
+    accrual = simulate_rewards(
+        timestamps,
+        authorized,
+        pushed_rewards,
+        REWARD_DURATION,
+        touched=touched,
+        until=until,
+        exact=True,
+    )
+    assert list(accrual.reward_per_token) == stored_reward_per_token
+    assert accrual.authorized_overall[-1] == taco_application.authorizedOverall()
+    assert accrual.final_reward_per_token == taco_application.rewardPerToken()
+    assert list(accrual.available_rewards) == [
+        taco_application.availableRewards(p) for p in staking_providers
+    ]
+
+
+def test_simulate_rewards_benchmark():
+    providers, days = 10_000, 365
+    rng = np.random.default_rng(seed=42)
+    stakes = rng.integers(40_000, 15_000_000, size=providers) * 1e18
+    # stakes change every day, so every provider is touched at every checkpoint
+    authorized = stakes * rng.uniform(0.9, 1.1, size=(days, providers))
+    timestamps = np.arange(days) * ONE_DAY
+    pushed_rewards = np.where(np.arange(days) % 7 == 0, 5e23, 0)
+
+    start = time.perf_counter()
+    accrual = simulate_rewards(timestamps, authorized, pushed_rewards, REWARD_DURATION)
+    elapsed = time.perf_counter() - start
+
+    assert accrual.available_rewards.shape == (providers,)
+    assert accrual.available_rewards.sum() <= pushed_rewards.sum()
+    assert elapsed < 1
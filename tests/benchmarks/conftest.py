@@ -0,0 +1,41 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from deployment.gas_benchmarks import (
+    REPORT_DIR_ENV,
+    RUN_BENCHMARKS_ENV,
+    GasBaseline,
+    benchmarks_requested,
+)
+
+BENCHMARKS_DIR = Path(__file__).parent
+BASELINES_DIR = BENCHMARKS_DIR / "baselines"
+
+
+def pytest_collection_modifyitems(config, items):
+    """Benchmarks are slow, so they only run with GAS_BENCHMARKS=1 (or UPDATE_GAS_BASELINE=1)"""
+    if benchmarks_requested():
+        return
+    skip = pytest.mark.skip(reason=f"gas benchmarks run with {RUN_BENCHMARKS_ENV}=1")
+    for item in items:
+        if BENCHMARKS_DIR in Path(item.fspath).parents:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="module")
+def gas_baseline(request):
+    """
+    Baseline of the benchmark module, stored in baselines/<module name>.json.
+    Run with UPDATE_GAS_BASELINE=1 to store the measurements as the new baseline,
+    and with GAS_REPORT_DIR=<dir> to write the measured gas matrix to <dir>.
+    """
+    module_name = request.module.__name__.rsplit(".", 1)[-1]
+    baseline = GasBaseline.load(BASELINES_DIR / f"{module_name}.json")
+    yield baseline
+    report_dir = os.environ.get(REPORT_DIR_ENV)
+    if report_dir:
+        baseline.write_report(Path(report_dir))
+    if baseline.update:
+        baseline.save()
@@ -0,0 +1,105 @@
+import os
+
+import pytest
+from ape.utils import ZERO_ADDRESS
+
+from tests.conftest import RitualState, generate_transcript
+from tests.test_coordinator import (
+    DURATION,
+    MAX_DKG_SIZE,
+    application,
+    coordinator,
+    deployer,
+    erc20,
+    fee_model,
+    global_allow_list,
+    initiate_ritual,
+    initiator,
+    nodes,
+    treasury,
+)
+
+DKG_SIZES = list(range(2, MAX_DKG_SIZE + 1))
+
+STATIC_GAS = 40_000
+MAX_GAS_PRICE = 10**12
+POOL_FUNDS = 10**20
+
+
+@pytest.fixture()
+def reimbursement_pool(project, deployer, coordinator):
+    pool = project.ReimbursementPool.deploy(STATIC_GAS, MAX_GAS_PRICE, sender=deployer)
+    pool.authorize(coordinator.address, sender=deployer)
+    deployer.transfer(pool.address, POOL_FUNDS)
+    return pool
+
+
+def run_dkg(coordinator, ritual_id, nodes):
+    """Posts transcripts and aggregations of all nodes, returns their receipts"""
+    threshold = coordinator.getThresholdForRitualSize(len(nodes))
+    transcript = generate_transcript(len(nodes), threshold)
+    aggregated = generate_transcript(len(nodes), threshold)
+    dkg_public_key = (os.urandom(32), os.urandom(16))
+    transcript_txs = [
+        coordinator.postTranscript(ritual_id, transcript, sender=node) for node in nodes
+    ]
+    aggregation_txs = [
+        coordinator.postAggregation(
+            ritual_id, aggregated, dkg_public_key, os.urandom(42), sender=node
+        )
+        for node in nodes
+    ]
+    assert coordinator.getRitualState(ritual_id) == RitualState.ACTIVE
+    return transcript_txs, aggregation_txs
+
+
+@pytest.mark.parametrize("dkg_size", DKG_SIZES)
+def test_dkg_gas(
+    gas_baseline,
+    coordinator,
+    reimbursement_pool,
+    nodes,
+    initiator,
+    erc20,
+    fee_model,
+    deployer,
+    global_allow_list,
+    dkg_size,
+):
+    nodes = nodes[:dkg_size]
+
+    def check(metric, value):
+        gas_baseline.check(f"{metric}[dkg_size={dkg_size}]", value)
+
+    _, initiation_tx = initiate_ritual(
+        coordinator=coordinator,
+        fee_model=fee_model,
+        erc20=erc20,
+        authority=initiator,
+        nodes=nodes,
+        allow_logic=global_allow_list,
+    )
+    transcript_txs, aggregation_txs = run_dkg(coordinator, 0, nodes)
+    transcript_gas = [tx.gas_used for tx in transcript_txs]
+    aggregation_gas = [tx.gas_used for tx in aggregation_txs]
+
+    check("initiateRitual.gas", initiation_tx.gas_used)
+    check("postTranscript.gas.max", max(transcript_gas))
+    check("postTranscript.gas.total", sum(transcript_gas))
+    check("postTranscript.calldata", len(transcript_txs[0].transaction.data))
+    check("postAggregation.gas.max", max(aggregation_gas))
+    check("postAggregation.gas.total", sum(aggregation_gas))
+    check("postAggregation.calldata", len(aggregation_txs[0].transaction.data))
+    check("ritual.gas", initiation_tx.gas_used + sum(transcript_gas) + sum(aggregation_gas))
+
+    # Same DKG with reimbursements, the difference is the overhead of processReimbursement
+    coordinator.setReimbursementPool(reimbursement_pool.address, sender=deployer)
+    erc20.approve(fee_model.address, fee_model.getRitualCost(dkg_size, DURATION), sender=initiator)
+    coordinator.initiateRitual(
+        fee_model, nodes, initiator, DURATION, global_allow_list.address, sender=initiator
+    )
+    reimbursed_txs = sum(run_dkg(coordinator, 1, nodes), [])
+    reimbursed_gas = sum(tx.gas_used for tx in reimbursed_txs)
+    overhead = (reimbursed_gas - sum(transcript_gas) - sum(aggregation_gas)) / len(reimbursed_txs)
+    check("processReimbursement.gas", round(overhead))
+    coordinator.setReimbursementPool(ZERO_ADDRESS, sender=deployer)
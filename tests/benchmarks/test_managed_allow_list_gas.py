@@ -0,0 +1,53 @@
+import os
+
+import pytest
+from eth_utils import to_checksum_address
+
+from tests.test_managed_allow_list import (
+    ADMIN_CAP,
+    RITUAL_ID,
+    admin,
+    authority,
+    beneficiary,
+    capped_subscription,
+    coordinator,
+    deployer,
+    fee_model,
+    fee_token,
+)
+
+BATCH_SIZES = [1, 10, 50, 100]
+AUTH_ACTIONS_CAP = 1000
+
+
+@pytest.fixture()
+def managed_allow_list(project, coordinator, capped_subscription, fee_model, deployer, authority):
+    coordinator.mockNewRitual(authority, sender=deployer)
+    coordinator.setFeeModel(RITUAL_ID, fee_model.address, sender=deployer)
+    return project.ManagedAllowList.deploy(
+        coordinator.address, capped_subscription.address, sender=authority
+    )
+
+
+@pytest.mark.parametrize("batch_size", BATCH_SIZES)
+def test_managed_authorize_gas(
+    gas_baseline, managed_allow_list, capped_subscription, deployer, authority, admin, batch_size
+):
+    managed_allow_list.addAdministrators(RITUAL_ID, [admin], ADMIN_CAP, sender=authority)
+    encryptors = [to_checksum_address(os.urandom(20)) for _ in range(batch_size)]
+    capped_subscription.setSubscription(RITUAL_ID, encryptors, 1, AUTH_ACTIONS_CAP, sender=deployer)
+
+    cap_gas = capped_subscription.minAuthorizationActionsCap.estimate_gas_cost(
+        RITUAL_ID, encryptors
+    )
+    authorize_tx = managed_allow_list.authorize(RITUAL_ID, encryptors, sender=admin)
+    deauthorize_tx = managed_allow_list.deauthorize(RITUAL_ID, encryptors, sender=admin)
+    assert managed_allow_list.authActions(RITUAL_ID) == 1 + 2 * batch_size
+
+    def check(metric, value):
+        gas_baseline.check(f"{metric}[batch_size={batch_size}]", value)
+
+    check("minAuthorizationActionsCap.gas", cap_gas)
+    check("authorize.gas", authorize_tx.gas_used)
+    check("authorize.gas.per_address", authorize_tx.gas_used // batch_size)
+    check("deauthorize.gas", deauthorize_tx.gas_used)
@@ -0,0 +1,110 @@
+import os
+
+import pytest
+from eth_account.messages import encode_defunct
+from web3 import Web3
+
+from tests.test_bqeth_subscription import (
+    DURATION,
+    ERC20_SUPPLY,
+    MAX_NODES,
+    PACKAGE_DURATION,
+    RitualState,
+    adopter,
+    adopter_setter,
+    coordinator,
+    erc20,
+    global_allow_list,
+    subscription,
+    treasury,
+)
+
+RITUAL_ID = 1
+BATCH_SIZES = [1, 10, 50, 100]
+PERIODS = [1, 2, 4, 8]
+HEADER_SIZES = [32, 256, 1024]
+
+
+@pytest.fixture()
+def active_subscription(
+    erc20, subscription, coordinator, global_allow_list, adopter, adopter_setter, treasury
+):
+    erc20.approve(subscription.address, ERC20_SUPPLY, sender=adopter)
+    subscription.setAdopter(adopter, sender=adopter_setter)
+    subscription.payForSubscription(0, sender=adopter)
+    coordinator.setRitual(
+        RITUAL_ID, RitualState.ACTIVE, 0, global_allow_list.address, sender=treasury
+    )
+    coordinator.processRitualPayment(adopter, RITUAL_ID, MAX_NODES, DURATION, sender=treasury)
+    return subscription
+
+
+def sign(account, data):
+    digest = Web3.keccak(data)
+    signed_digest = Web3().eth.account.sign_message(
+        encode_defunct(digest), private_key=account.private_key
+    )
+    return bytes(signed_digest.signature)
+
+
+@pytest.mark.parametrize("batch_size", BATCH_SIZES)
+def test_authorize_gas(gas_baseline, active_subscription, global_allow_list, adopter, batch_size):
+    encryptors = [Web3.to_checksum_address(os.urandom(20)) for _ in range(batch_size)]
+    slots_tx = active_subscription.payForEncryptorSlots(batch_size, sender=adopter)
+
+    authorize_tx = global_allow_list.authorize(RITUAL_ID, encryptors, sender=adopter)
+    assert active_subscription.usedEncryptorSlots() == batch_size
+    deauthorize_tx = global_allow_list.deauthorize(RITUAL_ID, encryptors, sender=adopter)
+    assert active_subscription.usedEncryptorSlots() == 0
+
+    def check(metric, value):
+        gas_baseline.check(f"{metric}[batch_size={batch_size}]", value)
+
+    check("payForEncryptorSlots.gas", slots_tx.gas_used)
+    check("authorize.gas", authorize_tx.gas_used)
+    check("authorize.gas.per_address", authorize_tx.gas_used // batch_size)
+    check("deauthorize.gas", deauthorize_tx.gas_used)
+    check("deauthorize.gas.per_address", deauthorize_tx.gas_used // batch_size)
+
+
+@pytest.mark.parametrize("header_size", HEADER_SIZES)
+def test_is_authorized_gas(
+    gas_baseline, active_subscription, global_allow_list, adopter, header_size
+):
+    active_subscription.payForEncryptorSlots(1, sender=adopter)
+    global_allow_list.authorize(RITUAL_ID, [adopter.address], sender=adopter)
+    header = os.urandom(header_size)
+    signature = sign(adopter, header)
+
+    assert global_allow_list.isAuthorized(RITUAL_ID, signature, header)
+    gas = global_allow_list.isAuthorized.estimate_gas_cost(RITUAL_ID, signature, header)
+    gas_baseline.check(f"isAuthorized.gas[header_size={header_size}]", gas)
+
+
+@pytest.mark.parametrize("periods", PERIODS)
+def test_pay_subscription_gas(
+    gas_baseline,
+    active_subscription,
+    global_allow_list,
+    adopter,
+    chain,
+    periods,
+):
+    # Pays the next period at the start of each paid one, `periods` times
+    start = active_subscription.startOfSubscription()
+    for period in range(periods):
+        if period > 0:
+            chain.pending_timestamp = start + period * PACKAGE_DURATION + 1
+        tx = active_subscription.payForSubscription(1, sender=adopter)
+    assert active_subscription.paidUntilPeriod() == periods + 1
+    gas_baseline.check(f"payForSubscription.gas[periods={periods}]", tx.gas_used)
+
+    # beforeIsAuthorized is the only part of isAuthorized that depends on the period
+    chain.mine(timestamp=start + periods * PACKAGE_DURATION + 1)
+    assert active_subscription.getCurrentPeriodNumber() == periods
+    global_allow_list.authorize(RITUAL_ID, [adopter.address], sender=adopter)
+    header = os.urandom(HEADER_SIZES[0])
+    signature = sign(adopter, header)
+    assert global_allow_list.isAuthorized(RITUAL_ID, signature, header)
+    gas = global_allow_list.isAuthorized.estimate_gas_cost(RITUAL_ID, signature, header)
+    gas_baseline.check(f"isAuthorized.gas[periods={periods}]", gas)
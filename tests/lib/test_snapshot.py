@@ -17,9 +17,21 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 
 import itertools
 
+import numpy as np
 import pytest
 from web3 import Web3
 
+from deployment.snapshot import (
+    decode_snapshot,
+    encode_snapshot,
+    get_value_at,
+    get_values_at,
+    last_snapshot,
+    read_snapshot_history,
+)
+
+HISTORY_SLOT = 0
+
 
 @pytest.fixture(scope="module")
 def snapshot(accounts, project):
@@ -49,6 +61,8 @@ def test_snapshot(accounts, snapshot, block_number, value):
 
     encoded_snapshot = encode(block_number, value)
     assert decode(encoded_snapshot) == (block_number, value)
+    assert encoded_snapshot == encode_snapshot(block_number, value)
+    assert decode_snapshot(encoded_snapshot) == (block_number, value)
     expected_encoded_snapshot_as_bytes = block_number.to_bytes(4, "big") + value.to_bytes(12, "big")
     assert Web3.to_bytes(encoded_snapshot).rjust(16, b"\x00") == expected_encoded_snapshot_as_bytes
 
@@ -80,3 +94,27 @@ def test_snapshot(accounts, snapshot, block_number, value):
 
     # Clear history for next test
     snapshot.deleteHistory(sender=account)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_snapshot_history(accounts, snapshot, seed):
+    account = accounts[0]
+    rng = np.random.default_rng(seed)
+
+    # Random history with gaps and an odd length, so that the last storage slot is half full
+    times = np.cumsum(rng.integers(1, 100, size=15))
+    values = [int(v) << 32 for v in rng.integers(0, 2**63, size=len(times))]
+    for time, value in zip(times, values):
+        snapshot.addSnapshot(int(time), value, sender=account)
+
+    history = read_snapshot_history(snapshot.address, HISTORY_SLOT)
+    assert len(history) == snapshot.length()
+    assert last_snapshot(history) == snapshot.lastSnapshot()
+
+    queries = [0, *times, *(times - 1), *(times + 1), int(times[-1]) + 1000]
+    expected = [snapshot.getValueAt(int(q)) for q in queries]
+    assert list(get_values_at(history, queries)) == expected
+    assert get_value_at(history, int(times[3])) == values[3]
+
+    # Clear history for next test
+    snapshot.deleteHistory(sender=account)
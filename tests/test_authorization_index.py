@@ -0,0 +1,106 @@
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from eth_utils import to_checksum_address
+
+from deployment.authorization_index import AuthorizationIndex
+from deployment.encryptors import ADDRESS_DTYPE
+
+ACCESS_CONTROLLER = to_checksum_address(b"\xaa" * 20)
+ADDRESSES = [to_checksum_address(i.to_bytes(20, "big")) for i in range(1, 11)]
+# an address with trailing zero bytes must survive the round trip
+ADDRESSES.append(to_checksum_address(b"\x01" + bytes(19)))
+
+
+def authorization_log(block, ritual_id, address, authorized, log_index=0):
+    return SimpleNamespace(
+        event_name="AddressAuthorizationSet",
+        block_number=block,
+        log_index=log_index,
+        ritualId=ritual_id,
+        isAuthorized=authorized,
+        event_arguments=dict(ritualId=ritual_id, _address=address, isAuthorized=authorized),
+    )
+
+
+def cap_log(block, ritual_id, address, cap, log_index=0):
+    return SimpleNamespace(
+        event_name="AdministratorCapSet",
+        block_number=block,
+        log_index=log_index,
+        ritualId=ritual_id,
+        cap=cap,
+        event_arguments=dict(ritualId=ritual_id, _address=address, cap=cap),
+    )
+
+
+def test_authorization_index(tmp_path):
+    index = AuthorizationIndex(ACCESS_CONTROLLER, chain_id=1)
+    index.apply([cap_log(1, 0, ADDRESSES[0], 5), cap_log(1, 0, ADDRESSES[1], 3, log_index=1)])
+    index.apply([authorization_log(2, 0, address, True) for address in ADDRESSES])
+    # deauthorized then reauthorized in the same batch, logs out of order
+    index.apply(
+        [
+            authorization_log(4, 0, ADDRESSES[2], True),
+            authorization_log(3, 0, ADDRESSES[2], False),
+            authorization_log(3, 0, ADDRESSES[3], False),
+            authorization_log(3, 1, ADDRESSES[0], True),
+            cap_log(3, 0, ADDRESSES[1], 0, log_index=1),
+        ]
+    )
+
+    expected = [address for address in ADDRESSES if address != ADDRESSES[3]]
+    assert index.rituals == [0, 1]
+    assert index.authorized_count(0) == len(expected)
+    assert sorted(index.authorized(0)) == sorted(expected)
+    assert index.authorized(1) == [ADDRESSES[0]]
+    assert index.authorized(2) == []
+    assert index.auth_actions(0) == 2 + len(ADDRESSES) + 4
+    assert index.administrator_caps(0) == {ADDRESSES[0]: 5}
+    assert index.used_encryptor_slots == len(ADDRESSES) - 2 + 2
+
+    unknown = to_checksum_address(b"\xff" * 20)
+    queries = [ADDRESSES[3], ADDRESSES[-1], unknown, ADDRESSES[0]]
+    assert list(index.is_authorized(0, queries)) == [False, True, False, True]
+    raw = np.frombuffer(b"".join(bytes.fromhex(a[2:]) for a in queries), dtype=ADDRESS_DTYPE)
+    assert list(index.is_authorized(0, raw)) == [False, True, False, True]
+    assert list(index.is_authorized(2, queries)) == [False] * 4
+
+    index.cursor = 4
+    filepath = tmp_path / "index.npz"
+    index.save(filepath)
+    loaded = AuthorizationIndex.open(filepath, ACCESS_CONTROLLER, chain_id=1)
+    assert loaded.cursor == 4
+    assert loaded.rituals == index.rituals
+    assert loaded.authorized(0) == index.authorized(0)
+    assert loaded.auth_actions(0) == index.auth_actions(0)
+    assert loaded.administrator_caps(0) == index.administrator_caps(0)
+    assert loaded.used_encryptor_slots == index.used_encryptor_slots
+
+    with pytest.raises(ValueError, match="another access controller"):
+        AuthorizationIndex.open(filepath, ACCESS_CONTROLLER, chain_id=137)
+    assert AuthorizationIndex.open(tmp_path / "new.npz", ACCESS_CONTROLLER, 1).cursor == -1
+    new = AuthorizationIndex.open(tmp_path / "new.npz", ACCESS_CONTROLLER, 1, start_block=100)
+    assert new.cursor == 99
+    # the start block only applies to new indexes
+    assert AuthorizationIndex.open(filepath, ACCESS_CONTROLLER, 1, start_block=100).cursor == 4
+    with pytest.raises(ValueError):
+        AuthorizationIndex(ACCESS_CONTROLLER, chain_id=1, start_block=-1)
+
+
+def test_authorization_index_benchmark():
+    index = AuthorizationIndex(ACCESS_CONTROLLER, chain_id=1)
+    rng = np.random.default_rng(seed=42)
+    addresses = rng.bytes(20 * 200_000)
+    index._authorized[0] = np.sort(np.frombuffer(addresses[: 20 * 100_000], dtype="S20"))
+    queries = np.frombuffer(addresses, dtype=ADDRESS_DTYPE)
+
+    start = time.perf_counter()
+    authorized = index.is_authorized(0, queries)
+    elapsed = time.perf_counter() - start
+
+    assert authorized.sum() == 100_000
+    assert authorized[:100_000].all()
+    assert elapsed < 1
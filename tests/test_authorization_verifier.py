@@ -0,0 +1,70 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from eth_utils import keccak, to_canonical_address
+
+from deployment.authorization_index import AuthorizationIndex
+from deployment.authorization_verifier import (
+    SECP256K1_N,
+    AuthorizationVerifier,
+    recover_signer,
+    recover_signers,
+)
+
+ACCESS_CONTROLLER = "0x" + "aa" * 20
+
+
+def sign(account, ciphertext_header: bytes) -> bytes:
+    message = encode_defunct(keccak(ciphertext_header))
+    return bytes(account.sign_message(message).signature)
+
+
+def malleable(signature: bytes) -> bytes:
+    # same signer, but s in the upper half of the curve order
+    s = SECP256K1_N - int.from_bytes(signature[32:64], "big")
+    return signature[:32] + s.to_bytes(32, "big") + bytes([55 - signature[64]])
+
+
+def test_recover_signer():
+    account = Account.create()
+    header = os.urandom(100)
+    signature = sign(account, header)
+    assert recover_signer(signature, header) == to_canonical_address(account.address)
+    assert recover_signer(signature, os.urandom(100)) != to_canonical_address(account.address)
+
+    # ECDSA.recover reverts on all of these
+    assert recover_signer(signature[:64], header) is None
+    assert recover_signer(signature + b"\x00", header) is None
+    assert recover_signer(signature[:64] + b"\x01", header) is None
+    assert recover_signer(malleable(signature), header) is None
+    assert recover_signer(bytes(64) + b"\x1b", header) is None
+
+
+def test_authorization_verifier():
+    accounts = [Account.create() for _ in range(4)]
+    index = AuthorizationIndex(ACCESS_CONTROLLER, chain_id=1)
+    index._authorized[0] = np.sort(
+        np.array([to_canonical_address(a.address) for a in accounts[:2]], dtype="S20")
+    )
+    index._authorized[1] = np.array([to_canonical_address(accounts[2].address)], dtype="S20")
+
+    headers = [os.urandom(64) for _ in accounts]
+    requests = [(0, sign(a, h), h) for a, h in zip(accounts, headers)]
+    requests += [(1, sign(a, h), h) for a, h in zip(accounts, headers)]
+    requests += [(0, sign(accounts[0], headers[0])[:64], headers[0]), (2, *requests[0][1:])]
+    expected = [True, True, False, False, False, False, True, False, False, False]
+
+    verifier = AuthorizationVerifier(index, cache_size=3)
+    assert list(verifier.verify(requests)) == expected
+    assert len(verifier._signers) == 3
+    # cached signers give the same answers
+    assert list(verifier.verify(requests[-3:])) == expected[-3:]
+
+    pairs = [(evidence, header) for _, evidence, header in requests]
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert recover_signers(pairs, executor=executor, chunk_size=3) == recover_signers(pairs)
+        verifier = AuthorizationVerifier(index, executor=executor)
+        assert list(verifier.verify(requests)) == expected
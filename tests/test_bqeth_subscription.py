@@ -23,6 +23,8 @@ from ape.utils import ZERO_ADDRESS
 from eth_account.messages import encode_defunct
 from web3 import Web3
 
+from deployment.subscription import SubscriptionCostProjector
+
 BASE_FEE_RATE = 42
 BASE_FEE_RATE_INCREASE = 10  # 10%
 MAX_NODES = 10
@@ -141,6 +143,25 @@ def test_adopter_setter(subscription, adopter_setter, adopter):
         subscription.setAdopter(adopter_setter, sender=adopter_setter)
 
 
+def test_cost_projector(subscription):
+    projector = SubscriptionCostProjector.from_contract(subscription)
+    periods = range(16)
+    encryptor_slots = [0, 1, 10, 2**20]
+
+    cost_table = projector.cost_table(periods, encryptor_slots)
+    for period in periods:
+        assert projector.base_fees(period) == subscription.baseFees(period) == base_fee(period)
+        for j, slots in enumerate(encryptor_slots):
+            expected = subscription.baseFees(period) + subscription.encryptorFees(
+                slots, PACKAGE_DURATION
+            )
+            assert cost_table[period, j] == expected
+    assert projector.encryptor_fees(10, ONE_DAY) == subscription.encryptorFees(10, ONE_DAY)
+
+    plan_costs = projector.plan_costs(3, encryptor_slots, first_period=2)
+    assert list(plan_costs[-1]) == list(cost_table[2:5].sum(axis=0))
+
+
 def test_pay_subscription(
     erc20, subscription, coordinator, global_allow_list, adopter, adopter_setter, treasury, chain
 ):
@@ -673,3 +694,30 @@ def test_before_is_authorized(
 
     subscription.payForEncryptorSlots(1, sender=adopter)
     assert global_allow_list.isAuthorized(ritual_id, bytes(signature), bytes(data))
+
+
+def test_end_of_subscription_gas(
+    erc20, subscription, coordinator, adopter, adopter_setter, global_allow_list, treasury, chain
+):
+    erc20.approve(subscription.address, ERC20_SUPPLY, sender=adopter)
+    subscription.setAdopter(adopter, sender=adopter_setter)
+    subscription.payForSubscription(0, sender=adopter)
+    subscription.payForSubscription(0, sender=adopter)
+    assert subscription.paidUntilPeriod() == 2
+
+    ritual_id = 1
+    coordinator.setRitual(
+        ritual_id, RitualState.ACTIVE, 0, global_allow_list.address, sender=treasury
+    )
+    coordinator.processRitualPayment(adopter, ritual_id, MAX_NODES, DURATION, sender=treasury)
+    start = subscription.startOfSubscription()
+    end_subscription = start + 2 * PACKAGE_DURATION
+
+    # The cost doesn't depend on how many periods passed since the last paid one
+    gas = []
+    for period in range(0, 150, 10):
+        chain.mine(timestamp=start + period * PACKAGE_DURATION + 1)
+        assert subscription.getCurrentPeriodNumber() == period
+        assert subscription.getEndOfSubscription() == end_subscription
+        gas.append(subscription.getEndOfSubscription.estimate_gas_cost())
+    assert len(set(gas)) == 1
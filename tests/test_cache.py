@@ -0,0 +1,140 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from web3 import Web3
+
+from deployment.cache import BlockPinnedCallCache
+
+TOTAL_SUPPLY = Web3.to_wei(1_000_000_000, "ether")
+
+
+@pytest.fixture()
+def token(project, creator):
+    return creator.deploy(project.NuCypherToken, TOTAL_SUPPLY)
+
+
+def is_patched(provider):
+    return "send_call" in vars(provider)
+
+
+def test_hits_and_misses(token, creator, account1):
+    with BlockPinnedCallCache() as cache:
+        assert token.balanceOf(creator) == TOTAL_SUPPLY
+        assert cache.stats == (0, 1, 0, 1)
+        assert token.balanceOf(creator) == TOTAL_SUPPLY
+        assert cache.stats == (1, 1, 0, 1)
+        assert token.balanceOf(account1) == 0
+        assert cache.stats == (1, 2, 0, 2)
+        assert cache.stats.hit_rate == pytest.approx(1 / 3)
+
+    cache.clear()
+    assert cache.stats == (0, 0, 0, 0)
+    assert cache.stats.hit_rate == 0
+
+
+def test_lru_eviction(token, accounts):
+    with pytest.raises(ValueError):
+        BlockPinnedCallCache(maxsize=0)
+
+    a, b, c = accounts[0:3]
+    with BlockPinnedCallCache(maxsize=2) as cache:
+        token.balanceOf(a)
+        token.balanceOf(b)
+        token.balanceOf(a)  # a is now the most recently used entry
+        assert cache.stats == (1, 2, 0, 2)
+
+        token.balanceOf(c)  # evicts b
+        assert cache.stats == (1, 3, 1, 2)
+        token.balanceOf(a)
+        assert cache.stats == (2, 3, 1, 2)
+        token.balanceOf(b)  # evicts c
+        assert cache.stats == (2, 4, 2, 2)
+        token.balanceOf(c)
+        assert cache.stats == (2, 5, 3, 2)
+
+
+def test_block_pinning(token, creator, account1, chain):
+    head = chain.blocks.head.number
+    with BlockPinnedCallCache() as cache:
+        assert cache.block_number == head
+        assert token.balanceOf(account1) == 0
+
+        token.transfer(account1, 100, sender=creator)
+        chain.mine(2)
+        assert chain.blocks.head.number > head
+
+        # reads stay pinned to the first block, cached or not
+        assert token.balanceOf(account1) == 0
+        assert token.balanceOf(creator) == TOTAL_SUPPLY
+        assert cache.block_number == head
+        # explicit block numbers are honoured and cached separately
+        assert token.balanceOf(account1, block_id=chain.blocks.head.number) == 100
+        assert cache.stats.size == 3
+
+        assert cache.refresh() == chain.blocks.head.number
+        assert cache.stats.size == 0
+        assert token.balanceOf(account1) == 100
+        assert token.balanceOf(creator) == TOTAL_SUPPLY - 100
+
+        assert cache.refresh(block_number=head) == head
+        assert token.balanceOf(account1) == 0
+
+    with BlockPinnedCallCache(block_number=head) as cache:
+        assert token.balanceOf(account1) == 0
+        assert cache.block_number == head
+
+
+def test_restores_send_call(token, creator, account1, chain):
+    provider = chain.provider
+    assert not is_patched(provider)
+
+    cache = BlockPinnedCallCache()
+    with cache:
+        assert is_patched(provider)
+        assert cache.active
+        token.balanceOf(account1)
+    assert not is_patched(provider)
+    assert not cache.active
+
+    token.transfer(account1, 100, sender=creator)
+    assert token.balanceOf(account1) == 100
+    assert cache.stats.misses == 1
+
+    with pytest.raises(ZeroDivisionError):
+        with BlockPinnedCallCache():
+            assert is_patched(provider)
+            _ = 1 / 0
+    assert not is_patched(provider)
+
+    # nested caches are rejected without disturbing the active one
+    with BlockPinnedCallCache() as cache:
+        with pytest.raises(RuntimeError):
+            with cache:
+                pass
+        with pytest.raises(RuntimeError):
+            with BlockPinnedCallCache():
+                pass
+        assert is_patched(provider)
+        token.balanceOf(account1)
+        token.balanceOf(account1)
+        assert cache.stats.hits == 1
+    assert not is_patched(provider)
+
+
+def test_thread_safety(token, creator, accounts):
+    holders = list(accounts[0:8])
+    for i, holder in enumerate(holders[1:], start=1):
+        token.transfer(holder, i, sender=creator)
+    expected = {holder.address: token.balanceOf(holder) for holder in holders}
+
+    reads = [holders[i % len(holders)] for i in range(400)]
+    with BlockPinnedCallCache(maxsize=4) as cache:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            balances = list(executor.map(token.balanceOf, reads))
+
+    assert balances == [expected[holder.address] for holder in reads]
+    stats = cache.stats
+    assert stats.hits + stats.misses == len(reads)
+    assert stats.size == 4
+    # concurrent misses of the same key overwrite a single entry
+    assert stats.evictions <= stats.misses - stats.size
@@ -14,12 +14,20 @@ GNU Affero General Public License for more details.
 You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
+import os
+
 import ape
 import pytest
 from ape.utils import ZERO_ADDRESS
 from eth_utils import to_checksum_address, to_int
 from web3 import Web3
 
+from deployment.constants import MAX_BATCH_SYNC_SIZE
+from deployment.sampling import StakeTree
+
+# Gas limit of L2 state sync messages, minus the overhead of the bridge
+CHILD_SYNC_GAS_LIMIT = 5_000_000 - 500_000
+
 OPERATOR_SLOT = 0
 CONFIRMATION_SLOT = 2
 
@@ -209,6 +217,17 @@ def test_update_authorization(accounts, root_application, child_application, cha
     ]
 
 
+def test_authorized_stakes(accounts, root_application, child_application):
+    creator, staking_provider_1, staking_provider_2, *everyone_else = accounts[0:]
+    value = Web3.to_wei(40_000, "ether")
+    assert child_application.authorizedStakes([]) == []
+
+    root_application.updateAuthorization(staking_provider_1, value, sender=creator)
+    root_application.updateAuthorization(staking_provider_2, 2 * value, sender=creator)
+    providers = [staking_provider_2, creator, staking_provider_1]
+    assert child_application.authorizedStakes(providers) == [2 * value, 0, value]
+
+
 def test_confirm_address(accounts, root_application, child_application, coordinator, chain):
     (
         creator,
@@ -323,6 +342,217 @@ def test_confirm_address(accounts, root_application, child_application, coordina
     assert len(staking_providers) == 0
 
 
+def active_set_matches_full_scan(child_application, cohort_duration, page_size):
+    """Compares paging through the active set with a full scan of the providers array"""
+    full_scan_tokens, full_scan = child_application.getActiveStakingProviders(0, 0, cohort_duration)
+    tokens, providers = 0, []
+    length = child_application.getActiveStakingProvidersLength()
+    for start in range(0, length, page_size or max(length, 1)):
+        page_tokens, page = child_application.getActiveStakingProvidersPage(
+            start, page_size, cohort_duration
+        )
+        tokens += page_tokens
+        providers.extend(page)
+    return tokens == full_scan_tokens and sorted(providers) == sorted(full_scan)
+
+
+def test_active_staking_provider_set(
+    root_application, child_application, coordinator, creator, chain
+):
+    value = MIN_AUTHORIZATION
+    cohort_durations = (0, DEAUTHORIZATION_DURATION // 2, 2 * DEAUTHORIZATION_DURATION)
+    staking_providers = [to_checksum_address(i.to_bytes(20, "big")) for i in range(1, 13)]
+    operators = [to_checksum_address((i + 2**80).to_bytes(20, "big")) for i in range(1, 13)]
+
+    def check():
+        for cohort_duration in cohort_durations:
+            for page_size in (1, 5, 0):
+                assert active_set_matches_full_scan(child_application, cohort_duration, page_size)
+
+    assert child_application.getActiveStakingProvidersLength() == 0
+    all_locked, staking_providers_page = child_application.getActiveStakingProvidersPage(0, 0, 0)
+    assert all_locked == 0
+    assert len(staking_providers_page) == 0
+    for i, (staking_provider, operator) in enumerate(zip(staking_providers, operators)):
+        root_application.updateAuthorization(staking_provider, value + i, sender=creator)
+        root_application.updateOperator(staking_provider, operator, sender=creator)
+        if i % 4 != 0:
+            coordinator.confirmOperatorAddress(operator, sender=creator)
+    assert child_application.getActiveStakingProvidersLength() == 9
+    check()
+
+    # Pending deauthorizations only exclude providers from some cohorts
+    end_deauthorization = chain.pending_timestamp + DEAUTHORIZATION_DURATION
+    root_application.updateAuthorization(
+        staking_providers[1], 2 * value, value + 1, end_deauthorization, sender=creator
+    )
+    root_application.updateAuthorization(
+        staking_providers[2], 2 * value, value // 2, end_deauthorization, sender=creator
+    )
+    assert child_application.getActiveStakingProvidersLength() == 9
+    check()
+
+    # Rebonding, decreasing authorization below minimum or deauthorizing removes from the set
+    root_application.updateOperator(staking_providers[3], staking_providers[3], sender=creator)
+    root_application.updateAuthorization(staking_providers[5], value - 1, sender=creator)
+    root_application.updateAuthorization(staking_providers[6], 0, sender=creator)
+    assert child_application.getActiveStakingProvidersLength() == 6
+    check()
+
+    # and providers come back after confirmation or increasing authorization
+    coordinator.confirmOperatorAddress(staking_providers[3], sender=creator)
+    coordinator.confirmOperatorAddress(operators[0], sender=creator)
+    root_application.updateAuthorization(staking_providers[5], value, sender=creator)
+    assert child_application.getActiveStakingProvidersLength() == 9
+    check()
+
+    # Syncing the set with the current state of providers doesn't change it
+    child_application.syncActiveStakingProviders(0, 5, sender=creator)
+    child_application.syncActiveStakingProviders(5, 0, sender=creator)
+    assert child_application.getActiveStakingProvidersLength() == 9
+    check()
+
+
+def reference_stake_tree(child_application):
+    """Rebuilds the sampling tree of the child application from the state of its providers"""
+    stakes = list()
+    for i in range(child_application.getStakingProvidersLength()):
+        info = child_application.stakingProviderInfo(child_application.stakingProviders(i))
+        active = info.operatorConfirmed and info.authorized >= MIN_AUTHORIZATION
+        stakes.append(info.authorized if active else 0)
+    return StakeTree.from_stakes(stakes)
+
+
+def test_sample_providers(root_application, child_application, coordinator, creator, chain):
+    value = MIN_AUTHORIZATION
+    num_providers = 40
+    end_deauthorization = chain.pending_timestamp + DEAUTHORIZATION_DURATION
+    staking_providers = [to_checksum_address(os.urandom(20)) for _ in range(num_providers)]
+    operators = [to_checksum_address(os.urandom(20)) for _ in range(num_providers)]
+    updates = [
+        (
+            staking_provider,
+            operator,
+            value * (1 + i % 7) - (1 if i % 9 == 0 else 0),
+            value if i % 5 == 0 else 0,
+            end_deauthorization if i % 5 == 0 else 0,
+        )
+        for i, (staking_provider, operator) in enumerate(zip(staking_providers, operators))
+    ]
+    root_application.batchUpdate(updates, sender=creator)
+    assert child_application.getTotalSampledStake() == 0
+    with ape.reverts("Not enough staking providers"):
+        child_application.sampleProviders(os.urandom(32), 1, 0)
+
+    confirmed = [operator for i, operator in enumerate(operators) if i % 9 != 0 and i % 4 != 0]
+    coordinator.batchConfirmOperatorAddress(confirmed, sender=creator)
+    # providers that can't be part of a ritual
+    coordinator.resetProviderPublicKey(staking_providers[1], sender=creator)
+    root_application.updateOperator(staking_providers[2], staking_providers[2], sender=creator)
+
+    tree = reference_stake_tree(child_application)
+    assert child_application.getTotalSampledStake() == tree.total > 0
+
+    def is_eligible(slot, cohort_duration):
+        staking_provider = child_application.stakingProviders(slot)
+        end_date = chain.pending_timestamp + cohort_duration if cohort_duration else 2**256 - 1
+        return child_application.eligibleStake(
+            staking_provider, end_date
+        ) >= MIN_AUTHORIZATION and coordinator.isProviderPublicKeySet(staking_provider)
+
+    for cohort_duration in (0, DEAUTHORIZATION_DURATION // 2):
+        for count in (1, 5, 10):
+            seed = os.urandom(32)
+            cohort = child_application.sampleProviders(seed, count, cohort_duration)
+            slots = tree.sample(seed, count, lambda slot: is_eligible(slot, cohort_duration))
+            expected = [child_application.stakingProviders(slot) for slot in slots]
+            assert cohort == sorted(expected, key=lambda x: int(x, 16))
+
+    # Decreasing authorization updates the tree
+    root_application.updateAuthorization(staking_providers[3], value, 0, 0, sender=creator)
+    root_application.updateAuthorization(staking_providers[6], value - 1, 0, 0, sender=creator)
+    tree = reference_stake_tree(child_application)
+    assert child_application.getTotalSampledStake() == tree.total
+    seed = os.urandom(32)
+    slots = tree.sample(seed, 10, lambda slot: is_eligible(slot, 0))
+    expected = [child_application.stakingProviders(slot) for slot in slots]
+    assert child_application.sampleProviders(seed, 10, 0) == sorted(
+        expected, key=lambda x: int(x, 16)
+    )
+
+
+@pytest.mark.parametrize("num_providers", [1_000, 10_000])
+def test_sample_providers_gas(
+    root_application, child_application, coordinator, creator, num_providers
+):
+    value = MIN_AUTHORIZATION
+    batch_size = 50
+    for start in range(0, num_providers, batch_size):
+        updates = [
+            (
+                to_checksum_address(i.to_bytes(20, "big")),
+                to_checksum_address((i + 2**80).to_bytes(20, "big")),
+                value + i,
+                0,
+                0,
+            )
+            for i in range(start + 1, start + batch_size + 1)
+        ]
+        root_application.batchUpdate(updates, sender=creator)
+        coordinator.batchConfirmOperatorAddress([u[1] for u in updates], sender=creator)
+    assert child_application.getActiveStakingProvidersLength() == num_providers
+
+    # a single update of the tree writes at most log2(N) nodes
+    staking_provider = to_checksum_address((1).to_bytes(20, "big"))
+    tx = root_application.updateAuthorization(staking_provider, 2 * value, 0, 0, sender=creator)
+    update_gas = tx.gas_used
+    sample_gas = child_application.sampleProviders.estimate_gas_cost(os.urandom(32), 30, 0)
+    assert update_gas < 150_000
+    # well below eth_call gas caps of RPC providers
+    assert sample_gas < 3_000_000
+
+
+def test_activate_provider_after_registrations_gas(
+    root_application, child_application, coordinator, creator
+):
+    value = MIN_AUTHORIZATION
+    num_providers = 2_000
+    batch_size = 50
+    # dormant providers: registered, but never confirmed
+    for start in range(0, num_providers, batch_size):
+        updates = [
+            (
+                to_checksum_address(i.to_bytes(20, "big")),
+                to_checksum_address((i + 2**80).to_bytes(20, "big")),
+                value,
+                0,
+                0,
+            )
+            for i in range(start + 1, start + batch_size + 1)
+        ]
+        root_application.batchUpdate(updates, sender=creator)
+    assert child_application.getStakingProvidersLength() == num_providers
+    assert child_application.getTotalSampledStake() == 0
+
+    # the first activation at the highest index doesn't grow the tree on the hot path
+    operator = to_checksum_address((num_providers + 2**80).to_bytes(20, "big"))
+    tx = coordinator.confirmOperatorAddress(operator, sender=creator)
+    assert tx.gas_used < 150_000
+    assert child_application.getTotalSampledStake() == value
+    assert reference_stake_tree(child_application).total == value
+
+    staking_provider = to_checksum_address((num_providers - 1).to_bytes(20, "big"))
+    tx = root_application.updateAuthorization(staking_provider, 2 * value, 0, 0, sender=creator)
+    assert tx.gas_used < 150_000
+    # a new registration adds a single node
+    tx = root_application.updateOperator(
+        to_checksum_address((num_providers + 1).to_bytes(20, "big")),
+        to_checksum_address((num_providers + 1 + 2**80).to_bytes(20, "big")),
+        sender=creator,
+    )
+    assert tx.gas_used < 150_000
+
+
 def test_penalize(accounts, root_application, child_application, coordinator):
     (
         creator,
@@ -337,3 +567,120 @@ def test_penalize(accounts, root_application, child_application, coordinator):
     tx = child_application.penalize(staking_provider, sender=creator)
     assert root_application.penalties(staking_provider)
     assert tx.events == [child_application.Penalized(stakingProvider=staking_provider)]
+
+
+def test_batch_update(accounts, root_application, child_application, chain):
+    creator, staking_provider_1, staking_provider_2, operator_1, operator_2 = accounts[0:5]
+    value = Web3.to_wei(40_000, "ether")
+    end_deauthorization = chain.pending_timestamp + DEAUTHORIZATION_DURATION
+
+    # Call to batch update can be done only from root app
+    with ape.reverts("Caller must be the root application"):
+        child_application.batchUpdate([], sender=creator)
+
+    updates = [
+        (staking_provider_1, operator_1, value, 0, 0),
+        (staking_provider_2, operator_2, 2 * value, value, end_deauthorization),
+    ]
+    tx = root_application.batchUpdate(updates, sender=creator)
+    assert child_application.getStakingProvidersLength() == 2
+    assert child_application.authorizedStake(staking_provider_1) == value
+    assert child_application.operatorToStakingProvider(operator_1) == staking_provider_1
+    assert child_application.authorizedStake(staking_provider_2) == 2 * value
+    assert child_application.pendingAuthorizationDecrease(staking_provider_2) == value
+    assert child_application.eligibleStake(staking_provider_2, end_deauthorization + 1) == value
+    assert child_application.operatorToStakingProvider(operator_2) == staking_provider_2
+    assert tx.events == [
+        child_application.AuthorizationUpdated(
+            stakingProvider=staking_provider_1,
+            authorized=value,
+            deauthorizing=0,
+            endDeauthorization=0,
+        ),
+        child_application.OperatorUpdated(stakingProvider=staking_provider_1, operator=operator_1),
+        child_application.AuthorizationUpdated(
+            stakingProvider=staking_provider_2,
+            authorized=2 * value,
+            deauthorizing=value,
+            endDeauthorization=end_deauthorization,
+        ),
+        child_application.OperatorUpdated(stakingProvider=staking_provider_2, operator=operator_2),
+    ]
+
+    # Same values in update will be ignored
+    tx = root_application.batchUpdate(updates, sender=creator)
+    assert child_application.getStakingProvidersLength() == 2
+    assert tx.events == []
+
+    # Unbonding and deauthorization
+    updates = [(staking_provider_1, ZERO_ADDRESS, 0, 0, 0)]
+    tx = root_application.batchUpdate(updates, sender=creator)
+    assert child_application.authorizedStake(staking_provider_1) == 0
+    assert child_application.operatorToStakingProvider(operator_1) == ZERO_ADDRESS
+    assert child_application.stakingProviderInfo(staking_provider_1)[OPERATOR_SLOT] == ZERO_ADDRESS
+
+
+@pytest.mark.parametrize("batch_size", [1, 10, 100])
+def test_batch_update_gas(root_application, child_application, creator, batch_size):
+    value = Web3.to_wei(40_000, "ether")
+
+    def make_update(i):
+        staking_provider = to_checksum_address(i.to_bytes(20, "big"))
+        operator = to_checksum_address((i + 2**80).to_bytes(20, "big"))
+        return staking_provider, operator, value, 0, 0
+
+    # One message per staking provider and per update type
+    single_tx_gas = 0
+    for update in map(make_update, range(1, 4)):
+        staking_provider, operator, authorized, deauthorizing, end_deauthorization = update
+        tx = root_application.updateAuthorization(
+            staking_provider, authorized, deauthorizing, end_deauthorization, sender=creator
+        )
+        single_tx_gas += tx.gas_used
+        tx = root_application.updateOperator(staking_provider, operator, sender=creator)
+        single_tx_gas += tx.gas_used
+    single_gas_per_provider = single_tx_gas / 3
+
+    updates = [make_update(i) for i in range(4, 4 + batch_size)]
+    tx = root_application.batchUpdate(updates, sender=creator)
+    gas_per_provider = tx.gas_used / batch_size
+    assert child_application.getStakingProvidersLength() == 3 + batch_size
+    assert len(tx.events) == 2 * batch_size
+
+    if batch_size == 1:
+        # same work as two separate messages, but the base cost is paid once
+        assert gas_per_provider < single_gas_per_provider
+    else:
+        # batching amortizes the fixed per-message cost
+        assert gas_per_provider < 0.9 * single_gas_per_provider
+
+
+def test_batch_update_gas_at_cap(root_application, child_application, coordinator, creator, chain):
+    value = MIN_AUTHORIZATION
+    num_providers = 1_000
+    batch_size = 50
+    end_deauthorization = chain.pending_timestamp + DEAUTHORIZATION_DURATION
+
+    def make_update(i, operator_offset=2**80, authorized=value):
+        staking_provider = to_checksum_address(i.to_bytes(20, "big"))
+        operator = to_checksum_address((i + operator_offset).to_bytes(20, "big"))
+        return staking_provider, operator, authorized, value // 2, end_deauthorization
+
+    for start in range(1, num_providers + 1, batch_size):
+        updates = [make_update(i) for i in range(start, start + batch_size)]
+        root_application.batchUpdate(updates, sender=creator)
+        coordinator.batchConfirmOperatorAddress([u[1] for u in updates], sender=creator)
+    assert child_application.getActiveStakingProvidersLength() == num_providers
+
+    # new staking providers: registration and a new node of the sampling tree for each
+    new_providers = range(num_providers + 1, num_providers + 1 + MAX_BATCH_SYNC_SIZE)
+    tx = root_application.batchUpdate([make_update(i) for i in new_providers], sender=creator)
+    assert child_application.getStakingProvidersLength() == num_providers + MAX_BATCH_SYNC_SIZE
+    assert tx.gas_used < CHILD_SYNC_GAS_LIMIT
+
+    # active staking providers: authorization change, rebonding and removal from the active set
+    rebonded = range(1, 1 + MAX_BATCH_SYNC_SIZE)
+    updates = [make_update(i, operator_offset=2**90, authorized=2 * value) for i in rebonded]
+    tx = root_application.batchUpdate(updates, sender=creator)
+    assert child_application.getActiveStakingProvidersLength() == num_providers - len(rebonded)
+    assert tx.gas_used < CHILD_SYNC_GAS_LIMIT
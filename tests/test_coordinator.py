@@ -7,6 +7,14 @@ from eth_account import Account
 from hexbytes import HexBytes
 from web3 import Web3
 
+from deployment.reimbursements import (
+    burn_rate,
+    propose_static_gas,
+    reimbursement_errors,
+    reimbursement_records,
+)
+from deployment.rituals import provider_rituals, ritual_summaries
+from deployment.transcripts import rebuild_aggregated_transcripts, rebuild_transcripts
 from tests.conftest import ONE_DAY, gen_public_key, generate_transcript, RitualState
 
 TIMEOUT = 1000
@@ -237,6 +245,54 @@ def test_provider_public_key(coordinator, nodes):
     assert coordinator.getProviderPublicKey(selected_provider, ritual_id) == public_key
 
 
+@pytest.mark.parametrize("dkg_size", [2, 8, 16, MAX_DKG_SIZE])
+def test_initiate_ritual_gas(
+    project,
+    oz_dependency,
+    application,
+    coordinator,
+    nodes,
+    initiator,
+    erc20,
+    fee_model,
+    deployer,
+    treasury,
+    global_allow_list,
+    dkg_size,
+):
+    # Reference coordinator with one authorizedStake call per provider
+    contract = project.CoordinatorPerProviderStakeMock.deploy(application.address, sender=deployer)
+    proxy = oz_dependency.TransparentUpgradeableProxy.deploy(
+        contract.address,
+        deployer,
+        contract.initialize.encode_input(TIMEOUT, MAX_DKG_SIZE, deployer),
+        sender=deployer,
+    )
+    per_provider_coordinator = project.CoordinatorPerProviderStakeMock.at(proxy.address)
+    per_provider_coordinator.grantRole(
+        per_provider_coordinator.TREASURY_ROLE(), treasury, sender=deployer
+    )
+
+    providers = nodes[:dkg_size]
+    gas_used = dict()
+    for contract in (per_provider_coordinator, coordinator):
+        model = project.FlatRateFeeModel.deploy(
+            contract.address, erc20.address, FEE_RATE, sender=deployer
+        )
+        contract.approveFeeModel(model.address, sender=treasury)
+        for node in providers:
+            contract.setProviderPublicKey(gen_public_key(), sender=node)
+        erc20.approve(model.address, model.getRitualCost(dkg_size, DURATION), sender=initiator)
+        tx = contract.initiateRitual(
+            model, providers, initiator, DURATION, global_allow_list.address, sender=initiator
+        )
+        gas_used[contract.address] = tx.gas_used
+
+    batched_gas = gas_used[coordinator.address]
+    per_provider_gas = gas_used[per_provider_coordinator.address]
+    assert batched_gas < per_provider_gas
+
+
 def test_post_transcript(coordinator, nodes, initiator, erc20, fee_model, global_allow_list):
     initiate_ritual(
         coordinator=coordinator,
@@ -465,6 +521,32 @@ def test_get_participant(nodes, coordinator, initiator, erc20, fee_model, global
             coordinator.getParticipantFromProvider(0, new_account.address)
 
 
+def test_get_participants_without_transcripts_gas(
+    nodes, coordinator, initiator, erc20, fee_model, global_allow_list
+):
+    initiate_ritual(
+        coordinator=coordinator,
+        fee_model=fee_model,
+        erc20=erc20,
+        authority=initiator,
+        nodes=nodes,
+        allow_logic=global_allow_list,
+    )
+    post_transcripts_and_aggregations(coordinator, 0, nodes)
+
+    # Transcripts are not even read from storage unless they're requested
+    with_transcripts = coordinator.getParticipants.estimate_gas_cost(0, 0, 0, True)
+    without_transcripts = coordinator.getParticipants.estimate_gas_cost(0, 0, 0, False)
+    assert without_transcripts < 10_000 * len(nodes)
+    assert without_transcripts * 10 < with_transcripts
+
+    node = nodes[0].address
+    with_transcript = coordinator.getParticipant.estimate_gas_cost(0, node, True)
+    without_transcript = coordinator.getParticipant.estimate_gas_cost(0, node, False)
+    assert without_transcript < 50_000
+    assert without_transcript * 5 < with_transcript
+
+
 def test_post_aggregation(
     coordinator, nodes, initiator, erc20, fee_model, treasury, deployer, global_allow_list
 ):
@@ -696,3 +778,259 @@ def test_withdraw_tokens(coordinator, initiator, erc20, treasury, deployer):
     # Can't withdraw when there's no tokens
     with ape.reverts("Insufficient balance"):
         coordinator.withdrawAllTokens(erc20.address, sender=treasury)
+
+
+def post_transcripts_and_aggregations(coordinator, ritual_id, nodes):
+    threshold = coordinator.getThresholdForRitualSize(len(nodes))
+    transcript = generate_transcript(len(nodes), threshold)
+    aggregated = generate_transcript(len(nodes), threshold)
+    dkg_public_key = (os.urandom(32), os.urandom(16))
+    gas_used = 0
+    for node in nodes:
+        tx = coordinator.postTranscript(ritual_id, transcript, sender=node)
+        gas_used += tx.gas_used
+    for node in nodes:
+        tx = coordinator.postAggregation(
+            ritual_id, aggregated, dkg_public_key, os.urandom(42), sender=node
+        )
+        gas_used += tx.gas_used
+    return transcript, aggregated, gas_used
+
+
+def test_transcript_digests(
+    coordinator, nodes, initiator, erc20, fee_model, deployer, global_allow_list
+):
+    with ape.reverts(coordinator.AccessControlUnauthorizedAccount):
+        coordinator.setStoreTranscriptDigests(True, sender=initiator)
+    tx = coordinator.setStoreTranscriptDigests(True, sender=deployer)
+    assert coordinator.storeTranscriptDigests()
+    assert tx.events == [coordinator.TranscriptDigestsSet(enabled=True)]
+
+    initiate_ritual(
+        coordinator=coordinator,
+        fee_model=fee_model,
+        erc20=erc20,
+        authority=initiator,
+        nodes=nodes,
+        allow_logic=global_allow_list,
+    )
+    assert coordinator.hasTranscriptDigests(0)
+    transcript, aggregated, _ = post_transcripts_and_aggregations(coordinator, 0, nodes)
+    assert coordinator.getRitualState(0) == RitualState.ACTIVE
+
+    # Only digests are stored, full transcripts are rebuilt from calldata
+    for participant in coordinator.getParticipants(0):
+        assert participant.transcript == Web3.keccak(transcript)
+    assert coordinator.rituals(0).aggregatedTranscript == Web3.keccak(aggregated)
+    assert rebuild_transcripts(coordinator, 0) == {node.address: transcript for node in nodes}
+    assert rebuild_aggregated_transcripts(coordinator, 0) == {
+        node.address: aggregated for node in nodes
+    }
+
+    # Mode applies to new rituals only
+    coordinator.setStoreTranscriptDigests(False, sender=deployer)
+    assert coordinator.hasTranscriptDigests(0)
+
+
+@pytest.mark.parametrize("dkg_size", [2, 4, 8, 16, MAX_DKG_SIZE])
+def test_transcript_digests_gas(
+    coordinator, nodes, initiator, erc20, fee_model, deployer, global_allow_list, dkg_size
+):
+    nodes = nodes[:dkg_size]
+    initiate_ritual(
+        coordinator=coordinator,
+        fee_model=fee_model,
+        erc20=erc20,
+        authority=initiator,
+        nodes=nodes,
+        allow_logic=global_allow_list,
+    )
+    _, _, full_gas = post_transcripts_and_aggregations(coordinator, 0, nodes)
+
+    coordinator.setStoreTranscriptDigests(True, sender=deployer)
+    erc20.approve(fee_model.address, fee_model.getRitualCost(dkg_size, DURATION), sender=initiator)
+    coordinator.initiateRitual(
+        fee_model, nodes, initiator, DURATION, global_allow_list.address, sender=initiator
+    )
+    _, _, digest_gas = post_transcripts_and_aggregations(coordinator, 1, nodes)
+
+    assert coordinator.getRitualState(0) == coordinator.getRitualState(1) == RitualState.ACTIVE
+    assert digest_gas < full_gas
+
+
+def test_rituals_for_provider(
+    coordinator, nodes, initiator, erc20, fee_model, deployer, global_allow_list
+):
+    initiate_ritual(
+        coordinator=coordinator,
+        fee_model=fee_model,
+        erc20=erc20,
+        authority=initiator,
+        nodes=nodes,
+        allow_logic=global_allow_list,
+    )
+    for providers in (nodes[:2], nodes[1:3], nodes[:3]):
+        cost = fee_model.getRitualCost(len(providers), DURATION)
+        erc20.approve(fee_model.address, cost, sender=initiator)
+        coordinator.initiateRitual(
+            fee_model, providers, initiator, DURATION, global_allow_list.address, sender=initiator
+        )
+
+    assert coordinator.firstIndexedRitualId() == 0
+    assert coordinator.numberOfRitualsForProvider(nodes[0]) == 3
+    assert coordinator.getRitualsForProvider(nodes[0], 0, 0) == [0, 1, 3]
+    assert coordinator.getRitualsForProvider(nodes[1], 0, 0) == [0, 1, 2, 3]
+    assert coordinator.getRitualsForProvider(nodes[1], 1, 2) == [1, 2]
+    assert coordinator.getRitualsForProvider(nodes[1], 3, 10) == [3]
+    assert coordinator.getRitualsForProvider(nodes[1], 4, 10) == []
+    assert coordinator.getRitualsForProvider(nodes[3], 0, 0) == [0]
+    assert coordinator.getRitualsForProvider(initiator, 0, 0) == []
+    assert coordinator.numberOfRitualsForProvider(initiator) == 0
+
+    # Rituals that exist when the index is introduced by an upgrade are not indexed
+    with ape.reverts(coordinator.AccessControlUnauthorizedAccount):
+        coordinator.initializeRitualIndex(sender=initiator)
+    coordinator.initializeRitualIndex(sender=deployer)
+    assert coordinator.firstIndexedRitualId() == 4
+
+    # rituals initiated before initializeRitualIndex are also in the index,
+    # they are scanned but not reported twice
+    cost = fee_model.getRitualCost(2, DURATION)
+    erc20.approve(fee_model.address, cost, sender=initiator)
+    coordinator.initiateRitual(
+        fee_model, nodes[1:3], initiator, DURATION, global_allow_list.address, sender=initiator
+    )
+    assert coordinator.getRitualsForProvider(nodes[1], 0, 0) == [0, 1, 2, 3, 4]
+    assert provider_rituals(coordinator, nodes[1].address, active_only=False) == [0, 1, 2, 3, 4]
+    assert provider_rituals(coordinator, nodes[0].address, active_only=False) == [0, 1, 3]
+    assert provider_rituals(coordinator, nodes[3].address, active_only=False, page_size=1) == [0]
+    assert provider_rituals(coordinator, initiator.address, active_only=False) == []
+    # none of the rituals has finished its DKG
+    assert provider_rituals(coordinator, nodes[1].address) == []
+
+
+def test_rituals_for_provider_gas(
+    coordinator, nodes, initiator, erc20, fee_model, global_allow_list
+):
+    for node in nodes:
+        coordinator.setProviderPublicKey(gen_public_key(), sender=node)
+
+    def initiation_gas(providers):
+        cost = fee_model.getRitualCost(len(providers), DURATION)
+        erc20.approve(fee_model.address, cost, sender=initiator)
+        tx = coordinator.initiateRitual(
+            fee_model, providers, initiator, DURATION, global_allow_list.address, sender=initiator
+        )
+        return tx.gas_used
+
+    # the first ritual also initializes counters of the coordinator and the fee model
+    initiation_gas(nodes[-2:])
+
+    # Both rituals write the same data, except that the first one starts the lists of rituals
+    # of its providers while the second one appends to them
+    first_gas = initiation_gas(nodes[:2])
+    next_gas = initiation_gas(nodes[:2])
+    list_creation_gas = (first_gas - next_gas) / 2
+    assert 0 < list_creation_gas < 45_000
+
+    per_participant_gas = (initiation_gas(nodes) - next_gas) / (len(nodes) - 2)
+    assert list_creation_gas < per_participant_gas
+
+
+def test_ritual_summaries(coordinator, nodes, initiator, erc20, fee_model, global_allow_list):
+    assert coordinator.getRitualSummaries(0, 0) == []
+
+    initiate_ritual(
+        coordinator=coordinator,
+        fee_model=fee_model,
+        erc20=erc20,
+        authority=initiator,
+        nodes=nodes,
+        allow_logic=global_allow_list,
+    )
+    post_transcripts_and_aggregations(coordinator, 0, nodes)
+    cost = fee_model.getRitualCost(2, DURATION)
+    erc20.approve(fee_model.address, cost, sender=initiator)
+    coordinator.initiateRitual(
+        fee_model, nodes[:2], initiator, DURATION, global_allow_list.address, sender=initiator
+    )
+
+    summaries = coordinator.getRitualSummaries(0, 0)
+    assert len(summaries) == 2
+    for ritual_id, summary in enumerate(summaries):
+        ritual = coordinator.rituals(ritual_id)
+        assert summary.state == coordinator.getRitualState(ritual_id)
+        assert summary.dkgSize == ritual.dkgSize
+        assert summary.threshold == ritual.threshold
+        assert summary.totalTranscripts == ritual.totalTranscripts
+        assert summary.totalAggregations == ritual.totalAggregations
+        assert summary.initTimestamp == ritual.initTimestamp
+        assert summary.endTimestamp == ritual.endTimestamp
+        assert summary.authority == ritual.authority
+        assert summary.accessController == ritual.accessController
+        assert summary.feeModel == ritual.feeModel
+    assert summaries[0].state == RitualState.ACTIVE
+    assert summaries[1].state == RitualState.DKG_AWAITING_TRANSCRIPTS
+
+    assert coordinator.getRitualSummaries(1, 10) == summaries[1:]
+    assert coordinator.getRitualSummaries(0, 1) == summaries[:1]
+    assert coordinator.getRitualSummaries(2, 1) == []
+
+    table = ritual_summaries(coordinator, page_size=1)
+    assert list(table.ritual_id) == [0, 1]
+    assert list(table.state) == ["ACTIVE", "DKG_AWAITING_TRANSCRIPTS"]
+    assert list(table.dkg_size) == [len(nodes), 2]
+    assert list(table.access_controller) == [global_allow_list.address] * 2
+
+
+def test_reimbursement_records(
+    project, coordinator, nodes, initiator, erc20, fee_model, deployer, global_allow_list
+):
+    static_gas, max_gas_price = 40_000, 10**12
+    pool = project.ReimbursementPool.deploy(static_gas, max_gas_price, sender=deployer)
+    pool.authorize(coordinator.address, sender=deployer)
+    deployer.transfer(pool.address, 10**20)
+    coordinator.setReimbursementPool(pool.address, sender=deployer)
+
+    start_block = ape.chain.blocks.head.number
+    initiate_ritual(
+        coordinator=coordinator,
+        fee_model=fee_model,
+        erc20=erc20,
+        authority=initiator,
+        nodes=nodes,
+        allow_logic=global_allow_list,
+    )
+    threshold = coordinator.getThresholdForRitualSize(len(nodes))
+    transcript = generate_transcript(len(nodes), threshold)
+    for node in nodes:
+        coordinator.postTranscript(0, transcript, sender=node)
+    # refunds of aggregations fail with an empty pool
+    tx = pool.withdrawAll(deployer, sender=deployer)
+    withdrawn = tx.events[0].withdrawnAmount
+    dkg_public_key = (os.urandom(32), os.urandom(16))
+    for node in nodes:
+        tx = coordinator.postAggregation(0, transcript, dkg_public_key, os.urandom(42), sender=node)
+        assert pool.SendingEtherFailed.from_receipt(tx)
+
+    records = reimbursement_records(coordinator, pool, start_block=start_block)
+    assert list(records.method.value_counts()) == [len(nodes)] * 2
+    assert set(records.dkg_size) == {len(nodes)}
+    assert set(records.node) == {node.address for node in nodes}
+    transcripts = records[records.method == "postTranscript"]
+    assert transcripts.refund.notna().all()
+    assert records[records.method == "postAggregation"].refund.isna().all()
+    for record in records.itertuples():
+        txn = ape.chain.provider.get_receipt(record.tx_hash).transaction
+        assert record.calldata_size == len(txn.data)
+
+    errors = reimbursement_errors(records, static_gas, max_gas_price)
+    assert list(errors.tx_hash) == list(transcripts.tx_hash)
+    assert (errors.metered_gas > 0).all()
+    assert (errors.metered_gas < errors.gas_used).all()
+    assert pool.balance == 0
+    assert withdrawn == 10**20 - burn_rate(errors).total_refunded
+
+    proposed = propose_static_gas(errors)
+    tuned = reimbursement_errors(records, static_gas, max_gas_price, proposed_static_gas=proposed)
+    assert abs(tuned.gas_error.median()) <= 1
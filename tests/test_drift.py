@@ -0,0 +1,122 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pyarrow as pa
+import pytest
+from ape.utils import ZERO_ADDRESS
+
+from deployment.constants import MAX_BATCH_SYNC_SIZE
+from deployment.drift import (
+    ROOT_UPDATE_EVENTS,
+    add_staleness,
+    detect_drift,
+    last_root_updates,
+    sync_batches,
+)
+from deployment.roster import _schema
+
+PROVIDERS = ["0x" + f"{i:040x}" for i in range(1, 5)]
+OPERATORS = ["0x" + f"{i:040X}" for i in range(101, 105)]
+
+
+def make_snapshot(block_number, root, operators, authorized, end_deauthorization):
+    metadata = dict(application="0x" + "00" * 20, chain_id="1", block_number=str(block_number))
+    size = len(operators)
+    columns = dict(
+        index=list(range(size)),
+        staking_provider=PROVIDERS[:size],
+        operator=operators,
+        operator_confirmed=[True] * size,
+        active=[True] * size,
+        authorized=[Decimal(a) for a in authorized],
+        deauthorizing=[Decimal(0)] * size,
+        end_deauthorization=end_deauthorization,
+    )
+    if root:
+        columns.update(penalty_percent=[0] * size, end_penalty=[0] * size)
+    return pa.table(columns, schema=_schema(root=root, metadata=metadata))
+
+
+def test_detect_drift():
+    root = make_snapshot(10, True, OPERATORS, [10, 20, 30, 40], [0, 0, 500, 0])
+    # same operators with a different case are not considered drifted
+    child_operators = [OPERATORS[0].lower(), ZERO_ADDRESS, OPERATORS[2]]
+    child = make_snapshot(20, False, child_operators, [10, 20, 30], [0, 0, 400])
+
+    drift = detect_drift(root, child)
+    assert list(drift.staking_provider) == PROVIDERS[1:]
+    assert list(drift.drifted_columns) == [
+        "operator",
+        "end_deauthorization",
+        # never synchronized to the child
+        "operator,authorized",
+    ]
+    assert list(drift.authorized_child) == [20, 30, 0]
+    assert set(drift.root_block) == {10}
+    assert set(drift.child_block) == {20}
+
+    assert detect_drift(root, root).empty
+
+    last_updates = {PROVIDERS[1]: 900, PROVIDERS[2]: None, PROVIDERS[3]: 990}
+    drift = add_staleness(drift, last_updates, reference_timestamp=1000)
+    assert list(drift.staleness.fillna(-1)) == [100, -1, 10]
+
+
+def test_sync_batches():
+    providers = ["0x" + f"{i:040x}" for i in range(2 * MAX_BATCH_SYNC_SIZE + 3)]
+    batches = list(sync_batches(providers))
+    assert [len(b) for b in batches] == [MAX_BATCH_SYNC_SIZE, MAX_BATCH_SYNC_SIZE, 3]
+    assert sum(batches, []) == providers
+    assert list(sync_batches(providers[:5], batch_size=2)) == [
+        providers[:2],
+        providers[2:4],
+        providers[4:5],
+    ]
+    assert list(sync_batches([])) == []
+    for batch_size in (0, MAX_BATCH_SYNC_SIZE + 1):
+        with pytest.raises(ValueError):
+            list(sync_batches(providers, batch_size=batch_size))
+
+
+class FakeEvent:
+    def __init__(self, logs):
+        self.logs = logs
+        self.queries = list()
+
+    def range(self, start_block, stop_block, **kwargs):
+        self.queries.append((start_block, stop_block, kwargs))
+        return [log for log in self.logs if start_block <= log.block_number < stop_block]
+
+
+def update_log(staking_provider, block_number, log_index=0):
+    return SimpleNamespace(
+        stakingProvider=staking_provider,
+        block_number=block_number,
+        log_index=log_index,
+        timestamp=1000 + 10 * block_number + log_index,
+    )
+
+
+def test_last_root_updates():
+    events = {name: FakeEvent([]) for name in ROOT_UPDATE_EVENTS}
+    events["AuthorizationIncreased"].logs = [
+        update_log(PROVIDERS[0], 5),
+        update_log(PROVIDERS[1], 7, log_index=1),
+        update_log(PROVIDERS[2], 50),  # out of range
+    ]
+    events["OperatorBonded"].logs = [
+        update_log(PROVIDERS[0].upper().replace("0X", "0x"), 6),
+        update_log(PROVIDERS[1], 7, log_index=0),
+    ]
+    root_application = SimpleNamespace(**events)
+
+    updates = last_root_updates(root_application, PROVIDERS, start_block=0, stop_block=10)
+    assert updates == {
+        PROVIDERS[0]: 1060,
+        PROVIDERS[1]: 1071,
+        PROVIDERS[2]: None,
+        PROVIDERS[3]: None,
+    }
+    # one query per event for the whole range, whatever the number of providers
+    for event in events.values():
+        assert event.queries == [(0, 10, {})]
@@ -0,0 +1,59 @@
+import io
+
+import pytest
+from eth_utils import to_checksum_address
+
+from deployment.encryptors import (
+    AuthorizationCheckpoint,
+    checksum_addresses,
+    chunk_addresses,
+    load_addresses,
+    stream_addresses,
+)
+
+ADDRESSES = [to_checksum_address(i.to_bytes(20, "big")) for i in range(1, 11)]
+# an address with trailing zero bytes must survive the round trip
+ADDRESSES.append(to_checksum_address(b"\x01" + bytes(19)))
+
+
+def test_load_addresses(tmp_path):
+    lines = ["# encryptors", *ADDRESSES, "", ADDRESSES[3].lower(), *ADDRESSES[:5]]
+    filepath = tmp_path / "encryptors.txt"
+    filepath.write_text("\n".join(lines))
+
+    blocks = list(stream_addresses(io.StringIO("\n".join(lines)), block_size=4))
+    assert [len(b) for b in blocks] == [4, 4, 4, 4, 1]
+
+    addresses = load_addresses(filepath, block_size=4)
+    assert checksum_addresses(addresses) == ADDRESSES
+
+    empty = tmp_path / "empty.txt"
+    empty.write_text("# no encryptors\n")
+    assert len(load_addresses(empty)) == 0
+
+    chunks = chunk_addresses(addresses, chunk_size=5)
+    assert [len(c) for c in chunks] == [5, 5, 1]
+    assert sum((checksum_addresses(c) for c in chunks), []) == ADDRESSES
+
+    with pytest.raises(ValueError, match="line 2"):
+        list(stream_addresses(io.StringIO(f"{ADDRESSES[0]}\n0x1234\n")))
+
+
+def test_checkpoint(tmp_path):
+    filepath = tmp_path / "encryptors.txt.progress"
+    checkpoint = AuthorizationCheckpoint.load(filepath, 1, ADDRESSES[0])
+    assert checkpoint.pending == [] and checkpoint.authorized == 0
+
+    checkpoint.sent("0xaa", nonce=7, size=100)
+    checkpoint.sent("0xbb", nonce=8, size=50)
+    checkpoint.confirmed("0xaa")
+
+    checkpoint = AuthorizationCheckpoint.load(filepath, 1, ADDRESSES[0])
+    assert checkpoint.pending == [dict(txn_hash="0xbb", nonce=8, size=50)]
+    assert checkpoint.authorized == 100
+
+    checkpoint.dropped("0xbb")
+    assert AuthorizationCheckpoint.load(filepath, 1, ADDRESSES[0]).pending == []
+
+    with pytest.raises(ValueError, match="belongs to ritual 1"):
+        AuthorizationCheckpoint.load(filepath, 2, ADDRESSES[0])
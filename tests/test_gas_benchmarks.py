@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from deployment.gas_benchmarks import (
+    RUN_BENCHMARKS_ENV,
+    UPDATE_BASELINE_ENV,
+    GasBaseline,
+    benchmarks_requested,
+    gas_matrix,
+    markdown_table,
+)
+
+
+def test_gas_baseline(tmp_path, monkeypatch):
+    monkeypatch.delenv(UPDATE_BASELINE_ENV, raising=False)
+    filepath = tmp_path / "baseline.json"
+    baseline = GasBaseline.load(filepath)
+    assert baseline.metrics == {}
+
+    # metrics missing from the baseline fail, but are recorded
+    with pytest.raises(AssertionError, match="a is missing from baseline baseline.json"):
+        baseline.check("a", 1000)
+    assert baseline.missing == ["a"]
+    baseline.save()
+    assert json.loads(filepath.read_text()) == {"threshold": 0.02, "metrics": {"a": 1000}}
+
+    baseline = GasBaseline.load(filepath)
+    baseline.check("a", 1020)
+    baseline.check("a", 900)
+    assert baseline.regressions == []
+    assert "+3.00%" in baseline.record("a", 1030)
+    assert baseline.regressions == [baseline.compare("a", 1030)]
+    with pytest.raises(AssertionError, match="a regressed"):
+        baseline.check("a", 1100)
+
+    # regressions don't fail while the baseline is being updated
+    monkeypatch.setenv(UPDATE_BASELINE_ENV, "1")
+    baseline = GasBaseline.load(filepath)
+    baseline.check("a", 1100)
+    baseline.check("b", 10)
+    baseline.save()
+    assert GasBaseline.load(filepath).metrics == {"a": 1100, "b": 10}
+
+
+def test_benchmarks_requested(monkeypatch):
+    monkeypatch.delenv(UPDATE_BASELINE_ENV, raising=False)
+    monkeypatch.delenv(RUN_BENCHMARKS_ENV, raising=False)
+    assert not benchmarks_requested()
+    monkeypatch.setenv(RUN_BENCHMARKS_ENV, "1")
+    assert benchmarks_requested()
+    monkeypatch.setenv(RUN_BENCHMARKS_ENV, "0")
+    monkeypatch.setenv(UPDATE_BASELINE_ENV, "true")
+    assert benchmarks_requested()
+
+
+def test_gas_matrix_report(tmp_path, monkeypatch):
+    monkeypatch.delenv(UPDATE_BASELINE_ENV, raising=False)
+    baseline = GasBaseline(tmp_path / "test_module.json", metrics={"a[n=1]": 100, "b": 7})
+    for name, value in {"a[n=1]": 110, "a[n=10]": 1000, "b": 7}.items():
+        baseline.record(name, value)
+
+    assert gas_matrix(baseline.measurements) == {"a": {"n=1": 110, "n=10": 1000}, "b": {"": 7}}
+    assert markdown_table(baseline.measurements, baseline.metrics).splitlines() == [
+        "| metric | n=1 | n=10 | - |",
+        "|---|---|---|---|",
+        "| a | 110 (+10.00%) | 1000 |  |",
+        "| b |  |  | 7 |",
+    ]
+
+    baseline.write_report(tmp_path / "report")
+    assert json.loads((tmp_path / "report" / "test_module.json").read_text())["a"]["n=10"] == 1000
+    assert "| a | 110 (+10.00%)" in (tmp_path / "report" / "test_module.md").read_text()
+
+
+def test_benchmark_modules_have_baselines():
+    benchmarks_dir = Path(__file__).parent / "benchmarks"
+    modules = sorted(p.stem for p in benchmarks_dir.glob("test_*.py"))
+    assert {"test_dkg_gas", "test_managed_allow_list_gas", "test_subscription_gas"} <= set(modules)
+    for module in modules:
+        baseline = GasBaseline.load(benchmarks_dir / "baselines" / f"{module}.json")
+        assert baseline.filepath.exists(), f"{module} has no baseline"
+        assert baseline.metrics, f"{module} has an empty baseline"
+        assert 0 < baseline.threshold < 1
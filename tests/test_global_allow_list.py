@@ -2,10 +2,16 @@ import os
 from enum import IntEnum
 
 import ape
+import numpy as np
 import pytest
+from ape_ethereum import multicall
 from eth_account.messages import encode_defunct
+from eth_utils import to_canonical_address
 from web3 import Web3
 
+from deployment.authorization_index import AuthorizationIndex
+from deployment.authorization_verifier import SECP256K1_N, AuthorizationVerifier
+from deployment.encryptors import ADDRESS_DTYPE, fetch_authorized
 from tests.conftest import gen_public_key, generate_transcript
 
 TIMEOUT = 1000
@@ -200,3 +206,82 @@ def test_authorize_using_global_allow_list(
             ritualId=0, _address=initiator.address, isAuthorized=True
         ),
     ]
+
+    # The local index replays the same events
+    index = AuthorizationIndex(global_allow_list.address, chain_id=ape.chain.chain_id)
+    index.update(global_allow_list)
+    assert index.cursor == ape.chain.blocks.head.number
+    unauthorized = "0x" + "ff" * 20
+    authorized = index.is_authorized(0, [deployer.address, initiator.address, unauthorized])
+    assert list(authorized) == [True, True, False]
+    assert index.auth_actions(0) == global_allow_list.authActions(0)
+
+    # events before the start block are skipped
+    index = AuthorizationIndex(
+        global_allow_list.address, chain_id=ape.chain.chain_id, start_block=tx.block_number
+    )
+    index.update(global_allow_list)
+    assert index.cursor == ape.chain.blocks.head.number
+    assert list(index.is_authorized(0, [deployer.address, initiator.address])) == [True, True]
+    assert index.auth_actions(0) == 2
+
+    # Batched on-chain checks, with and without Multicall3
+    queries = [deployer.address, unauthorized, initiator.address, *nodes[:3]]
+    addresses = np.frombuffer(
+        b"".join(to_canonical_address(a) for a in queries), dtype=ADDRESS_DTYPE
+    )
+    expected = [True, False, True, False, False, False]
+    assert list(fetch_authorized(global_allow_list, 0, addresses, page_size=4)) == expected
+    multicall.BaseMulticall.inject()
+    assert list(fetch_authorized(global_allow_list, 0, addresses, page_size=4)) == expected
+
+
+def test_authorization_verifier_parity(
+    coordinator, nodes, deployer, initiator, erc20, fee_model, global_allow_list
+):
+    initiate_ritual(
+        coordinator=coordinator,
+        fee_model=fee_model,
+        erc20=erc20,
+        authority=initiator,
+        nodes=nodes,
+        allow_logic=global_allow_list,
+    )
+    size = len(nodes)
+    threshold = coordinator.getThresholdForRitualSize(size)
+    transcript = generate_transcript(size, threshold)
+    for node in nodes:
+        coordinator.postTranscript(0, transcript, sender=node)
+    for node in nodes:
+        coordinator.postAggregation(
+            0, transcript, (os.urandom(32), os.urandom(16)), os.urandom(42), sender=node
+        )
+
+    signers = [deployer, initiator, *nodes[:4]]
+    global_allow_list.authorize(0, [s.address for s in signers[:3]], sender=initiator)
+    global_allow_list.deauthorize(0, [signers[1].address], sender=initiator)
+
+    w3 = Web3()
+    requests = []
+    for signer in signers:
+        header = os.urandom(100)
+        message = encode_defunct(Web3.keccak(header))
+        signature = w3.eth.account.sign_message(message, private_key=signer.private_key).signature
+        requests.append((0, bytes(signature), header))
+    # malleable and truncated signatures make ECDSA.recover revert
+    _, signature, header = requests[0]
+    s = SECP256K1_N - int.from_bytes(signature[32:64], "big")
+    requests.append(
+        (0, signature[:32] + s.to_bytes(32, "big") + bytes([55 - signature[64]]), header)
+    )
+    requests.append((0, signature[:64], header))
+
+    index = AuthorizationIndex(global_allow_list.address, chain_id=ape.chain.chain_id)
+    index.update(global_allow_list)
+    verified = AuthorizationVerifier(index).verify(requests)
+    assert list(verified) == [True, False, True, False, False, False, False, False]
+    for (ritual_id, evidence, header), authorized in zip(requests[:-2], verified):
+        assert global_allow_list.isAuthorized(ritual_id, evidence, header) == authorized
+    for ritual_id, evidence, header in requests[-2:]:
+        with ape.reverts():
+            global_allow_list.isAuthorized(ritual_id, evidence, header)
@@ -1,5 +1,8 @@
+import os
+
 import ape
 import pytest
+from eth_utils import to_checksum_address
 
 RITUAL_ID = 0
 ADMIN_CAP = 5
@@ -52,6 +55,13 @@ def subscription(project, coordinator, fee_token, beneficiary, authority):
     )
 
 
+@pytest.fixture()
+def capped_subscription(project, coordinator, fee_token, beneficiary, authority):
+    return project.UpfrontSubscriptionWithEncryptorsCapMock.deploy(
+        coordinator.address, fee_token.address, beneficiary, sender=authority
+    )
+
+
 @pytest.fixture()
 def fee_model(project, deployer, coordinator, fee_token):
     contract = project.FlatRateFeeModel.deploy(
@@ -158,3 +168,61 @@ def test_deauthorize(
     tx = managed_allow_list.deauthorize(RITUAL_ID, [encryptor], sender=admin)
     assert tx.events == [managed_allow_list.AddressAuthorizationSet(RITUAL_ID, encryptor, False)]
     assert not managed_allow_list.isAddressAuthorized(RITUAL_ID, encryptor)
+
+
+def test_min_authorization_actions_cap(capped_subscription, deployer, accounts):
+    spenders = [a.address for a in accounts[5:10]]
+    assert capped_subscription.minAuthorizationActionsCap(RITUAL_ID, []) == 2**256 - 1
+    assert capped_subscription.minAuthorizationActionsCap(RITUAL_ID, spenders) == 0
+
+    capped_subscription.setSubscription(RITUAL_ID, spenders, 1, 10, sender=deployer)
+    capped_subscription.setSubscription(RITUAL_ID, spenders[2:3], 2, 3, sender=deployer)
+    assert capped_subscription.authorizationActionsCap(RITUAL_ID, spenders[2]) == 3
+    assert capped_subscription.minAuthorizationActionsCap(RITUAL_ID, spenders) == 3
+    assert capped_subscription.minAuthorizationActionsCap(RITUAL_ID, spenders[3:]) == 10
+    assert capped_subscription.minAuthorizationActionsCap(RITUAL_ID + 1, spenders) == 0
+
+
+def test_authorization_cap(
+    project, coordinator, capped_subscription, fee_model, deployer, authority, admin
+):
+    coordinator.mockNewRitual(authority, sender=deployer)
+    coordinator.setFeeModel(RITUAL_ID, fee_model.address, sender=deployer)
+    managed_allow_list = project.ManagedAllowList.deploy(
+        coordinator.address, capped_subscription.address, sender=authority
+    )
+    managed_allow_list.addAdministrators(RITUAL_ID, [admin], ADMIN_CAP, sender=authority)
+
+    encryptors = [to_checksum_address(os.urandom(20)) for _ in range(3)]
+    capped_subscription.setSubscription(RITUAL_ID, encryptors[:2], 1, 10, sender=deployer)
+    capped_subscription.setSubscription(RITUAL_ID, encryptors[2:], 2, 3, sender=deployer)
+
+    managed_allow_list.authorize(RITUAL_ID, encryptors[:2], sender=admin)
+    assert managed_allow_list.authActions(RITUAL_ID) == 3
+    # one capped address in the batch is enough to exceed the cap
+    with ape.reverts("Authorization cap exceeded"):
+        managed_allow_list.authorize(RITUAL_ID, encryptors[1:], sender=admin)
+
+
+@pytest.mark.parametrize("batch_size", [10, 50, 100])
+def test_authorize_gas(
+    project, coordinator, capped_subscription, fee_model, deployer, authority, admin, batch_size
+):
+    gas_used = dict()
+    for contract_type in (project.ManagedAllowListPerAddressCapMock, project.ManagedAllowList):
+        ritual_id = coordinator.numberOfRituals()
+        coordinator.mockNewRitual(authority, sender=deployer)
+        coordinator.setFeeModel(ritual_id, fee_model.address, sender=deployer)
+        managed_allow_list = contract_type.deploy(
+            coordinator.address, capped_subscription.address, sender=authority
+        )
+        managed_allow_list.addAdministrators(ritual_id, [admin], ADMIN_CAP, sender=authority)
+
+        encryptors = [to_checksum_address(os.urandom(20)) for _ in range(batch_size)]
+        capped_subscription.setSubscription(ritual_id, encryptors, 1, 1000, sender=deployer)
+        tx = managed_allow_list.authorize(ritual_id, encryptors, sender=admin)
+        assert managed_allow_list.authActions(ritual_id) == 1 + batch_size
+        gas_used[contract_type.name] = tx.gas_used
+
+    # a single cap query per batch instead of one per address
+    assert gas_used["ManagedAllowList"] < gas_used["ManagedAllowListPerAddressCapMock"]
@@ -0,0 +1,139 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from deployment.porter import PorterClient, PorterError
+
+URSULAS = [
+    "0x05Be6D76d2282D24691E28E3Dc1c1A9709d70fa1",
+    "0xd274f0060256c186479f2b9f51615003cbcd19E6",
+    "0xA7165c0229544c84b417e53a1D3ab717EA4b4587",
+]
+
+
+class StandInPorter(ThreadingHTTPServer):
+    """Local stand-in for Porter's sampling endpoints."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _PorterHandler)
+        self.requests = 0
+        self.failures = 0  # number of upcoming requests answered with 503
+        self.delay = 0.0
+
+    def handle_error(self, request, client_address):
+        pass  # clients timing out on purpose close the connection early
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        return f"http://{host}:{port}"
+
+
+class _PorterHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        if server.delay:
+            time.sleep(server.delay)
+        if server.failures > 0:
+            server.failures -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        parsed = urlparse(self.path)
+        quantity = int(parse_qs(parsed.query)["quantity"][0])
+        if parsed.path == "/bucket_sampling":
+            ursulas = URSULAS[:quantity]
+        elif parsed.path == "/get_ursulas":
+            ursulas = [{"checksum_address": u} for u in URSULAS[:quantity]]
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        body = json.dumps({"result": {"ursulas": ursulas}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def porter():
+    server = StandInPorter()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_sampling(porter):
+    with PorterClient() as client:
+        data = client.get(f"{porter.url}/bucket_sampling", params={"quantity": 2})
+        assert data["result"]["ursulas"] == URSULAS[:2]
+
+        data = client.get(f"{porter.url}/get_ursulas", params={"quantity": 3})
+        ursulas = [u["checksum_address"] for u in data["result"]["ursulas"]]
+        assert ursulas == URSULAS
+
+        metrics = client.metrics
+        assert metrics.count == 2
+        assert metrics.errors == 0
+        assert 0 < metrics.minimum <= metrics.mean <= metrics.maximum
+
+
+def test_cache(porter):
+    url = f"{porter.url}/bucket_sampling"
+    with PorterClient(cache_ttl=60) as client:
+        first = client.get(url, params={"quantity": 2})
+        assert client.get(url, params={"quantity": 2}) == first
+        assert porter.requests == 1
+        assert client.metrics.cache_hits == 1
+
+        # different query is not served from the cache
+        client.get(url, params={"quantity": 3})
+        assert porter.requests == 2
+
+        client.clear_cache()
+        client.get(url, params={"quantity": 2})
+        assert porter.requests == 3
+
+    with PorterClient(cache_ttl=0) as client:
+        client.get(url, params={"quantity": 2})
+        client.get(url, params={"quantity": 2})
+        assert porter.requests == 5
+
+
+def test_retries(porter):
+    url = f"{porter.url}/bucket_sampling"
+    porter.failures = 2
+    with PorterClient(retries=2, backoff_factor=0) as client:
+        data = client.get(url, params={"quantity": 1})
+        assert data["result"]["ursulas"] == URSULAS[:1]
+        assert porter.requests == 3
+
+    porter.failures = 3
+    with PorterClient(retries=2, backoff_factor=0) as client:
+        with pytest.raises(PorterError):
+            client.get(url, params={"quantity": 1})
+        assert client.metrics.errors == 1
+
+
+def test_timeout(porter):
+    porter.delay = 0.5
+    with PorterClient(timeout=0.1, retries=0) as client:
+        with pytest.raises(PorterError):
+            client.get(f"{porter.url}/bucket_sampling", params={"quantity": 1})
+        assert client.metrics.errors == 1
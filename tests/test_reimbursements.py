@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from deployment.reimbursements import (
+    RECORD_COLUMNS,
+    burn_rate,
+    calldata_gas,
+    error_distribution,
+    estimated_calldata_gas,
+    load_reimbursement_records,
+    payload_size_distribution,
+    propose_static_gas,
+    refund_amount,
+    reimbursement_errors,
+)
+
+STATIC_GAS = 40_000
+MAX_GAS_PRICE = 50 * 10**9
+UNMETERED_GAS = 30_000
+
+
+def synthetic_records(size=200, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = list()
+    for i in range(size):
+        dkg_size = int(rng.choice([4, 16, 30]))
+        calldata_size = 200 + dkg_size * 3000 + int(rng.integers(0, 100))
+        metered_gas = 100_000 + calldata_size * 20
+        gas_used = metered_gas + UNMETERED_GAS + int(rng.integers(-500, 500))
+        gas_price = int(rng.integers(10, 80)) * 10**9
+        rows.append(
+            dict(
+                tx_hash=f"0x{i:064x}",
+                block_number=i,
+                timestamp=1_700_000_000 + 3600 * i,
+                method="postTranscript" if i % 2 else "postAggregation",
+                ritual_id=i // 10,
+                dkg_size=dkg_size,
+                node=f"0x{i:040x}",
+                calldata_size=calldata_size,
+                calldata_gas=estimated_calldata_gas(calldata_size),
+                gas_used=gas_used,
+                gas_price=gas_price,
+                refund=refund_amount(metered_gas, STATIC_GAS, gas_price, MAX_GAS_PRICE),
+            )
+        )
+    return pd.DataFrame.from_records(rows, columns=list(RECORD_COLUMNS))
+
+
+def test_calldata_gas():
+    assert calldata_gas(b"\x00\x01" * 100) == 100 * 4 + 100 * 16
+    assert estimated_calldata_gas(128) == 128 * 4
+    assert estimated_calldata_gas(1128) == 1000 * 16 + 128 * 4
+    assert refund_amount(100, 10, gas_price=3, max_gas_price=2) == 220
+
+
+def test_reimbursement_errors(tmp_path):
+    records = synthetic_records()
+    records["refund"] = records["refund"].astype(object)
+    records.loc[0, "refund"] = None
+    # failed refunds or balance increases are not valid refunds
+    records.loc[1, "refund"] = 0
+    records.loc[2, "refund"] = -(10**15)
+    filepath = tmp_path / "records.csv"
+    records.to_csv(filepath, index=False)
+    loaded = load_reimbursement_records(filepath)
+    assert list(loaded.refund[1:]) == list(records.refund[1:])
+    records = loaded
+
+    errors = reimbursement_errors(records, STATIC_GAS, MAX_GAS_PRICE)
+    assert len(errors) == len(records) - 3
+    # refunds are over by static gas - unmetered gas, in gas and in wei below the price cap
+    expected_error = STATIC_GAS - UNMETERED_GAS
+    assert errors.gas_error.between(expected_error - 500, expected_error + 500).all()
+    uncapped = errors[errors.gas_price <= MAX_GAS_PRICE]
+    assert (uncapped.refund_error == uncapped.gas_error * uncapped.gas_price).all()
+    capped = errors[errors.gas_price > MAX_GAS_PRICE]
+    assert (capped.refund_error < capped.gas_error * capped.gas_price).all()
+
+    distribution = error_distribution(errors)
+    assert set(distribution.index.get_level_values("dkg_size")) == {4, 16, 30}
+    assert distribution["count"].sum() == len(errors)
+    by_payload = payload_size_distribution(errors)
+    assert by_payload["count"].sum() == len(errors)
+
+    rate = burn_rate(errors)
+    assert rate.total_refunded == sum(errors.refund)
+    assert rate.rituals == 20
+    assert rate.seconds == 3600 * (len(records) - 4)
+    assert rate.days_left(0) == 0
+
+    with pytest.raises(ValueError, match="Missing columns"):
+        records.drop(columns="refund").to_csv(filepath, index=False)
+        load_reimbursement_records(filepath)
+
+
+def test_propose_static_gas():
+    records = synthetic_records()
+    errors = reimbursement_errors(records, STATIC_GAS, MAX_GAS_PRICE)
+    proposed = propose_static_gas(errors)
+    assert abs(proposed - UNMETERED_GAS) < 100
+    assert propose_static_gas(errors, quantile=1) >= UNMETERED_GAS + 400
+
+    tuned = reimbursement_errors(records, STATIC_GAS, MAX_GAS_PRICE, proposed_static_gas=proposed)
+    assert abs(tuned.gas_error.median()) <= 1
+    assert burn_rate(tuned).total_refunded < burn_rate(errors).total_refunded
+
+    with pytest.raises(ValueError):
+        propose_static_gas(errors, quantile=2)
+    with pytest.raises(ValueError):
+        propose_static_gas(errors.iloc[:0])
@@ -0,0 +1,144 @@
+import os
+from decimal import Decimal
+
+import pyarrow as pa
+import pytest
+from ape_ethereum import multicall
+from eth_utils import to_checksum_address
+from web3 import Web3
+
+from deployment.roster import (
+    _schema,
+    diff_snapshots,
+    latest_snapshot,
+    read_snapshot,
+    snapshot_metadata,
+    take_snapshot,
+    write_snapshot,
+)
+
+APPLICATION = "0x" + "AB" * 20
+PROVIDERS = ["0x" + f"{i:040x}" for i in range(1, 5)]
+
+MIN_AUTHORIZATION = Web3.to_wei(40_000, "ether")
+
+
+@pytest.fixture()
+def root_application(project, creator):
+    contract = project.RootApplicationForTACoChildApplicationMock.deploy(sender=creator)
+    return contract
+
+
+@pytest.fixture()
+def child_application(project, creator, root_application, oz_dependency):
+    contract = project.TACoChildApplication.deploy(
+        root_application.address, MIN_AUTHORIZATION, sender=creator
+    )
+
+    proxy = oz_dependency.TransparentUpgradeableProxy.deploy(
+        contract.address,
+        creator,
+        b"",
+        sender=creator,
+    )
+    proxy_contract = project.TACoChildApplication.at(proxy.address)
+    root_application.setChildApplication(proxy_contract.address, sender=creator)
+
+    return proxy_contract
+
+
+@pytest.fixture()
+def coordinator(project, child_application, creator):
+    contract = project.CoordinatorForTACoChildApplicationMock.deploy(
+        child_application, sender=creator
+    )
+    child_application.initialize(contract.address, creator, sender=creator)
+    return contract
+
+
+def make_snapshot(block_number, providers, authorized):
+    metadata = dict(application=APPLICATION, chain_id="1", block_number=str(block_number))
+    size = len(providers)
+    columns = dict(
+        index=list(range(size)),
+        staking_provider=providers,
+        operator=providers,
+        operator_confirmed=[True] * size,
+        active=[True] * size,
+        authorized=[Decimal(a) for a in authorized],
+        deauthorizing=[Decimal(0)] * size,
+        end_deauthorization=[0] * size,
+        penalty_percent=[0] * size,
+        end_penalty=[0] * size,
+    )
+    return pa.table(columns, schema=_schema(root=True, metadata=metadata))
+
+
+def test_write_and_read(tmp_path):
+    snapshot = make_snapshot(100, PROVIDERS, [2**96 - 1] * len(PROVIDERS))
+    filepath = write_snapshot(snapshot, tmp_path)
+    assert snapshot_metadata(read_snapshot(filepath)) == dict(
+        application=APPLICATION, chain_id=1, block_number=100
+    )
+    assert read_snapshot(filepath).equals(snapshot)
+
+    write_snapshot(make_snapshot(99, PROVIDERS, [1] * len(PROVIDERS)), tmp_path)
+    assert latest_snapshot(tmp_path, APPLICATION, 1) == filepath
+    assert latest_snapshot(tmp_path, APPLICATION, 2) is None
+
+
+def test_diff():
+    old = make_snapshot(100, PROVIDERS[:3], [10, 20, 30])
+    new = make_snapshot(200, PROVIDERS, [10, 25, 30, 40])
+
+    diff = diff_snapshots(old, new)
+    assert list(diff.staking_provider) == [PROVIDERS[3], PROVIDERS[1]]
+    assert list(diff.change) == ["added", "changed"]
+    assert diff.changed_columns.iloc[1] == "authorized"
+
+    assert len(diff_snapshots(new, new)) == 0
+    diff = diff_snapshots(new, old)
+    assert list(diff.change) == ["changed", "removed"]
+
+
+@pytest.mark.parametrize("use_multicall", [False, True])
+def test_take_snapshot(root_application, child_application, coordinator, creator, use_multicall):
+    if use_multicall:
+        multicall.BaseMulticall.inject()
+
+    num_providers = 11
+    staking_providers = [to_checksum_address(os.urandom(20)) for _ in range(num_providers)]
+    operators = [to_checksum_address(os.urandom(20)) for _ in range(num_providers)]
+    updates = [
+        (staking_provider, operator, MIN_AUTHORIZATION * (1 + i % 3), 0, 0)
+        for i, (staking_provider, operator) in enumerate(zip(staking_providers, operators))
+    ]
+    root_application.batchUpdate(updates[:6], sender=creator)
+    for operator in operators[:6:2]:
+        coordinator.confirmOperatorAddress(operator, sender=creator)
+
+    previous = take_snapshot(child_application, page_size=4)
+    metadata = snapshot_metadata(previous)
+    assert metadata["application"] == child_application.address
+    assert previous.column("staking_provider").to_pylist() == staking_providers[:6]
+
+    root_application.batchUpdate(updates[6:], sender=creator)
+    for operator in operators[1::2]:
+        coordinator.confirmOperatorAddress(operator, sender=creator)
+
+    snapshot = take_snapshot(child_application, page_size=4)
+    assert snapshot_metadata(snapshot)["block_number"] > metadata["block_number"]
+    assert take_snapshot(child_application, previous=previous, page_size=4).equals(snapshot)
+
+    rows = snapshot.to_pylist()
+    assert [row["staking_provider"] for row in rows] == staking_providers
+    for i, row in enumerate(rows):
+        info = child_application.stakingProviderInfo(staking_providers[i])
+        assert row["index"] == i
+        assert row["operator"] == info.operator == operators[i]
+        assert row["operator_confirmed"] == info.operatorConfirmed
+        assert row["authorized"] == info.authorized
+        assert row["deauthorizing"] == info.deauthorizing == 0
+        assert row["active"] == info.operatorConfirmed
+    assert any(row["active"] for row in rows)
+    assert not all(row["active"] for row in rows)
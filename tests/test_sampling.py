@@ -0,0 +1,113 @@
+import os
+
+import numpy as np
+import pytest
+from eth_utils import to_checksum_address
+
+from deployment.sampling import StakeTree, StakeWeightedSampler, decode_active_staking_providers
+
+
+def pack_provider(address: bytes, amount: int) -> bytes:
+    return address + amount.to_bytes(12, "big")
+
+
+@pytest.fixture(scope="module")
+def packed_providers():
+    return [pack_provider(os.urandom(20), (i + 1) * 10**21) for i in range(100)]
+
+
+def test_decode(packed_providers):
+    addresses, stakes = decode_active_staking_providers(packed_providers)
+    assert addresses.shape == (100, 20)
+    for i, packed in enumerate(packed_providers):
+        assert addresses[i].tobytes() == packed[:20]
+        assert stakes[i] == float(int.from_bytes(packed[20:], "big"))
+
+    # uint96 amounts above 2**64
+    max_amount = 2**96 - 1
+    _, stakes = decode_active_staking_providers([pack_provider(b"\x00" * 20, max_amount)])
+    assert stakes[0] == float(max_amount)
+
+    addresses, stakes = decode_active_staking_providers([])
+    assert len(addresses) == len(stakes) == 0
+
+    with pytest.raises(ValueError):
+        decode_active_staking_providers([b"\x00" * 31])
+
+
+def test_sample(packed_providers):
+    sampler = StakeWeightedSampler(*decode_active_staking_providers(packed_providers))
+    addresses = {to_checksum_address(p[:20]) for p in packed_providers}
+
+    cohort = sampler.sample(quantity=30, seed=42)
+    assert len(set(cohort)) == 30
+    assert set(cohort) <= addresses
+    assert cohort == sorted(cohort, key=lambda x: x.lower())
+
+    # sampling is deterministic for a given seed
+    assert sampler.sample(quantity=30, seed=42) == cohort
+    assert sampler.sample(quantity=30, seed=43) != cohort
+
+    # whole population can be sampled
+    assert set(sampler.sample(quantity=100, seed=1)) == addresses
+    with pytest.raises(ValueError):
+        sampler.sample(quantity=101)
+
+
+def test_sample_is_stake_weighted(packed_providers):
+    addresses, _ = decode_active_staking_providers(packed_providers[:3])
+    sampler = StakeWeightedSampler(addresses, np.array([0.0, 1.0, 9.0]))
+
+    # providers without stake are never selected
+    with pytest.raises(ValueError):
+        sampler.sample_indices(quantity=3)
+
+    first_picks = np.array([sampler.sample_indices(quantity=1, seed=s)[0] for s in range(2000)])
+    assert set(first_picks) == {1, 2}
+    assert 0.85 < np.mean(first_picks == 2) < 0.95
+
+
+def test_stake_tree():
+    rng = np.random.default_rng(0)
+    stakes = np.zeros(300, dtype=object)
+    tree = StakeTree()
+    assert tree.total == 0
+
+    # slots are updated in random order, growing the tree
+    for slot in rng.integers(0, len(stakes), 2000):
+        stake = int(rng.integers(0, 2**20)) * 10**18 if rng.random() < 0.8 else 0
+        tree.update(int(slot), stake)
+        stakes[slot] = stake
+    assert max(np.flatnonzero(stakes)) < len(tree) <= len(stakes)
+    cumulative = np.cumsum(stakes[: len(tree)])
+    assert [tree.prefix_sum(n) for n in range(1, len(tree) + 1)] == list(cumulative)
+    assert StakeTree.from_stakes(stakes).total == tree.total == sum(stakes)
+
+    for position in rng.integers(0, tree.total // 10**18, 200):
+        position = int(position) * 10**18
+        assert tree.find(position) == np.searchsorted(cumulative, position, side="right")
+
+    # excluded slots don't own any stake
+    excluded = [(s, tree.stake(s)) for s in np.flatnonzero(stakes)[::3]]
+    remaining = [s for s in range(len(tree)) if s not in dict(excluded)]
+    remaining_cumulative = np.cumsum([tree.stake(s) for s in remaining])
+    for position in range(0, int(remaining_cumulative[-1]), int(remaining_cumulative[-1]) // 97):
+        expected = remaining[np.searchsorted(remaining_cumulative, position, side="right")]
+        assert tree.find_excluding(position, excluded) == expected
+
+
+def test_stake_tree_sample():
+    tree = StakeTree.from_stakes([0, 10, 0, 30, 50, 10, 0, 100])
+    seed = os.urandom(32)
+    cohort = tree.sample(seed, 5)
+    assert sorted(cohort) == [1, 3, 4, 5, 7]
+    assert tree.sample(seed, 5) == cohort
+
+    assert 7 not in tree.sample(seed, 3, is_eligible=lambda slot: slot != 7)
+    with pytest.raises(ValueError, match="Not enough staking providers"):
+        tree.sample(seed, 6)
+    with pytest.raises(ValueError, match="Too many ineligible"):
+        tree.sample(seed, 1, is_eligible=lambda slot: False, max_skipped=3)
+
+    first_picks = np.array([tree.sample(s.to_bytes(32, "big"), 1)[0] for s in range(2000)])
+    assert 0.45 < np.mean(first_picks == 7) < 0.55
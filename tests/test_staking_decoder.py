@@ -0,0 +1,86 @@
+import os
+import time
+
+import numpy as np
+import pytest
+from eth_utils import to_checksum_address
+
+from deployment.staking import (
+    addresses_as_bytes,
+    amounts_as_float,
+    amounts_as_int,
+    checksum_addresses,
+    decode_staking_providers,
+)
+
+MAX_UINT96 = 2**96 - 1
+
+
+def decode_per_element(words):
+    """The per-element decoding replaced by decode_staking_providers"""
+    addresses = [bytes(word[:20]) for word in words]
+    weights = [float(int.from_bytes(word[20:], "big")) for word in words]
+    return addresses, weights
+
+
+def best_time(function, *args, repeat=3):
+    timings = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def random_packed_providers(size):
+    addresses = np.frombuffer(os.urandom(20 * size), dtype=np.uint8).reshape(size, 20)
+    amounts = np.frombuffer(os.urandom(12 * size), dtype=np.uint8).reshape(size, 12)
+    return np.hstack([addresses, amounts]).tobytes()
+
+
+def test_decode():
+    words = [
+        os.urandom(20) + (0).to_bytes(12, "big"),
+        os.urandom(20) + (2**64).to_bytes(12, "big"),
+        b"\x00" * 20 + MAX_UINT96.to_bytes(12, "big"),
+    ]
+    decoded = decode_staking_providers(words)
+    assert len(decoded) == 3
+
+    assert list(amounts_as_int(decoded)) == [0, 2**64, MAX_UINT96]
+    assert list(amounts_as_float(decoded)) == [0.0, float(2**64), float(MAX_UINT96)]
+    assert checksum_addresses(decoded) == [to_checksum_address(w[:20]) for w in words]
+    assert checksum_addresses(decoded, indices=[2]) == [to_checksum_address(b"\x00" * 20)]
+    assert addresses_as_bytes(decoded)[1].tobytes() == words[1][:20]
+
+    assert len(decode_staking_providers([])) == 0
+    with pytest.raises(ValueError):
+        decode_staking_providers(b"\x00" * 33)
+
+
+def test_decode_is_zero_copy():
+    buffer = bytearray(random_packed_providers(10))
+    decoded = decode_staking_providers(buffer)
+    assert np.shares_memory(decoded, np.frombuffer(buffer, dtype=np.uint8))
+    assert np.shares_memory(addresses_as_bytes(decoded), decoded)
+
+
+@pytest.mark.parametrize("size", [10_000, 100_000])
+def test_decode_benchmark(size):
+    packed = random_packed_providers(size)
+    words = [packed[i : i + 32] for i in range(0, len(packed), 32)]
+
+    decoded = decode_staking_providers(words)
+    weights = amounts_as_float(decoded)
+
+    # a generous ratio, vectorized decoding is typically more than 10x faster
+    vectorized_time = best_time(lambda w: amounts_as_float(decode_staking_providers(w)), words)
+    per_element_time = best_time(decode_per_element, words)
+    assert vectorized_time * 3 < per_element_time
+
+    # compare with the per-element decoding it replaces
+    sample = np.random.default_rng(size).integers(0, size, 100)
+    for i in sample:
+        assert decoded[i]["address"].tobytes() == words[i][:20]
+        assert int(amounts_as_int(decoded[i : i + 1])[0]) == int.from_bytes(words[i][20:], "big")
+        assert weights[i] == float(int.from_bytes(words[i][20:], "big"))